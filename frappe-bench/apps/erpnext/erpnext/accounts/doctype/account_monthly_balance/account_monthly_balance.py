@@ -0,0 +1,197 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import cint, cstr, flt, get_first_day, now
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
+
+AMOUNT_FIELDS = ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency")
+
+
+class AccountMonthlyBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		finance_book: DF.Link | None
+		is_opening: DF.Literal["No", "Yes"]
+		is_period_closing_voucher_entry: DF.Check
+		period_start_date: DF.Date | None
+		project: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_account_monthly_balance_enabled():
+	"""Whether the monthly balances are maintained as GL Entries are posted."""
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_account_monthly_balance"))
+
+
+def is_account_monthly_balance_ready():
+	"""Whether reports can read the monthly balances, i.e. they are maintained and a rebuild of all
+	companies has completed since they were enabled."""
+	return is_account_monthly_balance_enabled() and cint(
+		frappe.db.get_single_value("Accounts Settings", "account_monthly_balance_ready")
+	)
+
+
+def update_account_monthly_balance(gl_entries, sign=1):
+	"""Add GL Entries to (or with `sign=-1` remove them from) the monthly balances.
+
+	Reversal GL Entries made on cancel are added like any other entry, so a cancelled voucher
+	nets to zero and the balances always match the sum of uncancelled GL Entries."""
+	if not gl_entries or not is_account_monthly_balance_enabled():
+		return
+
+	upsert_monthly_balances(aggregate_monthly_balances(gl_entries, sign))
+
+
+def remove_voucher_from_account_monthly_balance(voucher_type, voucher_no):
+	"""Called before the GL Entries of a voucher are deleted outright."""
+	remove_gl_entries_from_account_monthly_balance({"voucher_type": voucher_type, "voucher_no": voucher_no})
+
+
+def remove_gl_entries_from_account_monthly_balance(filters):
+	"""Called before the GL Entries matching `filters` are deleted or marked cancelled without
+	posting reversal entries."""
+	if not is_account_monthly_balance_enabled():
+		return
+
+	gl_entries = frappe.get_all("GL Entry", filters=filters, fields=get_gl_entry_fields())
+	update_account_monthly_balance(gl_entries, sign=-1)
+
+
+def rebuild_account_monthly_balance(company=None):
+	"""Recompute the monthly balances from GL Entry, for one or all companies.
+
+	A rebuild of all companies marks the balances ready for reports once it completes."""
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+
+	for name in companies:
+		# a second rebuild of the company waits here until this one commits
+		frappe.db.get_value("Company", name, "name", for_update=True)
+		frappe.db.delete("Account Monthly Balance", {"company": name})
+
+		gle = frappe.qb.DocType("GL Entry")
+		group_by = [gle[field] for field in get_gl_entry_fields() if field not in AMOUNT_FIELDS]
+		gl_entries = (
+			frappe.qb.from_(gle)
+			.select(*group_by, *[Sum(gle[field]).as_(field) for field in AMOUNT_FIELDS])
+			.where((gle.company == name) & (gle.is_cancelled == 0))
+			.groupby(*group_by)
+		).run(as_dict=True)
+
+		upsert_monthly_balances(aggregate_monthly_balances(gl_entries))
+
+	if not company and is_account_monthly_balance_enabled():
+		frappe.db.set_single_value("Accounts Settings", "account_monthly_balance_ready", 1)
+
+
+def get_gl_entry_fields():
+	return [
+		"company",
+		"account",
+		"account_currency",
+		"cost_center",
+		"project",
+		"finance_book",
+		"is_opening",
+		"voucher_type",
+		"posting_date",
+		*AMOUNT_FIELDS,
+		*get_accounting_dimensions(),
+	]
+
+
+def aggregate_monthly_balances(gl_entries, sign=1):
+	accounting_dimensions = get_accounting_dimensions()
+	balances = {}
+
+	for entry in gl_entries:
+		key_values = {
+			"company": cstr(entry.get("company")),
+			"account": cstr(entry.get("account")),
+			"account_currency": cstr(entry.get("account_currency")),
+			"cost_center": cstr(entry.get("cost_center")),
+			"project": cstr(entry.get("project")),
+			"finance_book": cstr(entry.get("finance_book")),
+			"is_opening": entry.get("is_opening") or "No",
+			"is_period_closing_voucher_entry": cint(entry.get("voucher_type") == "Period Closing Voucher"),
+			"period_start_date": get_first_day(entry.get("posting_date")),
+		}
+		for dimension in accounting_dimensions:
+			key_values[dimension] = cstr(entry.get(dimension))
+
+		name = hashlib.sha1("\x1f".join(cstr(v) for v in key_values.values()).encode()).hexdigest()
+		balance = balances.setdefault(
+			name, dict(name=name, **key_values, **dict.fromkeys(AMOUNT_FIELDS, 0.0))
+		)
+		for field in AMOUNT_FIELDS:
+			balance[field] += sign * flt(entry.get(field))
+
+	return balances
+
+
+def upsert_monthly_balances(balances, chunk_size=1000):
+	"""Insert the balances, adding the amounts to the existing row if there is one.
+
+	Rows are written in name order so that concurrent vouchers lock them in the same order."""
+	if not balances:
+		return
+
+	timestamp = now()
+	rows = [
+		dict(
+			balances[name],
+			creation=timestamp,
+			modified=timestamp,
+			owner=frappe.session.user,
+			modified_by=frappe.session.user,
+		)
+		for name in sorted(balances)
+	]
+	fields = list(rows[0])
+
+	if frappe.db.db_type == "postgres":
+		updates = [
+			f"`{field}` = `tabAccount Monthly Balance`.`{field}` + excluded.`{field}`"
+			for field in AMOUNT_FIELDS
+		]
+		updates.append("`modified` = excluded.`modified`")
+	else:
+		updates = [f"`{field}` = `{field}` + values(`{field}`)" for field in AMOUNT_FIELDS]
+		updates.append("`modified` = values(`modified`)")
+
+	placeholder = "({})".format(", ".join(["%s"] * len(fields)))
+	for i in range(0, len(rows), chunk_size):
+		chunk = rows[i : i + chunk_size]
+		frappe.db.sql(
+			"""insert into `tabAccount Monthly Balance` ({columns}) values {values}
+			{on_duplicate_update}{updates}""".format(
+				columns=", ".join(f"`{field}`" for field in fields),
+				values=", ".join([placeholder] * len(chunk)),
+				on_duplicate_update=frappe.db.get_on_duplicate_update(),
+				updates=", ".join(updates),
+			),
+			[row[field] for row in chunk for field in fields],
+		)
@@ -0,0 +1,66 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.query_builder.functions import Sum
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import get_first_day, nowdate
+
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	is_account_monthly_balance_ready,
+	rebuild_account_monthly_balance,
+	remove_gl_entries_from_account_monthly_balance,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+
+
+class TestAccountMonthlyBalance(FrappeTestCase):
+	def get_balance(self, account):
+		amb = frappe.qb.DocType("Account Monthly Balance")
+		return (
+			frappe.qb.from_(amb)
+			.select(Sum(amb.debit) - Sum(amb.credit))
+			.where((amb.account == account) & (amb.period_start_date == get_first_day(nowdate())))
+		).run()[0][0] or 0
+
+	@change_settings("Accounts Settings", {"use_account_monthly_balance": 1})
+	def test_balance_updated_on_submit_and_cancel(self):
+		rebuild_account_monthly_balance("_Test Company")
+		opening = self.get_balance("_Test Bank - _TC")
+
+		jv = make_journal_entry("_Test Bank - _TC", "_Test Cash - _TC", 100, submit=True)
+		self.assertEqual(self.get_balance("_Test Bank - _TC"), opening + 100)
+
+		jv.cancel()
+		self.assertEqual(self.get_balance("_Test Bank - _TC"), opening)
+
+		make_journal_entry("_Test Bank - _TC", "_Test Cash - _TC", 100, submit=True)
+		balance = self.get_balance("_Test Bank - _TC")
+		rebuild_account_monthly_balance("_Test Company")
+		self.assertEqual(self.get_balance("_Test Bank - _TC"), balance)
+
+	@change_settings("Accounts Settings", {"use_account_monthly_balance": 1})
+	def test_balance_updated_on_direct_gl_cancellation(self):
+		rebuild_account_monthly_balance("_Test Company")
+		opening = self.get_balance("_Test Bank - _TC")
+
+		# entries marked cancelled without reversal, like provisional entries of a Purchase Receipt
+		jv = make_journal_entry("_Test Bank - _TC", "_Test Cash - _TC", 100, submit=True)
+		filters = {"voucher_type": jv.doctype, "voucher_no": jv.name, "is_cancelled": 0}
+		remove_gl_entries_from_account_monthly_balance(filters)
+		frappe.db.set_value("GL Entry", filters, "is_cancelled", 1)
+		self.assertEqual(self.get_balance("_Test Bank - _TC"), opening)
+
+		rebuild_account_monthly_balance("_Test Company")
+		self.assertEqual(self.get_balance("_Test Bank - _TC"), opening)
+
+	@change_settings(
+		"Accounts Settings", {"use_account_monthly_balance": 1, "account_monthly_balance_ready": 0}
+	)
+	def test_ready_after_full_rebuild(self):
+		# reports keep reading GL Entries until the balances of every company are rebuilt
+		rebuild_account_monthly_balance("_Test Company")
+		self.assertFalse(is_account_monthly_balance_ready())
+
+		rebuild_account_monthly_balance()
+		self.assertTrue(is_account_monthly_balance_ready())
@@ -24,6 +24,7 @@ class AccountsSettings(Document):
 		from frappe.types import DF
 
 		acc_frozen_upto: DF.Date | None
+		account_monthly_balance_ready: DF.Check
 		add_taxes_from_item_tax_template: DF.Check
 		add_taxes_from_taxes_and_charges_template: DF.Check
 		allow_multi_currency_invoices_against_single_party_account: DF.Check
@@ -58,7 +59,9 @@ class AccountsSettings(Document):
 		merge_similar_account_heads: DF.Check
 		over_billing_allowance: DF.Currency
 		post_change_gl_entries: DF.Check
-		receivable_payable_fetch_method: DF.Literal["Buffered Cursor", "UnBuffered Cursor", "Raw SQL"]
+		receivable_payable_fetch_method: DF.Literal[
+			"Buffered Cursor", "UnBuffered Cursor", "Raw SQL", "Single Scan"
+		]
 		receivable_payable_remarks_length: DF.Int
 		reconciliation_queue_size: DF.Int
 		role_allowed_to_over_bill: DF.Link | None
@@ -72,6 +75,7 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_account_monthly_balance: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -104,6 +108,18 @@ class AccountsSettings(Document):
 
 		self.validate_and_sync_auto_reconcile_config()
 
+		if self.has_value_changed("use_account_monthly_balance"):
+			# reports read the balances again once they are rebuilt
+			self.account_monthly_balance_ready = 0
+
+		if self.has_value_changed("use_account_monthly_balance") and self.use_account_monthly_balance:
+			frappe.enqueue(
+				"erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance.rebuild_account_monthly_balance",
+				queue="long",
+				timeout=7200,
+				enqueue_after_commit=True,
+			)
+
 	def validate_stale_days(self):
 		if not self.allow_stale and cint(self.stale_days) <= 0:
 			frappe.msgprint(
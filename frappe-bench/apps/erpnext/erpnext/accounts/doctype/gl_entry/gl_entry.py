@@ -76,6 +76,15 @@ class GLEntry(Document):
 		if self.meta.autoname == "hash":
 			self.to_rename = 0
 
+	def db_insert(self, *args, **kwargs):
+		if self.flags.deferred_writes is not None:
+			# inserted along with the other entries of the voucher, see `flush_deferred_gl_writes`
+			self.flags.deferred_writes.entries.append(self)
+			self.set("__islocal", False)
+			return
+
+		super().db_insert(*args, **kwargs)
+
 	def validate(self):
 		self.flags.ignore_submit_comment = True
 		self.validate_and_set_fiscal_year()
@@ -93,7 +102,10 @@ class GLEntry(Document):
 		if not self.flags.from_repost and self.voucher_type != "Period Closing Voucher":
 			self.validate_account_details(adv_adj)
 			self.validate_dimensions_for_pl_and_bs()
-			validate_balance_type(self.account, adv_adj)
+			if self.flags.deferred_writes is not None:
+				self.flags.deferred_writes.balance_type_accounts.add(self.account)
+			else:
+				validate_balance_type(self.account, adv_adj)
 			validate_frozen_account(self.account, adv_adj)
 
 			if (
@@ -115,13 +127,17 @@ class GLEntry(Document):
 					and self.flags.update_outstanding == "Yes"
 					and not frappe.flags.is_reverse_depr_entry
 				):
-					update_outstanding_amt(
+					reference = (
 						self.account,
 						self.party_type,
 						self.party,
 						self.against_voucher_type,
 						self.against_voucher,
 					)
+					if self.flags.deferred_writes is None:
+						update_outstanding_amt(*reference)
+					elif reference not in self.flags.deferred_writes.outstanding_references:
+						self.flags.deferred_writes.outstanding_references.append(reference)
 
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
@@ -224,12 +240,15 @@ class GLEntry(Document):
 	def validate_account_details(self, adv_adj):
 		"""Account must be ledger, active and not freezed"""
 
-		ret = frappe.db.sql(
-			"""select is_group, docstatus, company
-			from tabAccount where name=%s""",
-			self.account,
-			as_dict=1,
-		)[0]
+		if self.flags.deferred_writes and self.account in self.flags.deferred_writes.account_details:
+			ret = self.flags.deferred_writes.account_details[self.account]
+		else:
+			ret = frappe.db.sql(
+				"""select is_group, docstatus, company
+				from tabAccount where name=%s""",
+				self.account,
+				as_dict=1,
+			)[0]
 
 		if ret.is_group == 1:
 			frappe.throw(
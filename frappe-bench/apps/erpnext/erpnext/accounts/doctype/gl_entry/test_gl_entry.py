@@ -3,6 +3,7 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.model.naming import parse_naming_series
@@ -38,6 +39,59 @@ class TestGLEntry(unittest.TestCase):
 
 		self.assertTrue(round_off_entry)
 
+	def test_gl_entries_inserted_in_bulk(self):
+		jv = make_journal_entry(
+			"_Test Account Cost for Goods Sold - _TC", "_Test Bank - _TC", 100, submit=False
+		)
+		for _i in range(5):
+			jv.append(
+				"accounts",
+				{
+					"account": "_Test Account Cost for Goods Sold - _TC",
+					"cost_center": "_Test Cost Center - _TC",
+					"debit_in_account_currency": 10,
+				},
+			)
+			jv.append("accounts", {"account": "_Test Bank - _TC", "credit_in_account_currency": 10})
+		jv.save()
+
+		with patch.object(frappe.db, "bulk_insert", wraps=frappe.db.bulk_insert) as bulk_insert:
+			jv.submit()
+
+		gl_entries = frappe.get_all(
+			"GL Entry", filters={"voucher_type": "Journal Entry", "voucher_no": jv.name}
+		)
+		bulk_insert.assert_called_once()
+		self.assertEqual(bulk_insert.call_args.args[0], "GL Entry")
+		self.assertEqual(len(bulk_insert.call_args.kwargs["values"]), len(gl_entries))
+
+		with patch.object(frappe.db, "bulk_insert", wraps=frappe.db.bulk_insert) as bulk_insert:
+			jv.cancel()
+
+		bulk_insert.assert_called_once()
+		self.assertEqual(
+			frappe.db.count("GL Entry", {"voucher_type": "Journal Entry", "voucher_no": jv.name}),
+			2 * len(gl_entries),
+		)
+
+	def test_gl_entries_inserted_one_by_one_on_name_collision(self):
+		jv = make_journal_entry("_Test Account Cost for Goods Sold - _TC", "_Test Bank - _TC", 100)
+		bulk_insert = frappe.db.bulk_insert
+
+		def fail_for_gl_entries(doctype, *args, **kwargs):
+			if doctype == "GL Entry":
+				raise frappe.DuplicateEntryError
+			return bulk_insert(doctype, *args, **kwargs)
+
+		with patch.object(frappe.db, "bulk_insert", side_effect=fail_for_gl_entries), patch.object(
+			frappe.db, "is_primary_key_violation", return_value=True
+		):
+			jv.submit()
+
+		self.assertEqual(
+			frappe.db.count("GL Entry", {"voucher_type": "Journal Entry", "voucher_no": jv.name}), 2
+		)
+
 	def test_rename_entries(self):
 		je = make_journal_entry(
 			"_Test Account Cost for Goods Sold - _TC", "_Test Bank - _TC", 100, submit=True
@@ -4,10 +4,10 @@
 import frappe
 from frappe import qb
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import nowdate
+from frappe.utils import add_to_date, now_datetime, nowdate
 
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
-from erpnext.accounts.utils import run_ledger_health_checks
+from erpnext.accounts.utils import LEDGER_HEALTH_RECHECK_MINUTES, run_ledger_health_checks
 
 
 class TestLedgerHealth(AccountsTestMixin, FrappeTestCase):
@@ -107,3 +107,46 @@ class TestLedgerHealth(AccountsTestMixin, FrappeTestCase):
 		)
 		self.assertEqual(len(actual), 1)
 		self.assertEqual(expected, actual[0])
+
+	def test_only_vouchers_modified_since_last_run_are_checked(self):
+		self.create_journal()
+
+		gle = frappe.db.get_all(
+			"GL Entry", filters={"voucher_no": self.je.name, "account": self.income_account}
+		)[0]
+		frappe.db.set_value("GL Entry", gle.name, "credit", 8000)
+
+		run_ledger_health_checks()
+		self.assertEqual(len(frappe.db.get_all("Ledger Health")), 1)
+		self.assertTrue(frappe.db.get_single_value("Ledger Health Monitor", "last_run_on"))
+
+		# rerun without changes doesn't duplicate the finding
+		run_ledger_health_checks()
+		self.assertEqual(len(frappe.db.get_all("Ledger Health")), 1)
+
+		# fixing the voucher clears its finding on the next run
+		frappe.db.set_value("GL Entry", gle.name, "credit", 10000)
+		run_ledger_health_checks()
+		self.assertEqual(frappe.db.get_all("Ledger Health"), [])
+
+		# vouchers not modified since shortly before the last run are not checked again
+		modified = add_to_date(now_datetime(), minutes=-2 * LEDGER_HEALTH_RECHECK_MINUTES)
+		for doctype in ("GL Entry", "Payment Ledger Entry"):
+			frappe.db.set_value(
+				doctype, {"voucher_no": self.je.name}, "modified", modified, update_modified=False
+			)
+		frappe.db.set_value("GL Entry", gle.name, "credit", 8000, update_modified=False)
+		run_ledger_health_checks()
+		self.assertEqual(frappe.db.get_all("Ledger Health"), [])
+
+	def test_payment_ledger_entries_without_gl_entries(self):
+		self.create_journal()
+		frappe.db.delete("GL Entry", {"voucher_no": self.je.name})
+
+		run_ledger_health_checks()
+		self.assertEqual(
+			frappe.db.get_all(
+				"Ledger Health", filters={"general_and_payment_ledger_mismatch": 1}, pluck="voucher_no"
+			),
+			[self.je.name],
+		)
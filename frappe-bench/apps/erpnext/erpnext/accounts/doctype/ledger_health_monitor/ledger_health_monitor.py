@@ -20,8 +20,11 @@ class LedgerHealthMonitor(Document):
 
 		companies: DF.Table[LedgerHealthMonitorCompany]
 		debit_credit_mismatch: DF.Check
+		debit_credit_mismatch_duration: DF.Float
 		enable_health_monitor: DF.Check
 		general_and_payment_ledger_mismatch: DF.Check
+		general_and_payment_ledger_mismatch_duration: DF.Float
+		last_run_on: DF.Datetime | None
 		monitor_for_last_x_days: DF.Int
 	# end: auto-generated types
 
@@ -174,9 +174,17 @@ class PaymentLedgerEntry(Document):
 			and self.flags.update_outstanding == "Yes"
 			and not frappe.flags.is_reverse_depr_entry
 		):
-			update_voucher_outstanding(
-				self.against_voucher_type, self.against_voucher_no, self.account, self.party_type, self.party
+			reference = (
+				self.against_voucher_type,
+				self.against_voucher_no,
+				self.account,
+				self.party_type,
+				self.party,
 			)
+			if self.flags.outstanding_references is None:
+				update_voucher_outstanding(*reference)
+			elif reference not in self.flags.outstanding_references:
+				self.flags.outstanding_references.append(reference)
 
 
 def on_doctype_update():
@@ -1,6 +1,7 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # For license information, please see license.txt
 
+from collections import defaultdict, deque
 
 import frappe
 from frappe import _, msgprint, qb
@@ -43,6 +44,7 @@ class PaymentReconciliation(Document):
 		)
 
 		allocation: DF.Table[PaymentReconciliationAllocation]
+		allocation_strategy: DF.Literal["FIFO", "Exact Amount", "Reference Number"]
 		bank_cash_account: DF.Link | None
 		company: DF.Link
 		cost_center: DF.Link | None
@@ -436,39 +438,34 @@ class PaymentReconciliation(Document):
 		entries = []
 		for pay in args.get("payments"):
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
-				if pay.get("amount") >= inv.get("outstanding_amount"):
-					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
-					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
-					inv["outstanding_amount"] = 0
-				else:
-					res = self.get_allocated_entry(pay, inv, pay["amount"])
-					inv["outstanding_amount"] = flt(inv.get("outstanding_amount")) - flt(pay.get("amount"))
-					pay["amount"] = 0
-
-				inv["exchange_rate"] = invoice_exchange_map.get(inv.get("invoice_number"))
-				if pay.get("reference_type") in ["Sales Invoice", "Purchase Invoice"]:
-					pay["exchange_rate"] = invoice_exchange_map.get(pay.get("reference_name"))
-
-				res.difference_amount = self.get_difference_amount(pay, inv, res["allocated_amount"])
-				res.difference_account = default_exchange_gain_loss_account
-				res.exchange_rate = inv.get("exchange_rate")
-				res.update({"gain_loss_posting_date": pay.get("posting_date")})
-				if not pay.get("is_advance"):
-					if exc_gain_loss_posting_date == "Invoice":
-						res.update({"gain_loss_posting_date": inv.get("invoice_date")})
-					elif exc_gain_loss_posting_date == "Reconciliation Date":
-						res.update({"gain_loss_posting_date": nowdate()})
-
-				if pay.get("amount") == 0:
-					entries.append(res)
-					break
-				elif inv.get("outstanding_amount") == 0:
-					entries.append(res)
-					continue
 
+		for pay, inv in get_allocation_matches(
+			args.get("payments"), args.get("invoices"), self.allocation_strategy
+		):
+			if pay.get("amount") >= inv.get("outstanding_amount"):
+				res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
+				pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
+				inv["outstanding_amount"] = 0
 			else:
-				break
+				res = self.get_allocated_entry(pay, inv, pay["amount"])
+				inv["outstanding_amount"] = flt(inv.get("outstanding_amount")) - flt(pay.get("amount"))
+				pay["amount"] = 0
+
+			inv["exchange_rate"] = invoice_exchange_map.get(inv.get("invoice_number"))
+			if pay.get("reference_type") in ["Sales Invoice", "Purchase Invoice"]:
+				pay["exchange_rate"] = invoice_exchange_map.get(pay.get("reference_name"))
+
+			res.difference_amount = self.get_difference_amount(pay, inv, res["allocated_amount"])
+			res.difference_account = default_exchange_gain_loss_account
+			res.exchange_rate = inv.get("exchange_rate")
+			res.update({"gain_loss_posting_date": pay.get("posting_date")})
+			if not pay.get("is_advance"):
+				if exc_gain_loss_posting_date == "Invoice":
+					res.update({"gain_loss_posting_date": inv.get("invoice_date")})
+				elif exc_gain_loss_posting_date == "Reconciliation Date":
+					res.update({"gain_loss_posting_date": nowdate()})
+
+			entries.append(res)
 
 		self.set("allocation", [])
 		for entry in entries:
@@ -749,6 +746,79 @@ class PaymentReconciliation(Document):
 		return conditions
 
 
+def get_allocation_matches(payments, invoices, strategy=None):
+	"""Yield the (payment, invoice) pairs to allocate, in order.
+
+	The caller is expected to reduce the payment's `amount` and the invoice's `outstanding_amount` by
+	the allocated amount before asking for the next pair. With the Exact Amount and Reference Number
+	strategies, payments are first paired with an invoice looked up by amount or number; the rest
+	are allocated to the open invoices in FIFO order, walking each list once."""
+	if strategy in ("Exact Amount", "Reference Number"):
+		index = get_invoice_index(invoices, strategy)
+		keys = get_payment_keys(payments, strategy)
+
+		unmatched = []
+		for pay, key in zip(payments, keys, strict=False):
+			matches = index.get(key)
+			while matches and not matches[0].get("outstanding_amount"):
+				matches.popleft()
+
+			if matches:
+				yield pay, matches[0]
+				# a partly allocated invoice stays open for the next payment with the same key
+				if not matches[0].get("outstanding_amount"):
+					matches.popleft()
+
+			if pay.get("amount"):
+				unmatched.append(pay)
+
+		payments = unmatched
+
+	i = 0
+	for pay in payments:
+		while i < len(invoices) and pay.get("amount"):
+			if invoices[i].get("outstanding_amount"):
+				yield pay, invoices[i]
+
+			if not invoices[i].get("outstanding_amount"):
+				i += 1
+
+		if i == len(invoices):
+			break
+
+
+def get_invoice_index(invoices, strategy):
+	"""Open invoices by outstanding amount or by invoice number, each key keeping the FIFO order."""
+	precision = frappe.get_precision("Payment Reconciliation Invoice", "outstanding_amount")
+
+	index = defaultdict(deque)
+	for inv in invoices:
+		if strategy == "Exact Amount":
+			index[flt(inv.get("outstanding_amount"), precision)].append(inv)
+		else:
+			index[inv.get("invoice_number")].append(inv)
+
+	return index
+
+
+def get_payment_keys(payments, strategy):
+	"""The amount of each payment, or the reference number quoted on its Payment or Journal Entry."""
+	if strategy == "Exact Amount":
+		precision = frappe.get_precision("Payment Reconciliation Invoice", "outstanding_amount")
+		return [flt(pay.get("amount"), precision) for pay in payments]
+
+	reference_nos = {}
+	for doctype, fieldname in (("Payment Entry", "reference_no"), ("Journal Entry", "cheque_no")):
+		names = list({pay.get("reference_name") for pay in payments if pay.get("reference_type") == doctype})
+		if names:
+			for name, reference_no in frappe.get_all(
+				doctype, filters={"name": ("in", names)}, fields=["name", fieldname], as_list=True
+			):
+				reference_nos[(doctype, name)] = reference_no
+
+	return [reference_nos.get((pay.get("reference_type"), pay.get("reference_name"))) for pay in payments]
+
+
 def reconcile_dr_cr_note(dr_cr_notes, company, active_dimensions=None):
 	for inv in dr_cr_notes:
 		voucher_type = "Credit Note" if inv.voucher_type == "Sales Invoice" else "Debit Note"
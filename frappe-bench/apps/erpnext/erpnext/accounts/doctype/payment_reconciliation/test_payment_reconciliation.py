@@ -480,6 +480,49 @@ class TestPaymentReconciliation(FrappeTestCase):
 		self.assertEqual(len(pr.get("payments")), 0)
 		self.assertEqual(pr.get("invoices")[0].get("outstanding_amount"), 165)
 
+	def test_allocation_strategy(self):
+		si1 = self.create_sales_invoice(qty=1, rate=100)
+		si2 = self.create_sales_invoice(qty=1, rate=200)
+		self.create_payment_entry(amount=200).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.get_unreconciled_entries()
+		invoices = [x.as_dict() for x in pr.get("invoices")]
+		payments = [x.as_dict() for x in pr.get("payments")]
+		pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+		self.assertEqual(
+			[(row.invoice_number, row.allocated_amount) for row in pr.allocation],
+			[(si1.name, 100), (si2.name, 100)],
+		)
+
+		# the payment is allocated in full to the invoice of the same amount
+		pr.allocation_strategy = "Exact Amount"
+		pr.get_unreconciled_entries()
+		invoices = [x.as_dict() for x in pr.get("invoices")]
+		payments = [x.as_dict() for x in pr.get("payments")]
+		pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+		self.assertEqual(
+			[(row.invoice_number, row.allocated_amount) for row in pr.allocation], [(si2.name, 200)]
+		)
+
+		# payments quoting an invoice number are allocated to it first, while it stays outstanding
+		references = []
+		for _ in range(2):
+			pe = self.create_payment_entry(amount=50)
+			pe.reference_no = si2.name
+			pe.save().submit()
+			references.append(pe.name)
+
+		pr.allocation_strategy = "Reference Number"
+		pr.get_unreconciled_entries()
+		invoices = [x.as_dict() for x in pr.get("invoices")]
+		payments = [x.as_dict() for x in pr.get("payments") if x.reference_name in references]
+		pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+		self.assertEqual(
+			[(row.invoice_number, row.allocated_amount) for row in pr.allocation],
+			[(si2.name, 50), (si2.name, 50)],
+		)
+
 	def test_payment_against_journal(self):
 		transaction_date = nowdate()
 
@@ -3,7 +3,6 @@
 # For license information, please see license.txt
 
 
-import copy
 import json
 import re
 
@@ -315,6 +314,35 @@ class PricingRule(Document):
 		if self.mixed_conditions and self.is_recursive:
 			frappe.throw(_("Recursive Discounts with Mixed condition is not supported by the system"))
 
+	def on_update(self):
+		self.rebuild_cumulative_totals()
+
+	def on_change(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
+
+		clear_pricing_rule_index()
+
+	def on_trash(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
+
+		clear_pricing_rule_index()
+		frappe.db.delete("Pricing Rule Cumulative Total", {"pricing_rule": self.name})
+
+	def rebuild_cumulative_totals(self):
+		from erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total import (
+			rebuild_pricing_rule_cumulative_totals,
+		)
+
+		doc_before_save = self.get_doc_before_save()
+		if not (self.is_cumulative or (doc_before_save and doc_before_save.is_cumulative)):
+			return
+
+		if any(
+			self.has_value_changed(fieldname)
+			for fieldname in ("is_cumulative", "disable", "apply_on", "valid_from", "valid_upto", "warehouse")
+		):
+			rebuild_pricing_rule_cumulative_totals(self.name)
+
 
 # --------------------------------------------------------------------------------
 
@@ -359,19 +387,28 @@ def apply_pricing_rule(args, doc=None):
 	args.pop("items")
 
 	item_code_list = tuple(item.get("item_code") for item in item_list)
-	query_items = frappe.get_all(
-		"Item",
-		fields=["item_code", "has_serial_no"],
-		filters=[["item_code", "in", item_code_list]],
-		as_list=1,
-	)
-	serialized_items = dict()
-	for item_code, val in query_items:
-		serialized_items.setdefault(item_code, val)
+	item_details = {
+		d.item_code: d
+		for d in frappe.get_all(
+			"Item",
+			fields=["item_code", "item_group", "brand", "variant_of"],
+			filters=[["item_code", "in", item_code_list]],
+		)
+	}
 
+	# pricing rules are looked up in memory (see `get_pricing_rule_index`), so the items only
+	# need their master data fetched once for the whole list
 	for item in item_list:
-		args_copy = copy.deepcopy(args)
+		args_copy = frappe._dict(args)
 		args_copy.update(item)
+
+		if details := item_details.get(args_copy.item_code):
+			if not (args_copy.item_group and args_copy.brand):
+				args_copy.item_group, args_copy.brand = details.item_group, details.brand
+
+			if "variant_of" not in args_copy:
+				args_copy.variant_of = details.variant_of
+
 		data = get_pricing_rule_for_item(args_copy, doc=doc)
 		out.append(data)
 
@@ -7,6 +7,7 @@ import unittest
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
 
+from erpnext.accounts.doctype.pricing_rule.utils import _get_pricing_rules, clear_pricing_rule_index
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
@@ -1520,6 +1521,33 @@ class TestPricingRule(FrappeTestCase):
 		debit_note.delete()
 		pi.cancel()
 
+	def test_pricing_rule_index(self):
+		pricing_rule = make_pricing_rule(selling=1, discount_percentage=10)
+		make_pricing_rule(selling=1, apply_on="Item Group", item_group="_Test Item Group", priority=2)
+
+		args = frappe._dict(
+			item_code="_Test Item",
+			item_group="_Test Item Group",
+			company="_Test Company",
+			doctype="Sales Order Item",
+			transaction_type="selling",
+			transaction_date="2024-01-01",
+		)
+		self.assertEqual(len(_get_pricing_rules("Item Code", args, {})), 1)
+		self.assertEqual(len(_get_pricing_rules("Item Group", args, {})), 1)
+
+		# rules for buying or for another company are not picked
+		args.update(transaction_type="buying", doctype="Purchase Order Item")
+		self.assertEqual(_get_pricing_rules("Item Code", args, {}), [])
+
+		args.update(transaction_type="selling", doctype="Sales Order Item", company="_Test Company 1")
+		self.assertEqual(_get_pricing_rules("Item Code", args, {}), [])
+
+		# index is cleared when a rule changes
+		pricing_rule.db_set("disable", 1)
+		args.company = "_Test Company"
+		self.assertEqual(_get_pricing_rules("Item Code", args, {}), [])
+
 
 test_dependencies = ["Campaign"]
 
@@ -1594,9 +1622,12 @@ def delete_existing_pricing_rules():
 		"Pricing Rule Item Code",
 		"Pricing Rule Item Group",
 		"Pricing Rule Brand",
+		"Pricing Rule Cumulative Total",
 	]:
 		frappe.db.sql(f"delete from `tab{doctype}`")
 
+	clear_pricing_rule_index()
+
 
 def make_item_price(item, price_list_name, item_price):
 	frappe.get_doc(
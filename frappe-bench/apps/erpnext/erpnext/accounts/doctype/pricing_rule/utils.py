@@ -10,7 +10,7 @@ import math
 
 import frappe
 from frappe import _, bold
-from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
+from frappe.utils import cint, cstr, flt, fmt_money, get_link_to_form, getdate, today
 
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
@@ -23,12 +23,27 @@ class MultiplePricingRuleConflict(frappe.ValidationError):
 
 apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
+SELLING_DOCTYPES = (
+	"Quotation",
+	"Quotation Item",
+	"Sales Order",
+	"Sales Order Item",
+	"Delivery Note",
+	"Delivery Note Item",
+	"Sales Invoice",
+	"Sales Invoice Item",
+	"POS Invoice",
+	"POS Invoice Item",
+)
+
+PRICING_RULE_INDEX_KEY = "pricing_rule_index"
+
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
 	values = {}
 
-	if not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
+	if not get_pricing_rule_index().transaction_types.get(args.transaction_type):
 		return
 
 	for apply_on in ["Item Code", "Item Group", "Brand"]:
@@ -105,72 +120,172 @@ def _get_pricing_rules(apply_on, args, values):
 	if not args.get(apply_on_field):
 		return []
 
-	child_doc = f"`tabPricing Rule {apply_on}`"
+	index = get_pricing_rule_index()
+	value = args.get(apply_on_field)
+	values[apply_on_field] = value
 
-	conditions = item_variant_condition = item_conditions = ""
-	values[apply_on_field] = args.get(apply_on_field)
-	if apply_on_field in ["item_code", "brand"]:
-		item_conditions = f"{child_doc}.{apply_on_field}= %({apply_on_field})s"
+	children = index.children[apply_on_field]
+	uom = args.get("uom", None)
 
-		if apply_on_field == "item_code":
-			if args.get("uom", None):
-				item_conditions += (
-					" and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-						child_doc=child_doc, item_uom=args.get("uom")
-					)
-				)
-			if "variant_of" not in args:
-				args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+	# child rows matching the item / its variant template / its item group ancestry / its brand
+	matched_rows = {}
+	if apply_on_field == "item_code":
+		for row in children.get(value, []):
+			if not uom or row.uom == uom or not row.uom:
+				matched_rows[row.name] = row
+
+		if "variant_of" not in args:
+			args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
 
-			if args.variant_of:
-				item_variant_condition = f" or {child_doc}.item_code=%(variant_of)s "
-				values["variant_of"] = args.variant_of
+		if args.variant_of:
+			values["variant_of"] = args.variant_of
+			for row in children.get(args.variant_of, []):
+				matched_rows[row.name] = row
 	elif apply_on_field == "item_group":
-		item_conditions = _get_tree_conditions(args, "Item Group", child_doc, False)
-		if args.get("uom", None):
-			item_conditions += " and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-				child_doc=child_doc, item_uom=args.get("uom")
-			)
+		if value not in index.item_group_ancestors:
+			frappe.throw(_("Invalid {0}").format(value))
+
+		for item_group in index.item_group_ancestors[value]:
+			for row in children.get(item_group, []):
+				if not uom or row.uom == uom or not row.uom:
+					matched_rows[row.name] = row
+	else:
+		for row in children.get(value, []):
+			matched_rows[row.name] = row
 
-	conditions += get_other_conditions(conditions, values, args)
-	warehouse_conditions = _get_tree_conditions(args, "Warehouse", "`tabPricing Rule`")
-	if warehouse_conditions:
-		warehouse_conditions = f" and {warehouse_conditions}"
+	# rules applied on other items match through all their child rows
+	for rule_name in index.other[apply_on_field].get(value, []):
+		for row in index.rule_children[apply_on_field].get(rule_name, []):
+			matched_rows[row.name] = row
 
 	if not args.price_list:
 		args.price_list = None
 
-	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
+	rule_filter = get_pricing_rule_filter(args, values)
+
+	pricing_rules = []
+	for row in matched_rows.values():
+		pricing_rule = index.rules[row.parent]
+		if rule_filter(pricing_rule):
+			pricing_rule = frappe._dict(pricing_rule)
+			pricing_rule[apply_on_field] = row.get(apply_on_field)
+			pricing_rule.uom = row.uom
+			pricing_rules.append(pricing_rule)
+
+	# same as `order by priority desc, name desc`, priority being a string with nulls last
+	pricing_rules.sort(key=lambda d: (d.priority is not None, d.priority or "", d.name), reverse=True)
+
+	return pricing_rules
+
+
+def get_pricing_rule_filter(args, values):
+	"""Returns a function telling whether an indexed Pricing Rule applies to `args`, mirroring
+	`get_other_conditions` and the warehouse and price list conditions."""
+	transaction_type = args.transaction_type
+	transaction_date = getdate(args.get("transaction_date")) if args.get("transaction_date") else None
+	selling_or_buying = "selling" if args.get("doctype") in SELLING_DOCTYPES else "buying"
+	price_lists = ("", cstr(args.get("price_list")))
 	values["price_list"] = args.get("price_list")
 
-	pricing_rules = (
-		frappe.db.sql(
-			"""select `tabPricing Rule`.*,
-			{child_doc}.{apply_on_field}, {child_doc}.uom
-		from `tabPricing Rule`, {child_doc}
-		where ({item_conditions} or (`tabPricing Rule`.apply_rule_on_other is not null
-			and `tabPricing Rule`.{apply_on_other_field}=%({apply_on_field})s) {item_variant_condition})
-			and {child_doc}.parent = `tabPricing Rule`.name
-			and `tabPricing Rule`.disable = 0 and
-			`tabPricing Rule`.{transaction_type} = 1 {warehouse_cond} {conditions}
-		order by `tabPricing Rule`.priority desc,
-			`tabPricing Rule`.name desc""".format(
-				child_doc=child_doc,
-				apply_on_field=apply_on_field,
-				item_conditions=item_conditions,
-				item_variant_condition=item_variant_condition,
-				transaction_type=args.transaction_type,
-				warehouse_cond=warehouse_conditions,
-				apply_on_other_field=f"other_{apply_on_field}",
-				conditions=conditions,
-			),
-			values,
-			as_dict=1,
-		)
-		or []
+	party_fields = {}
+	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
+		party_fields[field] = ("", cstr(args.get(field))) if args.get(field) else ("",)
+		if args.get(field):
+			values[field] = args.get(field)
+
+	tree_fields = {}
+	for parenttype in ["Customer Group", "Territory", "Supplier Group", "Warehouse"]:
+		tree_fields[frappe.scrub(parenttype)] = _get_tree_values(args, parenttype)
+
+	def rule_filter(pricing_rule):
+		if not (pricing_rule.get(transaction_type) and pricing_rule.get(selling_or_buying)):
+			return False
+
+		if cstr(pricing_rule.for_price_list) not in price_lists:
+			return False
+
+		for fields in (party_fields, tree_fields):
+			for field, allowed in fields.items():
+				if cstr(pricing_rule.get(field)) not in allowed:
+					return False
+
+		if transaction_date and not (
+			getdate(pricing_rule.valid_from or "2000-01-01")
+			<= transaction_date
+			<= getdate(pricing_rule.valid_upto or "2500-12-31")
+		):
+			return False
+
+		return True
+
+	return rule_filter
+
+
+def get_pricing_rule_index():
+	"""Active Pricing Rules with their child rows, indexed by apply on value. Built once per site
+	and cleared when a Pricing Rule, Promotional Scheme or Item Group changes."""
+	return frappe.cache.get_value(PRICING_RULE_INDEX_KEY, build_pricing_rule_index)
+
+
+def build_pricing_rule_index():
+	rules = {d.name: d for d in frappe.db.sql("select * from `tabPricing Rule` where disable = 0", as_dict=1)}
+
+	index = frappe._dict(
+		rules=rules,
+		children={},
+		rule_children={},
+		other={},
+		transaction_types={
+			"selling": any(d.selling for d in rules.values()),
+			"buying": any(d.buying for d in rules.values()),
+		},
+		item_group_ancestors=get_item_group_ancestors(),
 	)
 
-	return pricing_rules
+	for apply_on in apply_on_table:
+		apply_on_field = frappe.scrub(apply_on)
+		children = index.children[apply_on_field] = {}
+		rule_children = index.rule_children[apply_on_field] = {}
+		other = index.other[apply_on_field] = {}
+
+		for row in frappe.db.sql(
+			f"select name, parent, {apply_on_field}, uom from `tabPricing Rule {apply_on}`", as_dict=1
+		):
+			if row.parent in rules:
+				children.setdefault(row.get(apply_on_field), []).append(row)
+				rule_children.setdefault(row.parent, []).append(row)
+
+		for rule in rules.values():
+			if rule.apply_rule_on_other is not None and rule.get(f"other_{apply_on_field}"):
+				other.setdefault(rule.get(f"other_{apply_on_field}"), []).append(rule.name)
+
+	return index
+
+
+def get_item_group_ancestors():
+	"""Map of every Item Group to itself and its ancestors, from one pass over the tree."""
+	ancestors = {}
+	stack = []
+	for d in frappe.db.sql("select name, lft, rgt from `tabItem Group` order by lft", as_dict=1):
+		while stack and stack[-1].rgt < d.lft:
+			stack.pop()
+
+		stack.append(d)
+		ancestors[d.name] = tuple(g.name for g in stack)
+
+	return ancestors
+
+
+def clear_pricing_rule_index():
+	frappe.cache.delete_value(PRICING_RULE_INDEX_KEY)
+
+	# the index may be rebuilt from uncommitted data before the transaction ends
+	frappe.db.after_commit.add(_delete_pricing_rule_index)
+	frappe.db.after_rollback.add(_delete_pricing_rule_index)
+
+
+def _delete_pricing_rule_index():
+	frappe.cache.delete_value(PRICING_RULE_INDEX_KEY)
 
 
 def apply_multiple_pricing_rules(pricing_rules):
@@ -230,6 +345,53 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	return condition
 
 
+def _get_tree_values(args, parenttype, allow_blank=True):
+	"""Values of a tree field that a Pricing Rule may have to apply to `args`: blank, or the value
+	of `args` and its ancestors. Same as `_get_tree_conditions`, as a set."""
+	field = frappe.scrub(parenttype)
+	if not args.get(field):
+		return {""} if allow_blank else set()
+
+	if not frappe.flags.tree_values:
+		frappe.flags.tree_values = {}
+
+	key = (parenttype, args.get(field))
+	if key not in frappe.flags.tree_values:
+		try:
+			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
+		except TypeError:
+			frappe.throw(_("Invalid {0}").format(args.get(field)))
+
+		parent_groups = set(
+			frappe.db.sql_list(
+				"""select name from `tab{}`
+				where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
+				(lft, rgt),
+			)
+		)
+
+		if parenttype in ["Customer Group", "Item Group", "Territory"]:
+			parent_field = f"parent_{frappe.scrub(parenttype)}"
+			root_name = frappe.db.get_list(
+				parenttype,
+				{"is_group": 1, parent_field: ("is", "not set")},
+				"name",
+				as_list=1,
+				ignore_permissions=True,
+			)
+
+			if root_name and root_name[0][0]:
+				parent_groups.add(root_name[0][0])
+
+		frappe.flags.tree_values[key] = parent_groups
+
+	values = set(frappe.flags.tree_values[key])
+	if allow_blank:
+		values.add("")
+
+	return values
+
+
 def get_other_conditions(conditions, values, args):
 	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
 		if args.get(field):
@@ -248,18 +410,7 @@ def get_other_conditions(conditions, values, args):
 			and ifnull(`tabPricing Rule`.valid_upto, '2500-12-31')"""
 		values["transaction_date"] = args.get("transaction_date")
 
-	if args.get("doctype") in [
-		"Quotation",
-		"Quotation Item",
-		"Sales Order",
-		"Sales Order Item",
-		"Delivery Note",
-		"Delivery Note Item",
-		"Sales Invoice",
-		"Sales Invoice Item",
-		"POS Invoice",
-		"POS Invoice Item",
-	]:
+	if args.get("doctype") in SELLING_DOCTYPES:
 		conditions += """ and ifnull(`tabPricing Rule`.selling, 0) = 1"""
 	else:
 		conditions += """ and ifnull(`tabPricing Rule`.buying, 0) = 1"""
@@ -499,11 +650,20 @@ def get_qty_and_rate_for_other_item(doc, pr_doc, pricing_rules, row_item):
 
 
 def get_qty_amount_data_for_cumulative(pr_doc, doc, items=None):
+	from erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total import (
+		get_cumulative_doctypes,
+		get_cumulative_totals,
+	)
+
 	if items is None:
 		items = []
 	sum_qty, sum_amt = [0, 0]
 	doctype = doc.get("parenttype") or doc.doctype
 
+	# totals are kept up to date on submit and cancel of these doctypes
+	if doctype in get_cumulative_doctypes():
+		return get_cumulative_totals(pr_doc.name, doctype, items)
+
 	date_field = (
 		"transaction_date" if frappe.get_meta(doctype).has_field("transaction_date") else "posting_date"
 	)
@@ -0,0 +1,209 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import cstr, flt, getdate, now
+
+from erpnext.accounts.doctype.pricing_rule.utils import get_pricing_rule_index
+from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
+
+
+class PricingRuleCumulativeTotal(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		amount: DF.Float
+		apply_on: DF.Literal["Item Code", "Item Group", "Brand"]
+		apply_on_value: DF.Data | None
+		pricing_rule: DF.Link | None
+		reference_doctype: DF.Link | None
+		stock_qty: DF.Float
+	# end: auto-generated types
+
+	pass
+
+
+def get_cumulative_doctypes():
+	return frappe.get_hooks("pricing_rule_cumulative_doctypes")
+
+
+def get_date_field(doctype):
+	return "transaction_date" if frappe.get_meta(doctype).has_field("transaction_date") else "posting_date"
+
+
+def update_cumulative_totals(doc, method=None):
+	"""Add a submitted transaction to (or on cancel, remove it from) the totals of the cumulative
+	Pricing Rules valid on its date."""
+	update_pricing_rule_cumulative_totals(doc, sign=-1 if doc.docstatus == 2 else 1)
+
+
+def update_pricing_rule_cumulative_totals(doc, sign=1):
+	transaction_date = getdate(doc.get(get_date_field(doc.doctype)))
+	pricing_rules = [
+		rule
+		for rule in get_pricing_rule_index().rules.values()
+		if is_cumulative_pricing_rule(rule)
+		and getdate(rule.valid_from) <= transaction_date <= getdate(rule.valid_upto)
+	]
+
+	if not pricing_rules:
+		return
+
+	totals = {}
+	for rule in pricing_rules:
+		add_to_cumulative_totals(totals, rule, doc.doctype, doc.get("items"), sign)
+
+	upsert_cumulative_totals(totals)
+
+
+def rebuild_pricing_rule_cumulative_totals(pricing_rule=None):
+	"""Recompute the totals from submitted transactions, for one or all cumulative Pricing Rules."""
+	if pricing_rule:
+		frappe.db.delete("Pricing Rule Cumulative Total", {"pricing_rule": pricing_rule})
+		pricing_rules = frappe.get_all("Pricing Rule", filters={"name": pricing_rule}, fields=["*"])
+	else:
+		frappe.db.delete("Pricing Rule Cumulative Total")
+		pricing_rules = frappe.get_all("Pricing Rule", filters={"is_cumulative": 1}, fields=["*"])
+
+	for rule in pricing_rules:
+		if not is_cumulative_pricing_rule(rule):
+			continue
+
+		totals = {}
+		for doctype in get_cumulative_doctypes():
+			add_to_cumulative_totals(totals, rule, doctype, get_transaction_totals(rule, doctype))
+
+		upsert_cumulative_totals(totals)
+
+
+def is_cumulative_pricing_rule(rule):
+	return (
+		rule.is_cumulative
+		and not rule.disable
+		and rule.apply_on != "Transaction"
+		and rule.valid_from
+		and rule.valid_upto
+	)
+
+
+def get_transaction_totals(rule, doctype):
+	"""Stock qty and amount of the submitted `doctype` rows in the validity of `rule`, per warehouse
+	and apply on value."""
+	apply_on = frappe.scrub(rule.apply_on)
+	child_doctype = f"{doctype} Item"
+	if not frappe.get_meta(child_doctype).has_field(apply_on):
+		return []
+
+	parent = frappe.qb.DocType(doctype)
+	child = frappe.qb.DocType(child_doctype)
+	date_field = get_date_field(doctype)
+
+	return (
+		frappe.qb.from_(child)
+		.inner_join(parent)
+		.on(child.parent == parent.name)
+		.select(
+			child[apply_on],
+			child.warehouse,
+			Sum(child.stock_qty).as_("stock_qty"),
+			Sum(child.amount).as_("amount"),
+		)
+		.where(
+			(parent.docstatus == 1)
+			& (child.parenttype == doctype)
+			& (parent[date_field][rule.valid_from : rule.valid_upto])
+		)
+		.groupby(child[apply_on], child.warehouse)
+	).run(as_dict=True)
+
+
+def add_to_cumulative_totals(totals, rule, doctype, rows, sign=1):
+	apply_on = frappe.scrub(rule.apply_on)
+	warehouses = set(get_child_warehouses(rule.warehouse)) if rule.warehouse else None
+
+	for row in rows or []:
+		if warehouses is not None and row.get("warehouse") not in warehouses:
+			continue
+
+		value = cstr(row.get(apply_on))
+		name = hashlib.sha1("\x1f".join([rule.name, doctype, value]).encode()).hexdigest()
+		total = totals.setdefault(
+			name,
+			dict(
+				name=name,
+				pricing_rule=rule.name,
+				reference_doctype=doctype,
+				apply_on=rule.apply_on,
+				apply_on_value=value,
+				stock_qty=0.0,
+				amount=0.0,
+			),
+		)
+		total["stock_qty"] += sign * flt(row.get("stock_qty"))
+		total["amount"] += sign * flt(row.get("amount"))
+
+
+def upsert_cumulative_totals(totals):
+	"""Insert the totals, adding the qty and amount to the existing row if there is one."""
+	if not totals:
+		return
+
+	timestamp = now()
+	rows = [
+		dict(
+			totals[name],
+			creation=timestamp,
+			modified=timestamp,
+			owner=frappe.session.user,
+			modified_by=frappe.session.user,
+		)
+		for name in sorted(totals)
+	]
+	fields = list(rows[0])
+
+	if frappe.db.db_type == "postgres":
+		updates = [
+			f"`{field}` = `tabPricing Rule Cumulative Total`.`{field}` + excluded.`{field}`"
+			for field in ("stock_qty", "amount")
+		]
+		updates.append("`modified` = excluded.`modified`")
+	else:
+		updates = [f"`{field}` = `{field}` + values(`{field}`)" for field in ("stock_qty", "amount")]
+		updates.append("`modified` = values(`modified`)")
+
+	frappe.db.sql(
+		"""insert into `tabPricing Rule Cumulative Total` ({columns}) values {values}
+		{on_duplicate_update}{updates}""".format(
+			columns=", ".join(f"`{field}`" for field in fields),
+			values=", ".join(["({})".format(", ".join(["%s"] * len(fields)))] * len(rows)),
+			on_duplicate_update=frappe.db.get_on_duplicate_update(),
+			updates=", ".join(updates),
+		),
+		[row[field] for row in rows for field in fields],
+	)
+
+
+def get_cumulative_totals(pricing_rule, doctype, values=None):
+	"""Total stock qty and amount of the submitted `doctype` transactions for `pricing_rule`, limited
+	to rows whose apply on value is in `values` when given."""
+	pct = frappe.qb.DocType("Pricing Rule Cumulative Total")
+	query = (
+		frappe.qb.from_(pct)
+		.select(Sum(pct.stock_qty), Sum(pct.amount))
+		.where((pct.pricing_rule == pricing_rule) & (pct.reference_doctype == doctype))
+	)
+
+	if values:
+		query = query.where(pct.apply_on_value.isin([cstr(value) for value in values]))
+
+	stock_qty, amount = query.run()[0]
+	return [flt(stock_qty), flt(amount)]
@@ -0,0 +1,52 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from erpnext.accounts.doctype.pricing_rule.test_pricing_rule import (
+	delete_existing_pricing_rules,
+	make_pricing_rule,
+)
+from erpnext.accounts.doctype.pricing_rule.utils import get_qty_amount_data_for_cumulative
+from erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total import (
+	rebuild_pricing_rule_cumulative_totals,
+)
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+
+
+class TestPricingRuleCumulativeTotal(FrappeTestCase):
+	def setUp(self):
+		delete_existing_pricing_rules()
+
+	def tearDown(self):
+		delete_existing_pricing_rules()
+
+	def test_totals_updated_on_submit_and_cancel(self):
+		pricing_rule = make_pricing_rule(selling=1, discount_percentage=10)
+		pricing_rule.update(
+			{"is_cumulative": 1, "valid_from": add_days(nowdate(), -1), "valid_upto": add_days(nowdate(), 1)}
+		)
+		pricing_rule.save()
+
+		def get_totals():
+			return get_qty_amount_data_for_cumulative(
+				pricing_rule, frappe._dict(doctype="Sales Invoice"), ["_Test Item"]
+			)
+
+		self.assertEqual(get_totals(), [0, 0])
+
+		si = create_sales_invoice(qty=5, rate=100)
+		totals = [si.items[0].stock_qty, si.items[0].amount]
+		self.assertEqual(get_totals(), totals)
+
+		# outside the validity of the rule
+		create_sales_invoice(qty=2, rate=100, posting_date=add_days(nowdate(), -5))
+		self.assertEqual(get_totals(), totals)
+
+		rebuild_pricing_rule_cumulative_totals(pricing_rule.name)
+		self.assertEqual(get_totals(), totals)
+
+		si.cancel()
+		self.assertEqual(get_totals(), [0, 0])
@@ -19,6 +19,7 @@ class ProcessPaymentReconciliation(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		allocation_strategy: DF.Literal["FIFO", "Exact Amount", "Reference Number"]
 		amended_from: DF.Link | None
 		bank_cash_account: DF.Link | None
 		company: DF.Link
@@ -107,6 +108,7 @@ def get_pr_instance(doc: str):
 		"to_invoice_date",
 		"from_payment_date",
 		"to_payment_date",
+		"allocation_strategy",
 	]
 	d = {}
 	for field in fields:
@@ -200,28 +202,28 @@ def trigger_reconciliation_for_queued_docs():
 		return
 
 	if not is_scheduler_inactive():
+		fields = ["company", "party_type", "party", "receivable_payable_account", "default_advance_account"]
+
 		# Get all queued documents
 		all_queued = frappe.db.get_all(
 			"Process Payment Reconciliation",
 			filters={"docstatus": 1, "status": "Queued"},
+			fields=["name", *fields],
 			order_by="creation desc",
-			as_list=1,
 		)
 
 		docs_to_trigger = []
 		unique_filters = set()
 		queue_size = frappe.db.get_single_value("Accounts Settings", "reconciliation_queue_size") or 5
 
-		fields = ["company", "party_type", "party", "receivable_payable_account", "default_advance_account"]
-
 		def get_filters_as_tuple(fields, doc):
 			filters = ()
 			for x in fields:
 				filters += tuple(doc.get(x))
 			return filters
 
-		for x in all_queued:
-			doc = frappe.get_doc("Process Payment Reconciliation", x)
+		# each party / account is reconciled in its own background job
+		for doc in all_queued:
 			filters = get_filters_as_tuple(fields, doc)
 			if filters not in unique_filters:
 				unique_filters.add(filters)
@@ -10,6 +10,9 @@ from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate,
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	remove_gl_entries_from_account_monthly_balance,
+)
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
 	validate_docs_for_voucher_types,
@@ -824,6 +827,15 @@ class PurchaseInvoice(BuyingController):
 				rows.add(d.name)
 
 		if rows:
+			remove_gl_entries_from_account_monthly_balance(
+				{
+					"voucher_type": "Purchase Receipt",
+					"voucher_no": ("in", list(purchase_receipts)),
+					"voucher_detail_no": ("in", list(rows)),
+					"is_cancelled": 0,
+				}
+			)
+
 			# cancel gl entries
 			gle = qb.DocType("GL Entry")
 			gle_update_query = (
@@ -8,6 +8,9 @@ from frappe import _, qb
 from frappe.model.document import Document
 from frappe.utils.data import comma_and
 
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	remove_voucher_from_account_monthly_balance,
+)
 from erpnext.stock import get_warehouse_account_map
 
 
@@ -163,6 +166,7 @@ def start_repost(account_repost_doc=str) -> None:
 				doc = frappe.get_doc(x.voucher_type, x.voucher_no)
 
 				if repost_doc.delete_cancelled_entries:
+					remove_voucher_from_account_monthly_balance(doc.doctype, doc.name)
 					frappe.db.delete(
 						"GL Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name}
 					)
@@ -10,6 +10,9 @@ from frappe.model.meta import get_field_precision
 from frappe.utils import cint, flt, formatdate, get_link_to_form, getdate, now
 
 import erpnext
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	update_account_monthly_balance,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
@@ -381,12 +384,18 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 		if gl_map[0]["voucher_type"] != "Period Closing Voucher":
 			validate_against_pcv(is_opening, gl_map[0]["posting_date"], gl_map[0]["company"])
 
+	deferred_writes = get_deferred_gl_writes(gl_map, adv_adj)
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
-		make_entry(entry, adv_adj, update_outstanding, from_repost)
+		make_entry(entry, adv_adj, update_outstanding, from_repost, deferred_writes=deferred_writes)
+
+	flush_deferred_gl_writes(deferred_writes)
 
+	if gl_map and not from_repost and gl_map[0].voucher_type != "Period Closing Voucher":
+		validate_gl_map_against_budget(gl_map)
 
-def make_entry(args, adv_adj, update_outstanding, from_repost=False):
+
+def make_entry(args, adv_adj, update_outstanding, from_repost=False, deferred_writes=None):
 	gle = frappe.new_doc("GL Entry")
 	gle.update(args)
 	gle.flags.ignore_permissions = 1
@@ -394,12 +403,100 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 	gle.flags.adv_adj = adv_adj
 	gle.flags.update_outstanding = update_outstanding or "Yes"
 	gle.flags.notify_update = False
+	gle.flags.deferred_writes = deferred_writes
 	gle.submit()
 
-	if not from_repost and gle.voucher_type != "Period Closing Voucher":
+	if deferred_writes is None and not from_repost and gle.voucher_type != "Period Closing Voucher":
 		validate_expense_against_budget(args)
 
 
+def get_deferred_gl_writes(gl_map, adv_adj):
+	"""Collects the writes of GL Entries submitted for a gl_map so that they can be made once per
+	voucher instead of once per entry. See `flush_deferred_gl_writes`."""
+	accounts = {d.get("account") for d in gl_map if d.get("account")}
+	account_details = {}
+	if accounts:
+		account_details = {
+			d.name: d
+			for d in frappe.get_all(
+				"Account",
+				filters={"name": ("in", list(accounts))},
+				fields=["name", "is_group", "docstatus", "company"],
+			)
+		}
+
+	return frappe._dict(
+		adv_adj=adv_adj,
+		account_details=account_details,
+		entries=[],
+		balance_type_accounts=set(),
+		outstanding_references=[],
+	)
+
+
+def flush_deferred_gl_writes(deferred_writes):
+	"""Insert the collected GL Entries with multi-row INSERTs, then run the balance and
+	outstanding updates once per account / against voucher."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import update_outstanding_amt, validate_balance_type
+
+	entries = deferred_writes.entries
+	if entries:
+		rows = [d.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True) for d in entries]
+		fields = list(rows[0])
+		savepoint = "flush_deferred_gl_writes"
+		try:
+			frappe.db.savepoint(savepoint)
+			frappe.db.bulk_insert(
+				"GL Entry", fields=fields, values=[[row.get(f) for f in fields] for row in rows]
+			)
+		except Exception as e:
+			if not frappe.db.is_primary_key_violation(e):
+				raise
+
+			# hash collision on temporary names, insert each entry on its own under a new name
+			frappe.db.rollback(save_point=savepoint)  # preserve transaction in postgres
+			for d in list(entries):
+				d.flags.deferred_writes = None
+				d.autoname()
+				d.db_insert()
+
+		update_account_monthly_balance(entries)
+
+	for account in deferred_writes.balance_type_accounts:
+		validate_balance_type(account, deferred_writes.adv_adj)
+
+	for reference in deferred_writes.outstanding_references:
+		update_outstanding_amt(*reference)
+
+	deferred_writes.entries = []
+	deferred_writes.balance_type_accounts = set()
+	deferred_writes.outstanding_references = []
+
+
+def validate_gl_map_against_budget(gl_map):
+	"""Budget is checked against the booked expense, so entries sharing the same
+	account and dimensions only need to be checked once per voucher."""
+	if not frappe.get_all("Budget", limit=1):
+		return
+
+	budget_fields = [
+		"company",
+		"account",
+		"cost_center",
+		"project",
+		"posting_date",
+		"fiscal_year",
+		*get_accounting_dimensions(),
+	]
+
+	checked = set()
+	for entry in gl_map:
+		key = tuple(entry.get(fieldname) for fieldname in budget_fields)
+		if key not in checked:
+			checked.add(key)
+			validate_expense_against_budget(entry)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -705,6 +802,8 @@ def make_reverse_gl_entries(
 						(now(), frappe.session.user, tuple(gle_names)),
 					)
 
+		deferred_writes = get_deferred_gl_writes(gl_entries, adv_adj)
+		reverse_entries = []
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -731,7 +830,13 @@ def make_reverse_gl_entries(
 				new_gle["posting_date"] = frappe.form_dict.get("posting_date") or getdate()
 
 			if new_gle["debit"] or new_gle["credit"]:
-				make_entry(new_gle, adv_adj, "Yes")
+				make_entry(new_gle, adv_adj, "Yes", deferred_writes=deferred_writes)
+				reverse_entries.append(new_gle)
+
+		flush_deferred_gl_writes(deferred_writes)
+
+		if reverse_entries and reverse_entries[0]["voucher_type"] != "Period Closing Voucher":
+			validate_gl_map_against_budget(reverse_entries)
 
 
 def check_freezing_date(posting_date, adv_adj=False):
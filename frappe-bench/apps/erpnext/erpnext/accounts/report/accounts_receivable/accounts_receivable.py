@@ -7,9 +7,9 @@ from collections import OrderedDict
 import frappe
 from frappe import _, qb, query_builder, scrub
 from frappe.database.schema import get_definition
-from frappe.query_builder import Criterion
+from frappe.query_builder import Case, Criterion
 from frappe.query_builder.functions import Date, Substring, Sum
-from frappe.utils import cint, cstr, flt, getdate, nowdate
+from frappe.utils import cint, create_batch, cstr, flt, getdate, nowdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
@@ -37,6 +37,9 @@ from erpnext.accounts.utils import (
 #  9. Report amounts are in party currency if in_party_currency is selected, otherwise company currency
 # 10. This report is based on Payment Ledger Entries
 
+# number of parties streamed at a time by the Single Scan fetch method
+PARTY_PAGE_SIZE = 500
+
 
 def execute(filters=None):
 	args = {
@@ -130,6 +133,8 @@ class ReceivablePayableReport:
 			self.fetch_ple_in_unbuffered_cursor()
 		elif self.ple_fetch_method == "Raw SQL":
 			self.fetch_ple_in_sql_procedures()
+		elif self.ple_fetch_method == "Single Scan":
+			self.fetch_ple_in_single_scan()
 
 		# Build delivery note map against all sales invoices
 		self.build_delivery_note_map()
@@ -160,6 +165,50 @@ class ReceivablePayableReport:
 			self.update_voucher_balance(ple)
 		delattr(self, "ple_entries")
 
+	def fetch_ple_in_single_scan(self):
+		"""Allocate the Payment Ledger Entries while they are being read, one page of parties at a time.
+
+		The entries are ordered by their against voucher with the voucher's own entries first, so the
+		row a payment is allocated to already exists when the payment is read. Entries whose row is yet
+		to be seen are held back until the end of the page. Rows of a page that end up with no
+		outstanding are dropped before the next page is read."""
+		for page in create_batch(self.get_ple_parties(), PARTY_PAGE_SIZE):
+			query = self.ple_query.where(self.ple.party.isin(page))
+			deferred = []
+			with frappe.db.unbuffered_cursor():
+				for ple in query.run(as_dict=True, as_iterator=True):
+					self.init_voucher_balance(ple)
+					if self.get_voucher_balance_key(ple) in self.voucher_balance:
+						self.update_voucher_balance(ple)
+					else:
+						deferred.append(ple)
+
+			for ple in deferred:
+				self.update_voucher_balance(ple)
+
+			for key in [key for key, row in self.voucher_balance.items() if not self.must_consider(row)]:
+				del self.voucher_balance[key]
+
+		# the order of the other fetch methods
+		if self.filters.get("group_by_party"):
+			order = lambda row: (row.party, row.posting_date)  # noqa: E731
+		else:
+			order = lambda row: (row.posting_date, row.party)  # noqa: E731
+
+		self.voucher_balance = OrderedDict(
+			sorted(self.voucher_balance.items(), key=lambda item: order(item[1]))
+		)
+
+	def get_ple_parties(self):
+		ple = self.ple
+		return (
+			qb.from_(ple)
+			.select(ple.party)
+			.distinct()
+			.where(Criterion.all(self.ple_conditions))
+			.orderby(ple.party)
+		).run(pluck=True)
+
 	def build_voucher_dict(self, ple):
 		return frappe._dict(
 			voucher_type=ple.voucher_type,
@@ -242,23 +291,7 @@ class ReceivablePayableReport:
 			):
 				return
 
-		if self.filters.get("ignore_accounts"):
-			key = (ple.against_voucher_type, ple.against_voucher_no, ple.party)
-		else:
-			key = (ple.account, ple.against_voucher_type, ple.against_voucher_no, ple.party)
-
-		# If payment is made against credit note
-		# and credit note is made against a Sales Invoice
-		# then consider the payment against original sales invoice.
-		if ple.against_voucher_type in ("Sales Invoice", "Purchase Invoice"):
-			if ple.against_voucher_no in self.return_entries:
-				return_against = self.return_entries.get(ple.against_voucher_no)
-				if return_against:
-					if self.filters.get("ignore_accounts"):
-						key = (ple.against_voucher_type, return_against, ple.party)
-					else:
-						key = (ple.account, ple.against_voucher_type, return_against, ple.party)
-
+		key = self.get_voucher_balance_key(ple)
 		row = self.voucher_balance.get(key)
 
 		# Build and use a separate row for Employee Advances.
@@ -283,6 +316,26 @@ class ReceivablePayableReport:
 		row.party_type = ple.party_type
 		return row
 
+	def get_voucher_balance_key(self, ple):
+		if self.filters.get("ignore_accounts"):
+			key = (ple.against_voucher_type, ple.against_voucher_no, ple.party)
+		else:
+			key = (ple.account, ple.against_voucher_type, ple.against_voucher_no, ple.party)
+
+		# If payment is made against credit note
+		# and credit note is made against a Sales Invoice
+		# then consider the payment against original sales invoice.
+		if ple.against_voucher_type in ("Sales Invoice", "Purchase Invoice"):
+			if ple.against_voucher_no in self.return_entries:
+				return_against = self.return_entries.get(ple.against_voucher_no)
+				if return_against:
+					if self.filters.get("ignore_accounts"):
+						key = (ple.against_voucher_type, return_against, ple.party)
+					else:
+						key = (ple.account, ple.against_voucher_type, return_against, ple.party)
+
+		return key
+
 	def update_voucher_balance(self, ple):
 		# get the row where this balance needs to be updated
 		# if its a payment, it will return the linked invoice or will be considered as advance
@@ -412,30 +465,7 @@ class ReceivablePayableReport:
 		# set outstanding for all the accumulated balances
 		# as we can use this to filter out invoices without outstanding
 		for _key, row in self.voucher_balance.items():
-			row.outstanding = flt(row.invoiced - row.paid - row.credit_note, self.currency_precision)
-			row.outstanding_in_account_currency = flt(
-				row.invoiced_in_account_currency
-				- row.paid_in_account_currency
-				- row.credit_note_in_account_currency,
-				self.currency_precision,
-			)
-
-			row.invoice_grand_total = row.invoiced
-
-			must_consider = False
-			if self.filters.get("for_revaluation_journals"):
-				if (abs(row.outstanding) >= 1.0 / 10**self.currency_precision) or (
-					abs(row.outstanding_in_account_currency) >= 1.0 / 10**self.currency_precision
-				):
-					must_consider = True
-			else:
-				if (abs(row.outstanding) >= 1.0 / 10**self.currency_precision) and (
-					(abs(row.outstanding_in_account_currency) >= 1.0 / 10**self.currency_precision)
-					or (row.voucher_no in self.err_journals)
-				):
-					must_consider = True
-
-			if must_consider:
+			if self.must_consider(row):
 				# non-zero oustanding, we must consider this row
 
 				if self.is_invoice(row) and self.filters.based_on_payment_terms:
@@ -461,6 +491,28 @@ class ReceivablePayableReport:
 			if self.data:
 				self.data.append(self.total_row_map.get("Total", {}))
 
+	def must_consider(self, row):
+		"""Set the outstanding of the row and return whether it is still open."""
+		row.outstanding = flt(row.invoiced - row.paid - row.credit_note, self.currency_precision)
+		row.outstanding_in_account_currency = flt(
+			row.invoiced_in_account_currency
+			- row.paid_in_account_currency
+			- row.credit_note_in_account_currency,
+			self.currency_precision,
+		)
+
+		row.invoice_grand_total = row.invoiced
+
+		if self.filters.get("for_revaluation_journals"):
+			return (abs(row.outstanding) >= 1.0 / 10**self.currency_precision) or (
+				abs(row.outstanding_in_account_currency) >= 1.0 / 10**self.currency_precision
+			)
+
+		return (abs(row.outstanding) >= 1.0 / 10**self.currency_precision) and (
+			(abs(row.outstanding_in_account_currency) >= 1.0 / 10**self.currency_precision)
+			or (row.voucher_no in self.err_journals)
+		)
+
 	def append_row(self, row):
 		self.allocate_future_payments(row)
 		self.set_invoice_details(row)
@@ -904,6 +956,14 @@ class ReceivablePayableReport:
 			self.qb_selection_filter.append(self.ple.posting_date.lte(self.filters.report_date))
 
 		ple = qb.DocType("Payment Ledger Entry")
+		self.ple_conditions = [
+			ple.delinked == 0,
+			Criterion.all(self.qb_selection_filter),
+			Criterion.any(self.or_filters),
+		]
+		if match_conditions := build_qb_match_conditions("Payment Ledger Entry"):
+			self.ple_conditions.append(Criterion.all(match_conditions))
+
 		query = (
 			qb.from_(ple)
 			.select(
@@ -922,9 +982,7 @@ class ReceivablePayableReport:
 				ple.amount,
 				ple.amount_in_account_currency,
 			)
-			.where(ple.delinked == 0)
-			.where(Criterion.all(self.qb_selection_filter))
-			.where(Criterion.any(self.or_filters))
+			.where(Criterion.all(self.ple_conditions))
 		)
 
 		if self.filters.get("show_remarks"):
@@ -935,10 +993,17 @@ class ReceivablePayableReport:
 			else:
 				query = query.select(ple.remarks)
 
-		if match_conditions := build_qb_match_conditions("Payment Ledger Entry"):
-			query = query.where(Criterion.all(match_conditions))
-
-		if self.filters.get("group_by_party"):
+		if self.ple_fetch_method == "Single Scan":
+			own_entry = (ple.voucher_type == ple.against_voucher_type) & (
+				ple.voucher_no == ple.against_voucher_no
+			)
+			query = query.orderby(
+				ple.party,
+				ple.against_voucher_type,
+				ple.against_voucher_no,
+				Case().when(own_entry, 0).else_(1),
+			)
+		elif self.filters.get("group_by_party"):
 			query = query.orderby(self.ple.party, self.ple.posting_date)
 		else:
 			query = query.orderby(self.ple.posting_date, self.ple.party)
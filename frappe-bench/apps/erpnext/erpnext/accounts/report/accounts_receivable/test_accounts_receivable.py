@@ -167,6 +167,27 @@ class TestAccountsReceivable(AccountsTestMixin, FrappeTestCase):
 			],
 		)
 
+	def test_single_scan_fetch_method(self):
+		filters = {
+			"company": self.company,
+			"report_date": today(),
+			"range": "30, 60, 90, 120",
+		}
+		fields = ["voucher_no", "invoiced", "paid", "credit_note", "outstanding", "range1"]
+
+		si = self.create_sales_invoice(no_payment_schedule=True)
+		self.create_payment_entry(si.name)
+		self.create_credit_note(si.name)
+		self.create_sales_invoice(no_payment_schedule=True)
+
+		report = execute(filters)
+		expected = sorted([row.get(field) for field in fields] for row in report[1])
+
+		with change_settings("Accounts Settings", {"receivable_payable_fetch_method": "Single Scan"}):
+			report = execute(filters)
+
+		self.assertEqual(sorted([row.get(field) for field in fields] for row in report[1]), expected)
+
 	def test_accounts_receivable_without_payment(self):
 		filters = {
 			"company": self.company,
@@ -9,10 +9,14 @@ import re
 
 import frappe
 from frappe import _
+from frappe.query_builder import Case
 from frappe.query_builder.functions import Max, Min, Sum
 from frappe.utils import add_days, add_months, cint, cstr, flt, formatdate, get_first_day, getdate
 from pypika.terms import ExistsCriterion
 
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	is_account_monthly_balance_ready,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -195,6 +199,7 @@ def get_data(
 			root.rgt,
 			root_type=root_type,
 			ignore_closing_entries=ignore_closing_entries,
+			period_list=period_list,
 		)
 
 	calculate_values(
@@ -435,15 +440,36 @@ def set_gl_entries_by_account(
 	ignore_closing_entries=False,
 	ignore_opening_entries=False,
 	group_by_account=False,
+	period_list=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	If `period_list` is passed, GL Entries are summed in the database per account and
+	period bucket (see `get_period_bucket`), so only a few rows per account are returned."""
 	gl_entries = []
 
 	# For balance sheet
 	ignore_closing_balances = frappe.db.get_single_value(
 		"Accounts Settings", "ignore_account_closing_balance"
 	)
-	if not from_date and not ignore_closing_balances:
+	if not from_date and period_list and is_account_monthly_balance_ready():
+		# Months before the first period come from the monthly balances, as no period boundary
+		# falls inside them. GL Entries are only read from that month on.
+		from_date = get_first_day(
+			min(getdate(period_list[0].year_start_date), getdate(period_list[0].from_date))
+		)
+		gl_entries += get_accounting_entries(
+			"Account Monthly Balance",
+			None,
+			add_days(from_date, -1),
+			filters,
+			root_lft,
+			root_rgt,
+			root_type,
+			ignore_closing_entries,
+			ignore_opening_entries=ignore_opening_entries,
+		)
+	elif not from_date and not ignore_closing_balances:
 		last_period_closing_voucher = frappe.db.get_all(
 			"Period Closing Voucher",
 			filters={
@@ -482,6 +508,7 @@ def set_gl_entries_by_account(
 		ignore_closing_entries,
 		ignore_opening_entries=ignore_opening_entries,
 		group_by_account=group_by_account,
+		period_list=period_list,
 	)
 
 	if filters and filters.get("presentation_currency"):
@@ -505,19 +532,22 @@ def get_accounting_entries(
 	period_closing_voucher=None,
 	ignore_opening_entries=False,
 	group_by_account=False,
+	period_list=None,
 ):
 	gl_entry = frappe.qb.DocType(doctype)
+	group_by_period = bool(period_list) and doctype == "GL Entry" and not group_by_account
+	aggregate = group_by_account or group_by_period or doctype == "Account Monthly Balance"
 	query = (
 		frappe.qb.from_(gl_entry)
 		.select(
 			gl_entry.account,
-			gl_entry.debit if not group_by_account else Sum(gl_entry.debit).as_("debit"),
-			gl_entry.credit if not group_by_account else Sum(gl_entry.credit).as_("credit"),
+			gl_entry.debit if not aggregate else Sum(gl_entry.debit).as_("debit"),
+			gl_entry.credit if not aggregate else Sum(gl_entry.credit).as_("credit"),
 			gl_entry.debit_in_account_currency
-			if not group_by_account
+			if not aggregate
 			else Sum(gl_entry.debit_in_account_currency).as_("debit_in_account_currency"),
 			gl_entry.credit_in_account_currency
-			if not group_by_account
+			if not aggregate
 			else Sum(gl_entry.credit_in_account_currency).as_("credit_in_account_currency"),
 			gl_entry.account_currency,
 		)
@@ -528,11 +558,26 @@ def get_accounting_entries(
 		"Accounts Settings", "ignore_is_opening_check_for_reporting"
 	)
 
+	if group_by_period:
+		query = query.select(
+			Min(gl_entry.posting_date).as_("posting_date"),
+			gl_entry.is_opening,
+			gl_entry.fiscal_year,
+			get_period_bucket(gl_entry.posting_date, period_list).as_("period_bucket"),
+		)
+
 	if doctype == "GL Entry":
-		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
+		if not group_by_period:
+			query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
 		query = query.where(gl_entry.is_cancelled == 0)
 		query = query.where(gl_entry.posting_date <= to_date)
 
+		if ignore_opening_entries and not ignore_is_opening:
+			query = query.where(gl_entry.is_opening == "No")
+	elif doctype == "Account Monthly Balance":
+		query = query.select(Min(gl_entry.period_start_date).as_("posting_date"), gl_entry.is_opening)
+		query = query.where(gl_entry.period_start_date <= to_date)
+
 		if ignore_opening_entries and not ignore_is_opening:
 			query = query.where(gl_entry.is_opening == "No")
 	else:
@@ -555,10 +600,33 @@ def get_accounting_entries(
 
 	if group_by_account:
 		query += " GROUP BY `account`"
+	elif group_by_period:
+		query += " GROUP BY `account`, `account_currency`, `fiscal_year`, `is_opening`, `period_bucket`"
+	elif doctype == "Account Monthly Balance":
+		query += " GROUP BY `account`, `account_currency`, `is_opening`"
 
 	return frappe.db.sql(query, params, as_dict=True)
 
 
+def get_period_bucket(posting_date, period_list):
+	"""Returns a CASE expression numbering the intervals between the boundaries of `period_list`.
+
+	All entries in a bucket compare the same way against every period's from/to date and the
+	year start date, so `calculate_values` gives the same result for their sum (dated with the
+	earliest posting date in the bucket) as it would for the individual entries."""
+	boundaries = {getdate(period_list[0].year_start_date)}
+	for period in period_list:
+		boundaries.add(getdate(period.from_date))
+		boundaries.add(getdate(add_days(period.to_date, 1)))
+
+	boundaries = sorted(boundaries)
+	bucket = Case()
+	for idx, boundary in enumerate(boundaries):
+		bucket = bucket.when(posting_date < boundary, idx)
+
+	return bucket.else_(len(boundaries))
+
+
 def get_account_filter_query(root_lft, root_rgt, root_type, gl_entry):
 	acc = frappe.qb.DocType("Account")
 	exists_query = (
@@ -2,21 +2,25 @@
 # License: GNU General Public License v3. See license.txt
 
 
-import copy
+import heapq
+import itertools
 from collections import OrderedDict
 
 import frappe
 from frappe import _, _dict
 from frappe.query_builder import Criterion
-from frappe.utils import cstr, getdate
+from frappe.utils import cstr, get_first_day, getdate
 
 from erpnext import get_company_currency, get_default_company
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	is_account_monthly_balance_ready,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
 from erpnext.accounts.report.financial_statements import get_cost_centers_with_children
-from erpnext.accounts.report.utils import convert_to_presentation_currency, get_currency
+from erpnext.accounts.report.utils import get_currency, get_presentation_currency_converter
 from erpnext.accounts.utils import get_account_currency
 
 
@@ -142,7 +146,7 @@ def get_result(filters, account_details):
 	if filters.get("include_dimensions"):
 		accounting_dimensions = get_accounting_dimensions()
 
-	gl_entries = get_gl_entries(filters, accounting_dimensions)
+	gl_entries = iter_gl_entries(filters, accounting_dimensions)
 
 	data = get_data_with_opening_closing(filters, account_details, accounting_dimensions, gl_entries)
 
@@ -152,7 +156,14 @@ def get_result(filters, account_details):
 
 
 def get_gl_entries(filters, accounting_dimensions):
-	currency_map = get_currency(filters)
+	return list(iter_gl_entries(filters, accounting_dimensions))
+
+
+def iter_gl_entries(filters, accounting_dimensions):
+	"""Yield the GL Entries of the report one by one, read through an unbuffered cursor.
+
+	The database connection is busy until the generator is exhausted, so callers must not run
+	other queries while iterating."""
 	select_fields = """, debit, credit, debit_in_account_currency,
 		credit_in_account_currency """
 
@@ -187,26 +198,54 @@ def get_gl_entries(filters, accounting_dimensions):
 			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
 		)
 
-	gl_entries = frappe.db.sql(
-		f"""
-		select
-			name as gl_entry, posting_date, account, party_type, party,
-			voucher_type, voucher_subtype, voucher_no, {dimension_fields}
-			cost_center, project, {transaction_currency_fields}
-			against_voucher_type, against_voucher, account_currency,
-			against, is_opening, creation {select_fields}
-		from `tabGL Entry`
-		where company=%(company)s {get_conditions(filters)}
-		{order_by_statement}
-	""",
-		filters,
-		as_dict=1,
-	)
+	conditions = get_conditions(filters)
+	opening_entries = []
+	if use_monthly_balance_for_opening(filters):
+		# balances of the months before from_date come pre-summed, read GL Entries from that month on
+		filters["opening_month_start"] = get_first_day(filters.from_date)
+		conditions += " and posting_date >= %(opening_month_start)s"
+		opening_entries = get_opening_entries_from_monthly_balance(filters)
 
+	convert_entry = None
 	if filters.get("presentation_currency"):
-		return convert_to_presentation_currency(gl_entries, currency_map, filters)
-	else:
-		return gl_entries
+		account_currencies = {d.account_currency for d in opening_entries}
+		account_currencies.update(
+			frappe.db.sql_list(
+				f"""select distinct account_currency from `tabGL Entry`
+				where company=%(company)s {conditions}""",
+				filters,
+			)
+		)
+		convert_entry = get_presentation_currency_converter(
+			account_currencies, get_currency(filters), filters
+		)
+
+	with frappe.db.unbuffered_cursor():
+		gl_entries = frappe.db.sql(
+			f"""
+			select
+				name as gl_entry, posting_date, account, party_type, party,
+				voucher_type, voucher_subtype, voucher_no, {dimension_fields}
+				cost_center, project, {transaction_currency_fields}
+				against_voucher_type, against_voucher, account_currency,
+				against, is_opening, creation {select_fields}
+			from `tabGL Entry`
+			where company=%(company)s {conditions}
+			{order_by_statement}
+		""",
+			filters,
+			as_dict=1,
+			as_iterator=True,
+		)
+
+		if opening_entries:
+			if filters.get("categorize_by") == "Categorize by Account":
+				gl_entries = heapq.merge(opening_entries, gl_entries, key=lambda d: d.account)
+			else:
+				gl_entries = itertools.chain(opening_entries, gl_entries)
+
+		for gle in gl_entries:
+			yield convert_entry(gle) if convert_entry else gle
 
 
 def get_conditions(filters):
@@ -337,6 +376,76 @@ def get_conditions(filters):
 	return "and {}".format(" and ".join(conditions)) if conditions else ""
 
 
+def use_monthly_balance_for_opening(filters):
+	"""Opening balances can be read from Account Monthly Balance when they are account wise and
+	none of the filters need a column that is not kept there."""
+	if not filters.get("account") and filters.get("categorize_by") != "Categorize by Account":
+		return False
+
+	for fieldname in (
+		"party_type",
+		"party",
+		"voucher_no",
+		"against_voucher_no",
+		"voucher_no_not_in",
+		"show_cancelled_entries",
+	):
+		if filters.get(fieldname):
+			return False
+
+	from frappe.desk.reportview import build_match_conditions
+
+	if build_match_conditions("GL Entry"):
+		return False
+
+	return is_account_monthly_balance_ready()
+
+
+def get_opening_entries_from_monthly_balance(filters):
+	conditions = ["company=%(company)s", "period_start_date < %(opening_month_start)s"]
+
+	if filters.get("account"):
+		conditions.append("account in %(account)s")
+
+	if filters.get("cost_center"):
+		conditions.append("cost_center in %(cost_center)s")
+
+	if filters.get("project"):
+		conditions.append("project in %(project)s")
+
+	if filters.get("include_default_book_entries"):
+		if filters.get("finance_book"):
+			conditions.append("(finance_book in (%(finance_book)s, '') OR finance_book IS NULL)")
+		else:
+			conditions.append("(finance_book in (%(company_fb)s, '') OR finance_book IS NULL)")
+	else:
+		if filters.get("finance_book"):
+			conditions.append("(finance_book in (%(finance_book)s, '') OR finance_book IS NULL)")
+		else:
+			conditions.append("(finance_book in ('') OR finance_book IS NULL)")
+
+	for dimension in get_accounting_dimensions(as_list=False):
+		if not dimension.disabled and dimension.document_type != "Finance Book":
+			if filters.get(dimension.fieldname):
+				conditions.append(f"{dimension.fieldname} in %({dimension.fieldname})s")
+
+	return frappe.db.sql(
+		"""
+		select
+			account, account_currency, min(period_start_date) as posting_date,
+			sum(debit) as debit, sum(credit) as credit,
+			sum(debit_in_account_currency) as debit_in_account_currency,
+			sum(credit_in_account_currency) as credit_in_account_currency
+		from `tabAccount Monthly Balance`
+		where {}
+		group by account, account_currency
+		order by account
+	""".format(" and ".join(conditions)),
+		filters,
+		as_dict=1,
+	)
+
+
 def get_accounts_with_children(accounts):
 	if not isinstance(accounts, list):
 		accounts = [d.strip() for d in accounts.strip().split(",") if d]
@@ -360,21 +469,23 @@ def get_accounts_with_children(accounts):
 
 
 def set_bill_no(gl_entries):
-	inv_details = get_supplier_invoice_details()
-	for gl in gl_entries:
-		gl["bill_no"] = inv_details.get(gl.get("against_voucher"), "")
+	"""Consolidated entries show the bill no of the voucher their first entry is against."""
+	against_vouchers = [gl.pop("bill_against_voucher", gl.get("against_voucher")) for gl in gl_entries]
+	inv_details = get_supplier_invoice_details(set(against_vouchers))
+	for gl, against_voucher in zip(gl_entries, against_vouchers, strict=False):
+		gl["bill_no"] = inv_details.get(against_voucher, "")
 
 
 def get_data_with_opening_closing(filters, account_details, accounting_dimensions, gl_entries):
 	data = []
 	totals_dict = get_totals_dict()
-
-	set_bill_no(gl_entries)
-
-	gle_map = initialize_gle_map(gl_entries, filters, totals_dict)
+	gle_map = OrderedDict()
 
 	totals, entries = get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, totals_dict)
 
+	# only entries that are shown need a bill no, opening entries are already folded into totals
+	set_bill_no(entries + [gle for acc_dict in gle_map.values() for gle in acc_dict.entries])
+
 	# Opening for filtered account
 	data.append(totals.opening)
 
@@ -442,15 +553,6 @@ def group_by_field(group_by):
 		return "voucher_no"
 
 
-def initialize_gle_map(gl_entries, filters, totals_dict):
-	gle_map = OrderedDict()
-	group_by = group_by_field(filters.get("categorize_by"))
-
-	for gle in gl_entries:
-		gle_map.setdefault(gle.get(group_by), _dict(totals=copy.deepcopy(totals_dict), entries=[]))
-	return gle_map
-
-
 def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, totals):
 	entries = []
 	consolidated_gle = OrderedDict()
@@ -500,9 +602,11 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, tot
 	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
 	show_opening_entries = filters.get("show_opening_entries")
 
+	# gl_entries may be streamed from an unbuffered cursor, so no queries can be run in this loop
 	for gle in gl_entries:
 		group_by_value = gle.get(group_by)
 		gle.voucher_type = gle.voucher_type
+		gle_map.setdefault(group_by_value, _dict(totals=get_totals_dict(), entries=[]))
 
 		if gle.posting_date < from_date or (cstr(gle.is_opening) == "Yes" and not show_opening_entries):
 			if not group_by_voucher_consolidated:
@@ -542,6 +646,8 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, tot
 
 				key = tuple(keylist)
 				if key not in consolidated_gle:
+					# against_voucher collects the vouchers of the merged entries
+					gle.bill_against_voucher = gle.against_voucher
 					consolidated_gle.setdefault(key, gle)
 				else:
 					update_value_in_dict(consolidated_gle, key, gle)
@@ -580,16 +686,19 @@ def get_result_as_list(data, filters):
 	return data
 
 
-def get_supplier_invoice_details():
-	inv_details = {}
-	for d in frappe.db.sql(
-		""" select name, bill_no from `tabPurchase Invoice`
-		where docstatus = 1 and bill_no is not null and bill_no != '' """,
-		as_dict=1,
-	):
-		inv_details[d.name] = d.bill_no
+def get_supplier_invoice_details(invoices):
+	invoices = [d for d in invoices if d]
+	if not invoices:
+		return {}
 
-	return inv_details
+	return frappe._dict(
+		frappe.get_all(
+			"Purchase Invoice",
+			filters={"name": ("in", invoices), "docstatus": 1, "bill_no": ("is", "set")},
+			fields=["name", "bill_no"],
+			as_list=1,
+		)
+	)
 
 
 def get_balance(row, balance, debit_field, credit_field):
@@ -6,6 +6,7 @@ from frappe import qb
 from frappe.tests.utils import FrappeTestCase, change_settings
 from frappe.utils import flt, today
 
+from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.report.general_ledger.general_ledger import execute
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
@@ -332,3 +333,21 @@ class TestGeneralLedger(FrappeTestCase):
 		)
 		actual = set([x.voucher_no for x in data if x.voucher_no])
 		self.assertEqual(expected, actual)
+
+	def test_bill_no_in_consolidated_entries(self):
+		pi = make_purchase_invoice(company=self.company, do_not_submit=True)
+		pi.bill_no = "_Test Bill GL"
+		pi.submit()
+
+		columns, data = execute(
+			frappe._dict(
+				{
+					"company": pi.company,
+					"from_date": pi.posting_date,
+					"to_date": pi.posting_date,
+					"account": [pi.credit_to],
+					"categorize_by": "Categorize by Voucher (Consolidated)",
+				}
+			)
+		)
+		self.assertEqual([x.bill_no for x in data if x.voucher_no == pi.name], ["_Test Bill GL"])
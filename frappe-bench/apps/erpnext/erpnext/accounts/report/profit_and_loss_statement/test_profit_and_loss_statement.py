@@ -7,7 +7,7 @@ from frappe.tests.utils import FrappeTestCase
 from frappe.utils import add_days, getdate, today
 
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.financial_statements import get_period_list
+from erpnext.accounts.report.financial_statements import get_period_list, set_gl_entries_by_account
 from erpnext.accounts.report.profit_and_loss_statement.profit_and_loss_statement import execute
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
 
@@ -170,3 +170,31 @@ class TestProfitAndLossStatement(AccountsTestMixin, FrappeTestCase):
 		for key in expected.keys():
 			with self.subTest(key=key):
 				self.assertEqual(expected.get(key), actual.get(key))
+
+	def test_gl_entries_aggregated_per_period(self):
+		self.create_sales_invoice(qty=1, rate=150)
+		si = self.create_sales_invoice(qty=1, rate=100)
+		income_acc = si.items[0].income_account
+
+		filters = self.get_report_filters()
+		period_list = get_period_list(
+			filters.from_fiscal_year,
+			filters.to_fiscal_year,
+			filters.period_start_date,
+			filters.period_end_date,
+			filters.filter_based_on,
+			filters.periodicity,
+			company=filters.company,
+		)
+
+		gl_entries_by_account = set_gl_entries_by_account(
+			self.company,
+			period_list[0].year_start_date,
+			period_list[-1].to_date,
+			filters,
+			{},
+			root_type="Income",
+			period_list=period_list,
+		)
+		self.assertEqual(len(gl_entries_by_account[income_acc]), 1)
+		self.assertEqual(gl_entries_by_account[income_acc][0].credit, 250)
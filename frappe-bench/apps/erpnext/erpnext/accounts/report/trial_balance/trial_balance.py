@@ -5,9 +5,12 @@
 import frappe
 from frappe import _
 from frappe.query_builder.functions import Sum
-from frappe.utils import add_days, cstr, flt, formatdate, getdate
+from frappe.utils import add_days, cstr, flt, formatdate, get_first_day, getdate
 
 import erpnext
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	is_account_monthly_balance_ready,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -163,7 +166,35 @@ def get_rootwise_opening_balances(filters, report_type, ignore_is_opening):
 
 	accounting_dimensions = get_accounting_dimensions(as_list=False)
 
-	if last_period_closing_voucher:
+	# monthly balances can only stand in for whole months, so the P&L opening (which starts at the
+	# fiscal year start) needs that to be a month start as well
+	use_monthly_balance = is_account_monthly_balance_ready() and (
+		report_type == "Balance Sheet"
+		or filters.show_unclosed_fy_pl_balances
+		or getdate(filters.year_start_date) == get_first_day(filters.year_start_date)
+	)
+
+	if use_monthly_balance:
+		month_start = get_first_day(filters.from_date)
+		gle = get_opening_balance(
+			"Account Monthly Balance",
+			filters,
+			report_type,
+			accounting_dimensions,
+			start_date=month_start,
+			ignore_is_opening=ignore_is_opening,
+		)
+
+		if month_start < getdate(filters.from_date):
+			gle += get_opening_balance(
+				"GL Entry",
+				filters,
+				report_type,
+				accounting_dimensions,
+				start_date=month_start,
+				ignore_is_opening=ignore_is_opening,
+			)
+	elif last_period_closing_voucher:
 		gle = get_opening_balance(
 			"Account Closing Balance",
 			filters,
@@ -242,6 +273,14 @@ def get_opening_balance(
 		opening_balance = opening_balance.where(
 			closing_balance.period_closing_voucher == period_closing_voucher
 		)
+	elif doctype == "Account Monthly Balance":
+		# balances of the months before `start_date`, plus opening entries of any month
+		if not ignore_is_opening:
+			opening_balance = opening_balance.where(
+				(closing_balance.period_start_date < start_date) | (closing_balance.is_opening == "Yes")
+			)
+		else:
+			opening_balance = opening_balance.where(closing_balance.period_start_date < start_date)
 	else:
 		if start_date:
 			opening_balance = opening_balance.where(
@@ -262,15 +301,16 @@ def get_opening_balance(
 	if doctype == "GL Entry":
 		opening_balance = opening_balance.where(closing_balance.is_cancelled == 0)
 
-	if (
-		not filters.show_unclosed_fy_pl_balances
-		and report_type == "Profit and Loss"
-		and doctype == "GL Entry"
-	):
-		opening_balance = opening_balance.where(closing_balance.posting_date >= filters.year_start_date)
+	if not filters.show_unclosed_fy_pl_balances and report_type == "Profit and Loss":
+		if doctype == "GL Entry":
+			opening_balance = opening_balance.where(closing_balance.posting_date >= filters.year_start_date)
+		elif doctype == "Account Monthly Balance":
+			opening_balance = opening_balance.where(
+				closing_balance.period_start_date >= filters.year_start_date
+			)
 
 	if not flt(filters.with_period_closing_entry_for_opening):
-		if doctype == "Account Closing Balance":
+		if doctype != "GL Entry":
 			opening_balance = opening_balance.where(closing_balance.is_period_closing_voucher_entry == 0)
 		else:
 			opening_balance = opening_balance.where(closing_balance.voucher_type != "Period Closing Voucher")
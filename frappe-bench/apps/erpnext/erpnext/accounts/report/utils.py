@@ -94,11 +94,20 @@ def convert_to_presentation_currency(gl_entries, currency_info, filters=None):
 	:param currency_info:
 	:return:
 	"""
-	converted_gl_list = []
+	account_currencies = set(entry["account_currency"] for entry in gl_entries)
+	convert_entry = get_presentation_currency_converter(account_currencies, currency_info, filters)
+
+	return [convert_entry(entry) for entry in gl_entries]
+
+
+def get_presentation_currency_converter(account_currencies, currency_info, filters=None):
+	"""
+	Returns a function that converts one GL Entry in place, like `convert_to_presentation_currency`
+	does for a list whose entries are in `account_currencies`. The exchange rate is looked up
+	upfront, so the function runs no queries and can be used while streaming entries.
+	"""
 	presentation_currency = currency_info["presentation_currency"]
 	company_currency = currency_info["company_currency"]
-
-	account_currencies = list(set(entry["account_currency"] for entry in gl_entries))
 	exchange_gain_or_loss = False
 
 	if filters and isinstance(filters.get("account"), list):
@@ -107,34 +116,25 @@ def convert_to_presentation_currency(gl_entries, currency_info, filters=None):
 
 		exchange_gain_or_loss = len(account_filter) == 1 and account_filter[0] == gain_loss_account
 
-	for entry in gl_entries:
-		debit = flt(entry["debit"])
-		credit = flt(entry["credit"])
-		debit_in_account_currency = flt(entry["debit_in_account_currency"])
-		credit_in_account_currency = flt(entry["credit_in_account_currency"])
-		account_currency = entry["account_currency"]
-
-		if (
-			len(account_currencies) == 1
-			and account_currency == presentation_currency
-			and not exchange_gain_or_loss
-		):
-			entry["debit"] = debit_in_account_currency
-			entry["credit"] = credit_in_account_currency
-		else:
-			date = currency_info["report_date"]
-			converted_debit_value = convert(debit, presentation_currency, company_currency, date)
-			converted_credit_value = convert(credit, presentation_currency, company_currency, date)
+	single_currency = len(account_currencies) == 1 and not exchange_gain_or_loss
+	rate = 1
+	if not (single_currency and presentation_currency in account_currencies):
+		rate = get_rate_as_at(currency_info["report_date"], presentation_currency, company_currency)
 
+	def convert_entry(entry):
+		if single_currency and entry["account_currency"] == presentation_currency:
+			entry["debit"] = flt(entry["debit_in_account_currency"])
+			entry["credit"] = flt(entry["credit_in_account_currency"])
+		else:
 			if entry.get("debit"):
-				entry["debit"] = converted_debit_value
+				entry["debit"] = flt(entry["debit"]) / (rate or 1)
 
 			if entry.get("credit"):
-				entry["credit"] = converted_credit_value
+				entry["credit"] = flt(entry["credit"]) / (rate or 1)
 
-		converted_gl_list.append(entry)
+		return entry
 
-	return converted_gl_list
+	return convert_entry
 
 
 def get_appropriate_company(filters):
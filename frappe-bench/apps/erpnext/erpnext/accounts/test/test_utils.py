@@ -1,15 +1,19 @@
 import unittest
+from unittest.mock import patch
 
 import frappe
+from frappe.model.document import Document
 from frappe.test_runner import make_test_objects
 
 from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.party import get_party_shipping_address
 from erpnext.accounts.utils import (
 	get_future_stock_vouchers,
 	get_voucherwise_gl_entries,
 	sort_stock_vouchers_by_posting_date,
+	update_voucher_outstandings,
 )
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
@@ -128,6 +132,33 @@ class TestUtils(unittest.TestCase):
 		self.assertEqual(len(payment_entry.references), 1)
 		self.assertEqual(payment_entry.difference_amount, 0)
 
+	def test_update_voucher_outstandings(self):
+		invoices = [create_sales_invoice(rate=100 * (i + 1)) for i in range(2)]
+		for invoice in invoices:
+			frappe.db.set_value("Sales Invoice", invoice.name, {"outstanding_amount": 0, "status": "Paid"})
+
+		calls = []
+		run_method = Document.run_method
+
+		def record_run_method(doc, method, *args, **kwargs):
+			calls.append((doc.name, method))
+			return run_method(doc, method, *args, **kwargs)
+
+		with patch.object(Document, "run_method", record_run_method):
+			update_voucher_outstandings(
+				[(si.doctype, si.name, si.debit_to, "Customer", si.customer) for si in invoices]
+			)
+
+		for invoice in invoices:
+			outstanding_amount, status = frappe.db.get_value(
+				"Sales Invoice", invoice.name, ["outstanding_amount", "status"]
+			)
+			self.assertEqual(outstanding_amount, invoice.grand_total)
+			self.assertEqual(status, "Unpaid")
+			# changed invoices run the same hooks as db_set
+			self.assertIn((invoice.name, "before_change"), calls)
+			self.assertIn((invoice.name, "on_change"), calls)
+
 	def test_naming_series_variable_parsing(self):
 		"""
 		Tests parsing utility used by Naming Series Variable hook for FY
@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from collections import defaultdict
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -15,6 +16,7 @@ from frappe.query_builder.functions import Count, Max, Sum
 from frappe.query_builder.utils import DocType
 from frappe.utils import (
 	add_days,
+	add_to_date,
 	cint,
 	create_batch,
 	cstr,
@@ -24,7 +26,9 @@ from frappe.utils import (
 	get_number_format_info,
 	getdate,
 	now,
+	now_datetime,
 	nowdate,
+	time_diff_in_seconds,
 )
 from pypika import Order
 from pypika.terms import ExistsCriterion
@@ -536,14 +540,18 @@ def reconcile_against_document(
 			create_payment_ledger_entry(gl_map, update_outstanding="No", cancel=0, adv_adj=1)
 
 		# Only update outstanding for newly linked vouchers
-		for entry in entries:
-			update_voucher_outstanding(
-				entry.against_voucher_type,
-				entry.against_voucher,
-				entry.account,
-				entry.party_type,
-				entry.party,
-			)
+		update_voucher_outstandings(
+			[
+				(
+					entry.against_voucher_type,
+					entry.against_voucher,
+					entry.account,
+					entry.party_type,
+					entry.party,
+				)
+				for entry in entries
+			]
+		)
 		# update advance paid in Advance Receivable/Payable doctypes
 		if update_advance_paid:
 			for t, n in update_advance_paid:
@@ -1442,7 +1450,11 @@ def repost_gle_for_stock_vouchers(
 	company: str | None = None,
 	warehouse_account=None,
 	repost_doc: Optional["RepostItemValuation"] = None,
+	changed_vouchers: set[tuple[str, str]] | None = None,
 ):
+	"""Regenerate the GL Entries of stock vouchers where they differ from the expected ones.
+
+	If `changed_vouchers` is passed, vouchers not in it are skipped without being compared."""
 	from erpnext.accounts.general_ledger import toggle_debit_credit_if_negative
 
 	if not stock_vouchers:
@@ -1459,9 +1471,15 @@ def repost_gle_for_stock_vouchers(
 	precision = get_field_precision(frappe.get_meta("GL Entry").get_field("debit")) or 2
 
 	for stock_vouchers_chunk in create_batch(stock_vouchers, GL_REPOSTING_CHUNK):
-		gle = get_voucherwise_gl_entries(stock_vouchers_chunk, posting_date)
+		vouchers_to_repost = [
+			voucher
+			for voucher in stock_vouchers_chunk
+			if changed_vouchers is None or tuple(voucher) in changed_vouchers
+		]
+		gle = get_voucherwise_gl_entries(vouchers_to_repost, posting_date)
 
-		for voucher_type, voucher_no in stock_vouchers_chunk:
+		regenerated = 0
+		for voucher_type, voucher_no in vouchers_to_repost:
 			existing_gle = gle.get((voucher_type, voucher_no), [])
 			voucher_obj = frappe.get_doc(voucher_type, voucher_no)
 			# Some transactions post credit as negative debit, this is handled while posting GLE
@@ -1473,6 +1491,10 @@ def repost_gle_for_stock_vouchers(
 				):
 					_delete_accounting_ledger_entries(voucher_type, voucher_no)
 					voucher_obj.make_gl_entries(gl_entries=expected_gle, from_repost=True)
+					regenerated += 1
+			elif existing_gle:
+				_delete_accounting_ledger_entries(voucher_type, voucher_no)
+				regenerated += 1
 			else:
 				_delete_accounting_ledger_entries(voucher_type, voucher_no)
 
@@ -1484,6 +1506,14 @@ def repost_gle_for_stock_vouchers(
 				"gl_reposting_index",
 				cint(repost_doc.gl_reposting_index) + len(stock_vouchers_chunk),
 			)
+			repost_doc.db_set(
+				{
+					"gl_reposted_vouchers": cint(repost_doc.gl_reposted_vouchers) + regenerated,
+					"gl_skipped_vouchers": cint(repost_doc.gl_skipped_vouchers)
+					+ len(stock_vouchers_chunk)
+					- len(vouchers_to_repost),
+				}
+			)
 
 
 def _delete_pl_entries(voucher_type, voucher_no):
@@ -1492,6 +1522,11 @@ def _delete_pl_entries(voucher_type, voucher_no):
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+		remove_voucher_from_account_monthly_balance,
+	)
+
+	remove_voucher_from_account_monthly_balance(voucher_type, voucher_no)
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
@@ -1850,6 +1885,7 @@ def create_payment_ledger_entry(
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
 
+		outstanding_references = []
 		for entry in ple_map:
 			ple = frappe.get_doc(entry)
 
@@ -1860,8 +1896,11 @@ def create_payment_ledger_entry(
 			ple.flags.adv_adj = adv_adj
 			ple.flags.from_repost = from_repost
 			ple.flags.update_outstanding = update_outstanding
+			ple.flags.outstanding_references = outstanding_references
 			ple.submit()
 
+		update_voucher_outstandings(outstanding_references)
+
 
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	ple = frappe.qb.DocType("Payment Ledger Entry")
@@ -1905,6 +1944,115 @@ def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, pa
 		ref_doc.notify_update()
 
 
+def update_voucher_outstandings(references):
+	"""Bulk variant of `update_voucher_outstanding` for (voucher_type, voucher_no, account, party_type,
+	party) references.
+
+	Outstandings come from one Payment Ledger aggregation and the invoices are written with one bulk
+	update per doctype instead of being loaded and saved one by one. As with `db_set`, invoices whose
+	outstanding or status changes go through `before_change` and `on_change`, so Value Change
+	notifications and webhooks still fire."""
+	references = {
+		tuple(reference)
+		for reference in references
+		if reference[0] in ["Sales Invoice", "Purchase Invoice", "Fees"] and reference[3] and reference[4]
+	}
+	if not references:
+		return
+
+	for reference in sorted(references):
+		if reference[0] == "Fees":
+			update_voucher_outstanding(*reference)
+
+	outstandings = get_voucher_outstanding_map([d for d in references if d[0] != "Fees"])
+	for voucher_type in ["Sales Invoice", "Purchase Invoice"]:
+		voucher_outstandings = {
+			voucher_no: outstanding
+			for (_voucher_type, voucher_no), outstanding in sorted(outstandings.items())
+			if _voucher_type == voucher_type
+		}
+		if not voucher_outstandings:
+			continue
+
+		timestamp = now()
+		docs = get_invoices_for_status_update(voucher_type, list(voucher_outstandings))
+		updates = {}
+		changed = []
+		for doc in docs:
+			doc_before_change = frappe.get_doc(doc.as_dict())
+			doc.outstanding_amount = flt(voucher_outstandings[doc.name], doc.precision("outstanding_amount"))
+			doc.set_status()
+			doc.modified = timestamp
+			updates[doc.name] = {"outstanding_amount": doc.outstanding_amount, "status": doc.status}
+
+			if (doc.outstanding_amount, doc.status) != (
+				doc_before_change.outstanding_amount,
+				doc_before_change.status,
+			):
+				doc._doc_before_save = doc_before_change
+				doc.run_method("before_change")
+				changed.append(doc)
+
+		frappe.db.bulk_update(voucher_type, updates, modified=timestamp)
+		for doc in changed:
+			doc.run_method("on_change")
+		for doc in docs:
+			doc.notify_update()
+
+
+def get_voucher_outstanding_map(references):
+	"""Outstanding in account currency of each (voucher_type, voucher_no) in `references`, from one
+	Payment Ledger aggregation. Vouchers without ledger entries of their own are left out, as in
+	`QueryPaymentLedger`."""
+	if not references:
+		return {}
+
+	ple = qb.DocType("Payment Ledger Entry")
+	own_entry = (ple.voucher_type == ple.against_voucher_type) & (ple.voucher_no == ple.against_voucher_no)
+	rows = (
+		qb.from_(ple)
+		.select(
+			ple.against_voucher_type,
+			ple.against_voucher_no,
+			ple.account,
+			ple.party_type,
+			ple.party,
+			Sum(ple.amount_in_account_currency),
+			Sum(Case().when(own_entry, 1).else_(0)),
+		)
+		.where(
+			(ple.delinked == 0)
+			& ple.against_voucher_type.isin(list({d[0] for d in references}))
+			& ple.against_voucher_no.isin(list({d[1] for d in references}))
+			& ple.account.isin(list({d[2] for d in references}))
+		)
+		.groupby(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+	).run()
+
+	references = set(references)
+	return {row[:2]: row[5] for row in rows if row[6] and row[:5] in references}
+
+
+def get_invoices_for_status_update(voucher_type, names):
+	"""Invoices with the payment schedule `set_status` needs, loaded with one query per table."""
+	invoices = frappe.get_all(voucher_type, filters={"name": ("in", names)}, fields=["*"])
+	payment_schedule = defaultdict(list)
+	for row in frappe.get_all(
+		"Payment Schedule",
+		filters={"parent": ("in", names), "parenttype": voucher_type, "parentfield": "payment_schedule"},
+		fields=["*"],
+		order_by="idx",
+	):
+		payment_schedule[row.parent].append(row)
+
+	return [
+		frappe.get_doc(
+			{**invoice, "doctype": voucher_type, "payment_schedule": payment_schedule[invoice.name]}
+		)
+		for invoice in invoices
+	]
+
+
 def delink_original_entry(pl_entry, partial_cancel=False):
 	if pl_entry:
 		ple = qb.DocType("Payment Ledger Entry")
@@ -2275,45 +2423,213 @@ def get_advance_payment_doctypes():
 	return frappe.get_hooks("advance_payment_doctypes")
 
 
+LEDGER_HEALTH_CHECKS = ("debit_credit_mismatch", "general_and_payment_ledger_mismatch")
+# Minutes before the last run from which vouchers are checked again, to cover entries that were
+# committed after the last run but stamped before it
+LEDGER_HEALTH_RECHECK_MINUTES = 60
+
+
 def run_ledger_health_checks():
+	"""Check the vouchers posted or modified since the last run and upsert their Ledger Health."""
 	health_monitor_settings = frappe.get_doc("Ledger Health Monitor")
-	if health_monitor_settings.enable_health_monitor:
-		period_end = getdate()
-		period_start = add_days(period_end, -abs(health_monitor_settings.monitor_for_last_x_days))
-
-		run_date = get_datetime()
-
-		# Debit-Credit mismatch report
-		if health_monitor_settings.debit_credit_mismatch:
-			for x in health_monitor_settings.companies:
-				filters = {"company": x.company, "from_date": period_start, "to_date": period_end}
-				voucher_wise = frappe.get_doc("Report", "Voucher-wise Balance")
-				res = voucher_wise.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.debit_credit_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
-
-		# General Ledger and Payment Ledger discrepancy
-		if health_monitor_settings.general_and_payment_ledger_mismatch:
-			for x in health_monitor_settings.companies:
-				filters = {
-					"company": x.company,
-					"period_start_date": period_start,
-					"period_end_date": period_end,
-				}
-				gl_pl_comparison = frappe.get_doc("Report", "General and Payment Ledger Comparison")
-				res = gl_pl_comparison.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.general_and_payment_ledger_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
+	if not health_monitor_settings.enable_health_monitor:
+		return
+
+	period_end = getdate()
+	period_start = add_days(period_end, -abs(health_monitor_settings.monitor_for_last_x_days))
+	since = None
+	if health_monitor_settings.last_run_on:
+		since = add_to_date(health_monitor_settings.last_run_on, minutes=-LEDGER_HEALTH_RECHECK_MINUTES)
+
+	run_date = get_datetime()
+	checks = [check for check in LEDGER_HEALTH_CHECKS if health_monitor_settings.get(check)]
+	durations = dict.fromkeys(checks, 0.0)
+
+	for company in {x.company for x in health_monitor_settings.companies}:
+		conditions = frappe._dict(
+			gl=get_ledger_health_condition("GL Entry", company, period_start, period_end, since),
+			ple=get_ledger_health_condition("Payment Ledger Entry", company, period_start, period_end, since),
+		)
+		findings = {}
+
+		for check in checks:
+			start = now_datetime()
+			for voucher_type, voucher_no in get_ledger_health_mismatches(check, conditions):
+				findings.setdefault((voucher_type, voucher_no), set()).add(check)
+			durations[check] += time_diff_in_seconds(now_datetime(), start)
+
+		upsert_ledger_health(findings, conditions, checks, run_date)
+
+	frappe.db.set_single_value(
+		"Ledger Health Monitor",
+		{"last_run_on": run_date, **{f"{check}_duration": flt(durations[check], 3) for check in checks}},
+	)
+
+
+def get_ledger_health_condition(doctype, company, period_start, period_end, since=None):
+	"""Entries of `doctype` (GL Entry or Payment Ledger Entry) of `company` in the period, limited to
+	the vouchers whose General or Payment Ledger entries were posted or modified on or after `since`."""
+	table = qb.DocType(doctype)
+	condition = (table.company == company) & (table.posting_date[period_start:period_end])
+
+	if since:
+
+		def get_modified_vouchers(ledger):
+			return (
+				qb.from_(ledger)
+				.select(ledger.voucher_no)
+				.distinct()
+				.where(
+					(ledger.company == company)
+					& (ledger.posting_date[period_start:period_end])
+					& (ledger.modified >= since)
+				)
+			)
+
+		condition &= table.voucher_no.isin(
+			get_modified_vouchers(qb.DocType("GL Entry"))
+		) | table.voucher_no.isin(get_modified_vouchers(qb.DocType("Payment Ledger Entry")))
+
+	return condition
+
+
+def get_ledger_health_mismatches(check, conditions):
+	if check == "debit_credit_mismatch":
+		return get_debit_credit_mismatches(conditions.gl)
+
+	return get_general_and_payment_ledger_mismatches(conditions)
+
+
+def get_debit_credit_mismatches(condition):
+	"""Vouchers whose GL Entries do not balance, as in the Voucher-wise Balance report."""
+	gle = qb.DocType("GL Entry")
+	return (
+		qb.from_(gle)
+		.select(gle.voucher_type, gle.voucher_no)
+		.where(condition & (gle.is_cancelled == 0))
+		.groupby(gle.voucher_type, gle.voucher_no)
+		.having(Sum(gle.debit) != Sum(gle.credit))
+	).run()
+
+
+def get_general_and_payment_ledger_mismatches(conditions):
+	"""Vouchers whose receivable and payable balances differ between the General and Payment Ledger,
+	as in the General and Payment Ledger Comparison report."""
+	gle = qb.DocType("GL Entry")
+	ple = qb.DocType("Payment Ledger Entry")
+	account = qb.DocType("Account")
+
+	outstanding = (
+		Case().when(account.account_type == "Payable", gle.credit - gle.debit).else_(gle.debit - gle.credit)
+	)
+	general_ledger = (
+		qb.from_(gle)
+		.inner_join(account)
+		.on(gle.account == account.name)
+		.select(
+			gle.account,
+			gle.voucher_type,
+			gle.voucher_no,
+			gle.party_type,
+			gle.party,
+			Sum(outstanding).as_("outstanding"),
+		)
+		.where(conditions.gl & (gle.is_cancelled == 0) & account.account_type.isin(["Receivable", "Payable"]))
+		.groupby(gle.account, gle.voucher_type, gle.voucher_no, gle.party_type, gle.party)
+	).run()
+
+	payment_ledger = (
+		qb.from_(ple)
+		.select(
+			ple.account,
+			ple.voucher_type,
+			ple.voucher_no,
+			ple.party_type,
+			ple.party,
+			Sum(ple.amount).as_("outstanding"),
+		)
+		.where(conditions.ple & (ple.delinked == 0))
+		.groupby(ple.account, ple.voucher_type, ple.voucher_no, ple.party_type, ple.party)
+	).run()
+
+	general_ledger = {row[:-1]: row[-1] for row in general_ledger}
+	payment_ledger = {row[:-1]: row[-1] for row in payment_ledger}
+
+	return {
+		(key[1], key[2])
+		for key in general_ledger.keys() | payment_ledger.keys()
+		if general_ledger.get(key) != payment_ledger.get(key)
+	}
+
+
+def upsert_ledger_health(findings, conditions, checks, run_date):
+	"""Replace the Ledger Health of the rechecked vouchers with `findings`.
+
+	Flags of checks that did not run are carried over from the existing rows."""
+	lh = qb.DocType("Ledger Health")
+	existing = (
+		qb.from_(lh)
+		.select(lh.name, lh.voucher_type, lh.voucher_no, *[lh[check] for check in LEDGER_HEALTH_CHECKS])
+		.run(as_dict=True)
+	)
+
+	rechecked = set(findings)
+	if existing:
+		existing_vouchers = list({row.voucher_no for row in existing})
+		for ledger, condition in (
+			(qb.DocType("GL Entry"), conditions.gl),
+			(qb.DocType("Payment Ledger Entry"), conditions.ple),
+		):
+			rechecked.update(
+				qb.from_(ledger)
+				.select(ledger.voucher_type, ledger.voucher_no)
+				.distinct()
+				.where(condition & ledger.voucher_no.isin(existing_vouchers))
+				.run()
+			)
+
+	to_delete = []
+	for row in existing:
+		key = (row.voucher_type, row.voucher_no)
+		if key not in rechecked:
+			continue
+
+		to_delete.append(row.name)
+		for check in LEDGER_HEALTH_CHECKS:
+			if check not in checks and row.get(check):
+				findings.setdefault(key, set()).add(check)
+
+	if to_delete:
+		frappe.db.delete("Ledger Health", {"name": ("in", to_delete)})
+
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Ledger Health",
+		fields=[
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"voucher_type",
+			"voucher_no",
+			"checked_on",
+			*LEDGER_HEALTH_CHECKS,
+		],
+		values=[
+			(
+				run_date,
+				run_date,
+				user,
+				user,
+				voucher_type,
+				voucher_no,
+				run_date,
+				*(int(check in flags) for check in LEDGER_HEALTH_CHECKS),
+			)
+			for (voucher_type, voucher_no), flags in sorted(findings.items())
+			if flags
+		],
+	)
 
 
 def sync_auto_reconcile_config(auto_reconciliation_job_trigger: int = 15):
@@ -2,10 +2,107 @@
 # GPL v3 License. See license.txt
 
 import click
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
 
 
 def call_command(cmd, context):
 	return click.Context(cmd, obj=context).forward(cmd)
 
 
-commands = []
+@click.command("rebuild-account-monthly-balance")
+@click.option("--company", help="Rebuild only for this company")
+@pass_context
+def rebuild_account_monthly_balance(context, company=None):
+	"Rebuild Account Monthly Balance from GL Entry"
+	import frappe
+
+	from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+		rebuild_account_monthly_balance,
+	)
+
+	for site in context.sites:
+		try:
+			frappe.init(site=site)
+			frappe.connect()
+			rebuild_account_monthly_balance(company)
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+@click.command("rebuild-pricing-rule-cumulative-totals")
+@click.option("--pricing-rule", help="Rebuild only for this Pricing Rule")
+@pass_context
+def rebuild_pricing_rule_cumulative_totals(context, pricing_rule=None):
+	"Rebuild the totals of cumulative Pricing Rules from submitted transactions"
+	import frappe
+
+	from erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total import (
+		rebuild_pricing_rule_cumulative_totals,
+	)
+
+	for site in context.sites:
+		try:
+			frappe.init(site=site)
+			frappe.connect()
+			rebuild_pricing_rule_cumulative_totals(pricing_rule)
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+@click.command("rebuild-batch-bin")
+@click.option("--item-code", help="Rebuild only for this Item")
+@pass_context
+def rebuild_batch_bin(context, item_code=None):
+	"Rebuild Batch Bin from Stock Ledger Entry"
+	import frappe
+
+	from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bin
+
+	for site in context.sites:
+		try:
+			frappe.init(site=site)
+			frappe.connect()
+			rebuild_batch_bin(item_code)
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+@click.command("rebuild-stock-balance-snapshots")
+@click.option("--company", help="Rebuild only for this company")
+@pass_context
+def rebuild_stock_balance_snapshots(context, company=None):
+	"Rebuild the Stock Balance Snapshot of the last month end from Stock Ledger Entry"
+	import frappe
+
+	from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+		rebuild_stock_balance_snapshots,
+	)
+
+	for site in context.sites:
+		try:
+			frappe.init(site=site)
+			frappe.connect()
+			rebuild_stock_balance_snapshots(company)
+			frappe.db.commit()
+		finally:
+			frappe.destroy()
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+commands = [
+	rebuild_account_monthly_balance,
+	rebuild_pricing_rule_cumulative_totals,
+	rebuild_batch_bin,
+	rebuild_stock_balance_snapshots,
+]
@@ -37,6 +37,9 @@ from erpnext.accounts.doctype.pricing_rule.utils import (
 	apply_pricing_rule_on_transaction,
 	get_applied_pricing_rules,
 )
+from erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total import (
+	update_pricing_rule_cumulative_totals,
+)
 from erpnext.accounts.general_ledger import get_round_off_account_and_cost_center
 from erpnext.accounts.party import (
 	get_party_account,
@@ -3784,6 +3787,8 @@ def update_child_qty_rate(parent_doctype, trans_items, parent_doctype_name, chil
 	parent = frappe.get_doc(parent_doctype, parent_doctype_name)
 
 	check_doc_permissions(parent, "write")
+	# items are re-added to the cumulative pricing rule totals after save
+	update_pricing_rule_cumulative_totals(parent, sign=-1)
 	_removed_items = validate_and_delete_children(parent, data)
 	items_added_or_removed |= _removed_items
 
@@ -3949,6 +3954,7 @@ def update_child_qty_rate(parent_doctype, trans_items, parent_doctype_name, chil
 		row.idx = idx
 
 	parent.save()
+	update_pricing_rule_cumulative_totals(parent)
 
 	if parent_doctype == "Purchase Order":
 		update_last_purchase_rate(parent, is_submit=1)
@@ -323,6 +323,19 @@ period_closing_doctypes = [
 	"Subcontracting Receipt",
 ]
 
+# doctypes whose submitted transactions count towards cumulative pricing rules
+pricing_rule_cumulative_doctypes = [
+	"Quotation",
+	"Sales Order",
+	"Delivery Note",
+	"Sales Invoice",
+	"POS Invoice",
+	"Supplier Quotation",
+	"Purchase Order",
+	"Purchase Receipt",
+	"Purchase Invoice",
+]
+
 doc_events = {
 	"*": {
 		"validate": [
@@ -333,6 +346,10 @@ doc_events = {
 	tuple(period_closing_doctypes): {
 		"validate": "erpnext.accounts.doctype.accounting_period.accounting_period.validate_accounting_period_on_doc_save",
 	},
+	tuple(pricing_rule_cumulative_doctypes): {
+		"on_submit": "erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total.update_cumulative_totals",
+		"on_cancel": "erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total.update_cumulative_totals",
+	},
 	"Stock Entry": {
 		"on_submit": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
 		"on_cancel": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
@@ -471,6 +488,7 @@ scheduler_events = {
 		"erpnext.manufacturing.doctype.bom_update_tool.bom_update_tool.auto_update_latest_price_in_all_boms",
 		"erpnext.crm.utils.open_leads_opportunities_based_on_todays_event",
 		"erpnext.assets.doctype.asset.depreciation.post_depreciation_entries",
+		"erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot.create_stock_balance_snapshots",
 	],
 	"monthly_long": [
 		"erpnext.accounts.deferred_revenue.process_deferred_accounting",
@@ -556,6 +574,7 @@ accounting_dimension_doctypes = [
 	"Subcontracting Receipt",
 	"Subcontracting Receipt Item",
 	"Account Closing Balance",
+	"Account Monthly Balance",
 	"Supplier Quotation",
 	"Supplier Quotation Item",
 	"Payment Reconciliation",
@@ -18,6 +18,8 @@ from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_item_details
 from erpnext.stock.get_item_details import get_conversion_factor, get_price_list_rate
 
+BOM_ITEMS_PER_UNIT_KEY = "bom_items_per_unit"
+
 form_grid_templates = {"items": "templates/form_grid/item_grid.html"}
 
 
@@ -305,8 +307,10 @@ class BOM(WebsiteGenerator):
 	def on_submit(self):
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		clear_bom_items_per_unit_cache()
 
 	def on_cancel(self):
+		clear_bom_items_per_unit_cache()
 		self.db_set("is_active", 0)
 		self.db_set("is_default", 0)
 
@@ -773,7 +777,7 @@ class BOM(WebsiteGenerator):
 			row.cost_per_unit = row.operating_cost / (row.batch_size or 1.0)
 			row.base_cost_per_unit = row.base_operating_cost / (row.batch_size or 1.0)
 
-		if update_hour_rate:
+		if update_hour_rate and not self.flags.defer_db_update:
 			row.db_update()
 
 	def calculate_rm_cost(self, save=False):
@@ -784,7 +788,9 @@ class BOM(WebsiteGenerator):
 
 		for d in self.get("items"):
 			old_rate = d.rate
-			if not self.bom_creator and d.is_stock_item:
+			if not self.bom_creator and d.is_stock_item and self.flags.rm_rates is not None:
+				d.rate = self.flags.rm_rates[d.name]
+			elif not self.bom_creator and d.is_stock_item:
 				d.rate = self.get_rm_rate(
 					{
 						"company": self.company,
@@ -807,7 +813,7 @@ class BOM(WebsiteGenerator):
 
 			total_rm_cost += d.amount
 			base_total_rm_cost += d.base_amount
-			if save and (old_rate != d.rate):
+			if save and (old_rate != d.rate) and not self.flags.defer_db_update:
 				d.db_update()
 
 		self.raw_material_cost = total_rm_cost
@@ -828,7 +834,7 @@ class BOM(WebsiteGenerator):
 			)
 			total_sm_cost += d.amount
 			base_total_sm_cost += d.base_amount
-			if save:
+			if save and not self.flags.defer_db_update:
 				d.db_update()
 
 		self.scrap_material_cost = total_sm_cost
@@ -843,7 +849,7 @@ class BOM(WebsiteGenerator):
 			row.rate = rm_rate_map.get(row.item_code)
 			row.amount = flt(row.stock_qty) * flt(row.rate)
 
-			if old_rate != row.rate:
+			if old_rate != row.rate and not self.flags.defer_db_update:
 				# Only db_update if changed
 				row.db_update()
 
@@ -852,7 +858,9 @@ class BOM(WebsiteGenerator):
 		rm_rate_map = {}
 
 		for item in self.get("items"):
-			if item.bom_no:
+			if item.bom_no and self.flags.explosion_item_rates is not None:
+				rm_rate_map.update(self.flags.explosion_item_rates.get(item.bom_no, {}))
+			elif item.bom_no:
 				# Get Item-Rate from Subassembly BOM
 				explosion_items = frappe.get_all(
 					"BOM Explosion Item",
@@ -1234,6 +1242,75 @@ def get_bom_items(bom, company, qty=1, fetch_exploded=1):
 	return items
 
 
+def get_bom_items_per_unit(bom_no, exploded=False):
+	"""Items of `bom_no` with their stock qty for one unit of the BOM's item, from BOM Explosion Item
+	when `exploded` else from BOM Item. Submitted BOMs are cached until a BOM is submitted or
+	cancelled or a BOM Update Log runs."""
+	key = f"{bom_no}:{cint(exploded)}"
+	items = frappe.cache().hget(BOM_ITEMS_PER_UNIT_KEY, key)
+	if items is None:
+		items, docstatus = _get_bom_items_per_unit(bom_no, exploded)
+		if docstatus == 1:
+			frappe.cache().hset(BOM_ITEMS_PER_UNIT_KEY, key, items)
+
+	return items
+
+
+def _get_bom_items_per_unit(bom_no, exploded):
+	bom_item = frappe.qb.DocType("BOM Explosion Item" if exploded else "BOM Item")
+	bom = frappe.qb.DocType("BOM")
+
+	rows = (
+		frappe.qb.from_(bom_item)
+		.join(bom)
+		.on(bom.name == bom_item.parent)
+		.select(
+			bom_item.item_code,
+			bom_item.stock_qty,
+			bom_item.stock_uom,
+			bom_item.description,
+			bom_item.source_warehouse,
+			bom.quantity,
+			bom.item.as_("main_bom_item"),
+			bom.docstatus,
+		)
+		.where((bom.name == bom_no) & (bom_item.docstatus < 2))
+		.orderby(bom_item.idx)
+	).run(as_dict=True)
+
+	items = {}
+	for row in rows:
+		# exploded items are kept per stock UOM, like the BOM Explosion Item rows they sum up
+		key = (row.item_code, row.stock_uom) if exploded else row.item_code
+		if key not in items:
+			items[key] = frappe._dict(
+				item_code=row.item_code,
+				stock_uom=row.stock_uom,
+				description=row.description,
+				source_warehouse=row.source_warehouse,
+				main_bom_item=row.main_bom_item,
+				stock_qty=0.0,
+			)
+
+		quantity = 1 if row.quantity is None else flt(row.quantity)
+		if quantity:
+			items[key].stock_qty += flt(row.stock_qty) / quantity
+
+	return list(items.values()), rows[0].docstatus if rows else None
+
+
+def clear_bom_items_per_unit_cache():
+	frappe.cache().delete_key(BOM_ITEMS_PER_UNIT_KEY)
+
+	# the cache may be filled from uncommitted data before the transaction ends
+	frappe.db.after_commit.add(_delete_bom_items_per_unit_cache)
+	frappe.db.after_rollback.add(_delete_bom_items_per_unit_cache)
+
+
+def _delete_bom_items_per_unit_cache():
+	frappe.cache().delete_key(BOM_ITEMS_PER_UNIT_KEY)
+
+
 def validate_bom_no(item, bom_no):
 	"""Validate BOM No of sub-contracted items"""
 	bom = frappe.get_doc("BOM", bom_no)
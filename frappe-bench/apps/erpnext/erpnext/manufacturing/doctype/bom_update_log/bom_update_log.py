@@ -11,6 +11,7 @@ from frappe.query_builder.functions import Now
 from frappe.utils import cint, cstr, date_diff, today
 
 from erpnext.manufacturing.doctype.bom_update_log.bom_updation_utils import (
+	clear_dependence_map,
 	get_leaf_boms,
 	get_next_higher_level_boms,
 	handle_exception,
@@ -158,6 +159,7 @@ def process_boms_cost_level_wise(
 			# First level yet to process. On Submit.
 			current_level = 0
 			current_boms = get_leaf_boms()
+			clear_dependence_map()
 			values = {
 				"processed_boms": json.dumps({}),
 				"status": "In Progress",
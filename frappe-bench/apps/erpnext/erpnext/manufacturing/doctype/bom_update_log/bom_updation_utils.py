@@ -4,13 +4,24 @@
 import copy
 import json
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:
 	from erpnext.manufacturing.doctype.bom_update_log.bom_update_log import BOMUpdateLog
 
 import frappe
 from frappe import _
+from frappe.query_builder.functions import Count, Sum
+from frappe.utils import flt
+
+from erpnext.manufacturing.doctype.bom.bom import (
+	clear_bom_items_per_unit_cache,
+	get_bom_item_rate,
+	get_valuation_rate,
+)
+
+BOM_COST_CHUNK_SIZE = 500
+BOM_DEPENDENCE_MAP_KEY = "bom_dependence_map"
 
 
 def replace_bom(boms: dict, log_name: str) -> None:
@@ -42,6 +53,8 @@ def replace_bom(boms: dict, log_name: str) -> None:
 		}
 		bom_obj.save_version()
 
+	clear_bom_items_per_unit_cache()
+
 
 def update_cost_in_level(doc: "BOMUpdateLog", bom_list: list[str], batch_name: int | str) -> None:
 	"Updates Cost for BOMs within a given level. Runs via background jobs."
@@ -52,6 +65,7 @@ def update_cost_in_level(doc: "BOMUpdateLog", bom_list: list[str], batch_name: i
 			return
 
 		update_cost_in_boms(bom_list=bom_list)  # main updation logic
+		clear_bom_items_per_unit_cache()
 
 		bom_batch = frappe.qb.DocType("BOM Update Batch")
 		(
@@ -113,17 +127,210 @@ def get_bom_unit_cost(bom_name: str) -> float:
 
 
 def update_cost_in_boms(bom_list: list[str]) -> None:
-	"Updates cost in given BOMs. Returns current and total updated BOMs."
+	"Updates cost in given BOMs, a chunk at a time."
 
-	for index, bom in enumerate(bom_list):
-		bom_doc = frappe.get_doc("BOM", bom, for_update=True)
-		bom_doc.calculate_cost(save_updates=True, update_hour_rate=True)
-		bom_doc.db_update()
+	for index in range(0, len(bom_list), BOM_COST_CHUNK_SIZE):
+		BOMCostRollup(bom_list[index : index + BOM_COST_CHUNK_SIZE]).run()
 
-		if (index % 50 == 0) and not frappe.flags.in_test:
+		if not frappe.flags.in_test:
 			frappe.db.commit()  # nosemgrep
 
 
+class BOMCostRollup:
+	"""Recompute the costs of BOMs whose sub-assembly BOMs are already up to date.
+
+	The BOMs, their child rows and the rates of their items are loaded with a few queries for the
+	whole list. Costs are calculated in memory by the BOM's own methods and only the changed rows are
+	written back, with one bulk update per table."""
+
+	child_tables: ClassVar[dict[str, str]] = {
+		"items": "BOM Item",
+		"operations": "BOM Operation",
+		"scrap_items": "BOM Scrap Item",
+		"exploded_items": "BOM Explosion Item",
+	}
+
+	def __init__(self, bom_list: list[str]) -> None:
+		self.bom_list = bom_list
+		self.valuation_rates = {}
+
+	def run(self) -> None:
+		boms = self.get_boms()
+		if not boms:
+			return
+
+		self.load_rates(boms)
+
+		updates = defaultdict(dict)
+		for bom in boms:
+			self.update_cost(bom, updates)
+
+		for doctype, doc_updates in updates.items():
+			frappe.db.bulk_update(doctype, doc_updates, update_modified=False)
+
+	def get_boms(self) -> list:
+		bom_table = frappe.qb.DocType("BOM")
+		headers = (
+			frappe.qb.from_(bom_table)
+			.select("*")
+			.where(bom_table.name.isin(self.bom_list))
+			.orderby(bom_table.name)
+			.for_update()
+		).run(as_dict=True)
+		if not headers:
+			return []
+
+		names = [header.name for header in headers]
+		children = {}
+		for fieldname, doctype in self.child_tables.items():
+			children[fieldname] = defaultdict(list)
+			for row in frappe.get_all(
+				doctype,
+				filters={"parent": ("in", names), "parenttype": "BOM", "parentfield": fieldname},
+				fields=["*"],
+				order_by="idx",
+			):
+				children[fieldname][row.parent].append(row)
+
+		return [
+			frappe.get_doc(
+				{
+					**header,
+					"doctype": "BOM",
+					**{fieldname: rows.get(header.name, []) for fieldname, rows in children.items()},
+				}
+			)
+			for header in headers
+		]
+
+	def load_rates(self, boms: list) -> None:
+		rows = [row for bom in boms for row in bom.items]
+		item_codes = list({row.item_code for row in rows})
+		child_boms = list({row.bom_no for row in rows if row.bom_no})
+
+		self.items = {
+			d.name: d
+			for d in frappe.get_all(
+				"Item",
+				filters={"name": ("in", item_codes)},
+				fields=["name", "is_customer_provided_item", "last_purchase_rate"],
+			)
+		}
+
+		self.bom_unit_costs = {}
+		self.explosion_item_rates = defaultdict(dict)
+		if child_boms:
+			for d in frappe.get_all(
+				"BOM",
+				filters={"name": ("in", child_boms)},
+				fields=["name", "is_active", "base_total_cost", "quantity"],
+			):
+				if d.is_active and flt(d.quantity):
+					self.bom_unit_costs[d.name] = flt(d.base_total_cost) / flt(d.quantity)
+
+			for d in frappe.get_all(
+				"BOM Explosion Item",
+				filters={"parent": ("in", child_boms), "parenttype": "BOM"},
+				fields=["parent", "item_code", "rate"],
+				order_by="idx",
+			):
+				self.explosion_item_rates[d.parent][d.item_code] = flt(d.rate)
+
+		self.load_valuation_rates(item_codes, list({bom.company for bom in boms}))
+
+	def load_valuation_rates(self, item_codes: list[str], companies: list[str]) -> None:
+		"""Average valuation rates from the bins, as in `get_valuation_rate`. Items without a positive
+		rate there fall back to `get_valuation_rate` itself when they are first needed."""
+		if not item_codes:
+			return
+
+		bin_table = frappe.qb.DocType("Bin")
+		wh_table = frappe.qb.DocType("Warehouse")
+
+		for d in (
+			frappe.qb.from_(bin_table)
+			.join(wh_table)
+			.on(bin_table.warehouse == wh_table.name)
+			.select(
+				bin_table.item_code,
+				wh_table.company,
+				Count(bin_table.name).as_("bins"),
+				Sum(bin_table.stock_value).as_("stock_value"),
+				Sum(bin_table.actual_qty).as_("actual_qty"),
+			)
+			.where(bin_table.item_code.isin(item_codes) & wh_table.company.isin(companies))
+			.groupby(bin_table.item_code, wh_table.company)
+		).run(as_dict=True):
+			if flt(d.actual_qty) and flt(d.stock_value) / flt(d.actual_qty) > 0:
+				self.valuation_rates[(d.item_code, d.company)] = flt(d.stock_value) / flt(d.actual_qty)
+
+	def get_valuation_rate(self, item_code: str, company: str) -> float:
+		key = (item_code, company)
+		if key not in self.valuation_rates:
+			self.valuation_rates[key] = get_valuation_rate({"item_code": item_code, "company": company})
+
+		return self.valuation_rates[key]
+
+	def get_rm_rate(self, bom, row) -> float:
+		"Same as `BOM.get_rm_rate`, from the preloaded rates."
+		if not bom.rm_cost_as_per:
+			bom.rm_cost_as_per = "Valuation Rate"
+
+		rate = 0
+		item = self.items.get(row.item_code) or frappe._dict()
+		if not item.is_customer_provided_item and not row.sourced_by_supplier:
+			conversion_factor = row.conversion_factor or 1
+
+			if row.bom_no and bom.set_rate_of_sub_assembly_item_based_on_bom:
+				rate = flt(self.bom_unit_costs.get(row.bom_no)) * conversion_factor
+			elif bom.rm_cost_as_per == "Valuation Rate":
+				rate = self.get_valuation_rate(row.item_code, bom.company) * conversion_factor
+			elif bom.rm_cost_as_per == "Last Purchase Rate":
+				rate = flt(item.last_purchase_rate) * conversion_factor
+			else:
+				rate = get_bom_item_rate(
+					{
+						"company": bom.company,
+						"item_code": row.item_code,
+						"bom_no": row.bom_no,
+						"qty": row.qty,
+						"uom": row.uom,
+						"stock_uom": row.stock_uom,
+						"conversion_factor": row.conversion_factor,
+						"sourced_by_supplier": row.sourced_by_supplier,
+					},
+					bom,
+				)
+
+		return flt(rate) * flt(bom.plc_conversion_rate or 1) / (bom.conversion_rate or 1)
+
+	def update_cost(self, bom, updates: dict) -> None:
+		docs = [bom, *[row for fieldname in self.child_tables for row in bom.get(fieldname)]]
+		previous_values = [self.get_values(doc) for doc in docs]
+
+		bom.flags.defer_db_update = True
+		bom.flags.explosion_item_rates = self.explosion_item_rates
+		bom.flags.rm_rates = {
+			row.name: self.get_rm_rate(bom, row)
+			for row in bom.items
+			if not bom.bom_creator and row.is_stock_item
+		}
+		bom.calculate_cost(save_updates=True, update_hour_rate=True)
+
+		for doc, previous in zip(docs, previous_values, strict=True):
+			changed = {
+				fieldname: value
+				for fieldname, value in self.get_values(doc).items()
+				if value != previous.get(fieldname)
+			}
+			if changed:
+				updates[doc.doctype][doc.name] = changed
+
+	@staticmethod
+	def get_values(doc) -> dict:
+		return doc.get_valid_dict()
+
+
 def get_next_higher_level_boms(child_boms: list[str], processed_boms: dict[str, bool]) -> list[str]:
 	"Generate immediate higher level dependants with no unresolved dependencies (children)."
 
@@ -131,7 +338,7 @@ def get_next_higher_level_boms(child_boms: list[str], processed_boms: dict[str,
 		child_boms = dependency_map.get(parent_bom)
 		return all(processed_boms.get(bom) for bom in child_boms)
 
-	dependants_map, dependency_map = _generate_dependence_map()
+	dependants_map, dependency_map = get_dependence_map()
 
 	dependants = []
 	for bom in child_boms:
@@ -168,6 +375,15 @@ def get_leaf_boms() -> list[str]:
 	return boms
 
 
+def get_dependence_map() -> tuple[defaultdict, defaultdict]:
+	"Dependence maps of the BOM tree, built once per 'Update Cost' run."
+	return frappe.cache().get_value(BOM_DEPENDENCE_MAP_KEY, _generate_dependence_map)
+
+
+def clear_dependence_map() -> None:
+	frappe.cache().delete_value(BOM_DEPENDENCE_MAP_KEY)
+
+
 def _generate_dependence_map() -> defaultdict:
 	"""
 	Generate maps such as: { BOM-1: [Dependant-BOM-1, Dependant-BOM-2, ..] }.
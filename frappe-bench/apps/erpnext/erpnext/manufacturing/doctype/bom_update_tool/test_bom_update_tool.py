@@ -64,3 +64,30 @@ class TestBOMUpdateTool(FrappeTestCase):
 
 		doc.load_from_db()
 		self.assertEqual(doc.total_cost, 200)
+
+	@timeout
+	def test_bom_cost_rolled_up_to_parent_boms(self):
+		from unittest.mock import patch
+
+		for item in ["BOM Rollup FG Item", "BOM Rollup Sub Item", "BOM Rollup RM Item"]:
+			create_item(item, valuation_rate=100)
+			frappe.db.set_value("Item", item, "valuation_rate", 100)
+
+		sub_bom = make_bom(item="BOM Rollup Sub Item", raw_materials=["BOM Rollup RM Item"], rm_qty=2)
+		fg_bom = make_bom(item="BOM Rollup FG Item", raw_materials=["BOM Rollup Sub Item"])
+		frappe.db.set_value("BOM Item", fg_bom.items[0].name, "bom_no", sub_bom.name)
+		frappe.db.set_value("BOM", fg_bom.name, "set_rate_of_sub_assembly_item_based_on_bom", 1)
+
+		frappe.db.set_value("Item", "BOM Rollup RM Item", "valuation_rate", 150)
+		update_cost_in_all_boms_in_test()
+
+		self.assertEqual(frappe.db.get_value("BOM", sub_bom.name, "total_cost"), 300)
+		self.assertEqual(frappe.db.get_value("BOM", fg_bom.name, "total_cost"), 300)
+
+		# nothing is written when no cost changed
+		with patch.object(frappe.db, "bulk_update", wraps=frappe.db.bulk_update) as bulk_update:
+			update_cost_in_all_boms_in_test()
+
+		updated = {name for call in bulk_update.call_args_list for name in call.args[1]}
+		self.assertNotIn(sub_bom.name, updated)
+		self.assertNotIn(fg_bom.name, updated)
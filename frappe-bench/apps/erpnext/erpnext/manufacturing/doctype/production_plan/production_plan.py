@@ -24,8 +24,8 @@ from frappe.utils import (
 from frappe.utils.csvutils import build_csv_response
 from pypika.terms import ExistsCriterion
 
+from erpnext.manufacturing.doctype.bom.bom import get_bom_items_per_unit, validate_bom_no
 from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
-from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.get_item_details import get_conversion_factor
@@ -1153,53 +1153,97 @@ def download_raw_materials(doc, warehouses=None):
 	build_csv_response(item_list, doc.name)
 
 
-def get_exploded_items(item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None):
-	bei = frappe.qb.DocType("BOM Explosion Item")
-	bom = frappe.qb.DocType("BOM")
+def get_exploded_items(
+	item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None, item_master=None
+):
+	bom_items = get_bom_items_per_unit(bom_no, exploded=True)
+	item_master = get_item_master_details([d.item_code for d in bom_items], company, item_master)
+
+	for row in bom_items:
+		item = item_master.get(row.item_code)
+		if not item or not (include_non_stock_items or item.is_stock_item):
+			continue
+
+		item_details.setdefault(
+			row.item_code,
+			frappe._dict(
+				qty=row.stock_qty * flt(planned_qty),
+				item_name=item.item_name,
+				item_code=row.item_code,
+				description=row.description,
+				stock_uom=row.stock_uom,
+				min_order_qty=item.min_order_qty,
+				source_warehouse=row.source_warehouse,
+				default_material_request_type=item.default_material_request_type,
+				default_warehouse=item.default_warehouse,
+				purchase_uom=item.purchase_uom,
+				conversion_factor=item.conversion_factor,
+				safety_stock=item.safety_stock,
+				main_bom_item=row.main_bom_item,
+			),
+		)
+
+	return item_details
+
+
+def get_item_master_details(item_codes, company, item_master=None):
+	"""Item fields used to plan raw materials, with the company's default warehouse and the purchase
+	UOM conversion factor. Only the items missing from `item_master` are fetched."""
+	if item_master is None:
+		item_master = frappe._dict()
+
+	item_codes = {item_code for item_code in item_codes if item_code not in item_master}
+	if not item_codes:
+		return item_master
+
 	item = frappe.qb.DocType("Item")
 	item_default = frappe.qb.DocType("Item Default")
 	item_uom = frappe.qb.DocType("UOM Conversion Detail")
 
 	data = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
+		frappe.qb.from_(item)
 		.left_join(item_default)
 		.on((item_default.parent == item.name) & (item_default.company == company))
 		.left_join(item_uom)
 		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
 		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
-			item.item_name,
 			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
-			item.min_order_qty,
-			bei.source_warehouse,
+			item.item_name,
+			item.is_stock_item,
+			item.is_sub_contracted_item.as_("is_sub_contracted"),
+			item.default_bom,
 			item.default_material_request_type,
 			item.min_order_qty,
-			item_default.default_warehouse,
+			item.safety_stock,
 			item.purchase_uom,
+			item_default.default_warehouse,
 			item_uom.conversion_factor,
-			item.safety_stock,
-			bom.item.as_("main_bom_item"),
 		)
-		.where(
-			(bei.docstatus < 2)
-			& (bom.name == bom_no)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bei.item_code, bei.stock_uom)
+		.where(item.name.isin(item_codes))
 	).run(as_dict=True)
 
 	for d in data:
-		if not d.conversion_factor and d.purchase_uom:
-			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-		item_details.setdefault(d.get("item_code"), d)
+		item_master.setdefault(d.item_code, d)
+
+	return item_master
 
-	return item_details
+
+def prefetch_item_master_details(bom_nos, company, item_master=None):
+	"""Fetch the item details of every level of `bom_nos`, one query per BOM level."""
+	item_master = frappe._dict() if item_master is None else item_master
+
+	bom_nos = set(filter(None, bom_nos))
+	item_codes = {d.item_code for bom_no in bom_nos for d in get_bom_items_per_unit(bom_no, exploded=True)}
+	visited = set()
+	while bom_nos:
+		visited |= bom_nos
+		item_codes |= {d.item_code for bom_no in bom_nos for d in get_bom_items_per_unit(bom_no)}
+		get_item_master_details(item_codes, company, item_master)
+
+		bom_nos = {item_master[d].default_bom for d in item_codes if item_master.get(d)} - visited - {None}
+		item_codes = set()
+
+	return item_master
 
 
 def get_uom_conversion_factor(item_code, uom):
@@ -1218,58 +1262,42 @@ def get_subitems(
 	include_subcontracted_items,
 	parent_qty,
 	planned_qty=1,
+	item_master=None,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
+	bom_items = get_bom_items_per_unit(bom_no)
+	item_master = get_item_master_details([d.item_code for d in bom_items], company, item_master)
 
-	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
-		.left_join(item_default)
-		.on((item.name == item_default.parent) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			bom_item.item_code,
-			item.default_material_request_type,
-			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
-			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
-			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
-			item.min_order_qty.as_("min_order_qty"),
-			item.safety_stock.as_("safety_stock"),
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-			bom.item.as_("main_bom_item"),
-		)
-		.where(
-			(bom.name == bom_no)
-			& (bom_item.docstatus < 2)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
+	items = []
+	for row in bom_items:
+		item = item_master.get(row.item_code)
+		if not item or not (include_non_stock_items or item.is_stock_item):
+			continue
+
+		items.append(
+			frappe._dict(
+				item_code=row.item_code,
+				default_material_request_type=item.default_material_request_type,
+				item_name=item.item_name,
+				qty=flt(parent_qty) * row.stock_qty * flt(planned_qty),
+				is_sub_contracted=item.is_sub_contracted,
+				source_warehouse=row.source_warehouse,
+				default_bom=item.default_bom,
+				description=row.description,
+				stock_uom=row.stock_uom,
+				min_order_qty=item.min_order_qty,
+				safety_stock=item.safety_stock,
+				default_warehouse=item.default_warehouse,
+				purchase_uom=item.purchase_uom,
+				conversion_factor=item.conversion_factor,
+				main_bom_item=row.main_bom_item,
+			)
 		)
-		.groupby(bom_item.item_code)
-	).run(as_dict=True)
 
 	for d in items:
 		if not data.get("include_exploded_items") or not d.default_bom:
 			if d.item_code in item_details:
 				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
 			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-
 				item_details[d.item_code] = d
 
 		if data.get("include_exploded_items") and d.default_bom:
@@ -1286,6 +1314,7 @@ def get_subitems(
 						include_non_stock_items,
 						include_subcontracted_items,
 						d.qty,
+						item_master=item_master,
 					)
 	return item_details
 
@@ -1326,7 +1355,7 @@ def get_material_request_items(
 
 			required_qty = required_qty / row["conversion_factor"]
 
-	if frappe.db.get_value("UOM", row["purchase_uom"], "must_be_whole_number"):
+	if frappe.get_cached_value("UOM", row["purchase_uom"], "must_be_whole_number"):
 		required_qty = ceil(required_qty)
 
 	if include_safety_stock:
@@ -1474,6 +1503,65 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 	return query.run(as_dict=True)
 
 
+def get_bin_details_for_items(rows, company, for_warehouse=None):
+	"""`get_bin_details` for many rows at once, returned in the order of `rows`.
+
+	The bins of every item are fetched in one query and matched to the warehouse subtree of each row
+	in memory."""
+	item_codes = {row.get("item_code") for row in rows}
+	if not item_codes:
+		return []
+
+	row_warehouses = [
+		for_warehouse or row.get("source_warehouse") or row.get("default_warehouse") for row in rows
+	]
+	bounds = {}
+	if warehouses := set(filter(None, row_warehouses)):
+		bounds = {
+			d.name: (d.lft, d.rgt)
+			for d in frappe.get_all(
+				"Warehouse", filters={"name": ("in", list(warehouses))}, fields=["name", "lft", "rgt"]
+			)
+		}
+
+	bin = frappe.qb.DocType("Bin")
+	wh = frappe.qb.DocType("Warehouse")
+
+	bins = defaultdict(list)
+	for d in (
+		frappe.qb.from_(bin)
+		.join(wh)
+		.on(wh.name == bin.warehouse)
+		.select(
+			bin.item_code,
+			bin.warehouse,
+			wh.lft,
+			wh.rgt,
+			IfNull(Sum(bin.projected_qty), 0).as_("projected_qty"),
+			IfNull(Sum(bin.actual_qty), 0).as_("actual_qty"),
+			IfNull(Sum(bin.ordered_qty), 0).as_("ordered_qty"),
+			IfNull(Sum(bin.reserved_qty_for_production), 0).as_("reserved_qty_for_production"),
+			IfNull(Sum(bin.planned_qty), 0).as_("planned_qty"),
+		)
+		.where((bin.item_code.isin(item_codes)) & (wh.company == company))
+		.groupby(bin.item_code, bin.warehouse)
+		.orderby(bin.item_code)
+		.orderby(bin.warehouse)
+	).run(as_dict=True):
+		bins[d.pop("item_code")].append(d)
+
+	result = []
+	for row, warehouse in zip(rows, row_warehouses, strict=True):
+		item_bins = bins.get(row.get("item_code"), [])
+		if warehouse:
+			lft, rgt = bounds.get(warehouse, (None, None))
+			item_bins = [d for d in item_bins if lft is not None and d.lft >= lft and d.rgt <= rgt]
+
+		result.append([{k: v for k, v in d.items() if k not in ("lft", "rgt")} for d in item_bins])
+
+	return result
+
+
 @frappe.whitelist()
 def get_so_details(sales_order):
 	return frappe.db.get_value(
@@ -1542,6 +1630,9 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 	include_safety_stock = doc.get("include_safety_stock")
 
 	so_item_details = frappe._dict()
+	item_master = prefetch_item_master_details(
+		[data.get("bom") or data.get("bom_no") for data in po_items], company
+	)
 
 	sub_assembly_items = defaultdict(int)
 	if doc.get("skip_available_sub_assembly_item") and doc.get("sub_assembly_items"):
@@ -1593,6 +1684,7 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 						include_non_stock_items,
 						planned_qty=planned_qty,
 						doc=doc,
+						item_master=item_master,
 					)
 				else:
 					item_details = get_subitems(
@@ -1605,29 +1697,30 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 						include_subcontracted_items,
 						1,
 						planned_qty=planned_qty,
+						item_master=item_master,
 					)
 		elif data.get("item_code"):
-			item_master = frappe.get_doc("Item", data["item_code"]).as_dict()
-			purchase_uom = item_master.purchase_uom or item_master.stock_uom
+			item_doc = frappe.get_doc("Item", data["item_code"]).as_dict()
+			purchase_uom = item_doc.purchase_uom or item_doc.stock_uom
 			conversion_factor = (
-				get_uom_conversion_factor(item_master.name, purchase_uom) if item_master.purchase_uom else 1.0
+				get_uom_conversion_factor(item_doc.name, purchase_uom) if item_doc.purchase_uom else 1.0
 			)
 
-			item_details[item_master.name] = frappe._dict(
+			item_details[item_doc.name] = frappe._dict(
 				{
-					"item_name": item_master.item_name,
+					"item_name": item_doc.item_name,
 					"default_bom": doc.bom,
 					"purchase_uom": purchase_uom,
-					"default_warehouse": item_master.default_warehouse,
-					"min_order_qty": item_master.min_order_qty,
-					"default_material_request_type": item_master.default_material_request_type,
+					"default_warehouse": item_doc.default_warehouse,
+					"min_order_qty": item_doc.min_order_qty,
+					"default_material_request_type": item_doc.default_material_request_type,
 					"qty": planned_qty or 1,
-					"is_sub_contracted": item_master.is_subcontracted_item,
-					"item_code": item_master.name,
-					"description": item_master.description,
-					"stock_uom": item_master.stock_uom,
+					"is_sub_contracted": item_doc.is_subcontracted_item,
+					"item_code": item_doc.name,
+					"description": item_doc.description,
+					"stock_uom": item_doc.stock_uom,
 					"conversion_factor": conversion_factor,
-					"safety_stock": item_master.safety_stock,
+					"safety_stock": item_doc.safety_stock,
 				}
 			)
 
@@ -1643,25 +1736,29 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 				so_item_details[sales_order][item_code] = details
 
 	mr_items = []
-	for sales_order in so_item_details:
-		item_dict = so_item_details[sales_order]
-		for details in item_dict.values():
-			bin_dict = get_bin_details(details, doc.company, warehouse)
-			bin_dict = bin_dict[0] if bin_dict else {}
-
-			if details.qty > 0:
-				items = get_material_request_items(
-					doc,
-					details,
-					sales_order,
-					company,
-					ignore_existing_ordered_qty,
-					include_safety_stock,
-					warehouse,
-					bin_dict,
-				)
-				if items:
-					mr_items.append(items)
+	so_items = [
+		(sales_order, details)
+		for sales_order, item_dict in so_item_details.items()
+		for details in item_dict.values()
+	]
+	item_bins = get_bin_details_for_items([details for _, details in so_items], doc.company, warehouse)
+
+	for (sales_order, details), bin_dict in zip(so_items, item_bins, strict=True):
+		bin_dict = bin_dict[0] if bin_dict else {}
+
+		if details.qty > 0:
+			items = get_material_request_items(
+				doc,
+				details,
+				sales_order,
+				company,
+				ignore_existing_ordered_qty,
+				include_safety_stock,
+				warehouse,
+				bin_dict,
+			)
+			if items:
+				mr_items.append(items)
 
 	if (not ignore_existing_ordered_qty or get_parent_warehouse_data) and warehouses:
 		new_mr_items = []
@@ -1770,7 +1867,8 @@ def get_sub_assembly_items(
 			stock_qty = (d.stock_qty / d.parent_bom_qty) * flt(to_produce_qty)
 
 			if skip_available_sub_assembly_item and d.item_code not in sub_assembly_items:
-				bin_details.setdefault(d.item_code, get_bin_details(d, company, for_warehouse=warehouse))
+				if d.item_code not in bin_details:
+					bin_details[d.item_code] = get_bin_details(d, company, for_warehouse=warehouse)
 
 				for _bin_dict in bin_details[d.item_code]:
 					if _bin_dict.projected_qty > 0:
@@ -1782,7 +1880,8 @@ def get_sub_assembly_items(
 							stock_qty = stock_qty - _bin_dict.projected_qty
 							sub_assembly_items.append(d.item_code)
 			elif warehouse:
-				bin_details.setdefault(d.item_code, get_bin_details(d, company, for_warehouse=warehouse))
+				if d.item_code not in bin_details:
+					bin_details[d.item_code] = get_bin_details(d, company, for_warehouse=warehouse)
 
 			if stock_qty > 0:
 				bom_data.append(
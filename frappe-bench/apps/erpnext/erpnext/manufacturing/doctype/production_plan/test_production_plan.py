@@ -1557,6 +1557,45 @@ class TestProductionPlan(FrappeTestCase):
 		for d in mr_items:
 			self.assertEqual(d.get("quantity"), 1000.0)
 
+	def test_raw_materials_query_count_independent_of_items(self):
+		from unittest.mock import patch
+
+		rm_items = [make_item(properties={"is_stock_item": 1}).name for i in range(2)]
+		fg_items = []
+		for i in range(4):
+			fg_item = make_item(properties={"is_stock_item": 1}).name
+			make_bom(item=fg_item, raw_materials=rm_items, rm_qty=i + 1)
+			fg_items.append(fg_item)
+
+		def get_raw_materials(items):
+			pln = create_production_plan(item_code=items[0], skip_getting_mr_items=1, do_not_save=1)
+			pln.for_warehouse = "_Test Warehouse - _TC"
+			pln.ignore_existing_ordered_qty = 1
+			for item in items[1:]:
+				pln.append(
+					"po_items",
+					{
+						"item_code": item,
+						"bom_no": frappe.db.get_value("Item", item, "default_bom"),
+						"planned_qty": 1,
+					},
+				)
+
+			with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+				mr_items = get_items_for_material_requests(pln.as_dict())
+
+			return {d["item_code"]: d["quantity"] for d in mr_items}, sql.call_count
+
+		# warm up the caches
+		get_raw_materials(fg_items)
+
+		quantities, query_count = get_raw_materials(fg_items[:1])
+		self.assertEqual(quantities, dict.fromkeys(rm_items, 1))
+
+		quantities, all_items_query_count = get_raw_materials(fg_items)
+		self.assertEqual(quantities, dict.fromkeys(rm_items, 1 + 2 + 3 + 4))
+		self.assertEqual(all_items_query_count, query_count)
+
 	def test_fg_item_quantity(self):
 		fg_item = make_item(properties={"is_stock_item": 1}).name
 		rm_item = make_item(properties={"is_stock_item": 1}).name
@@ -0,0 +1,7 @@
+from erpnext.accounts.doctype.pricing_rule_cumulative_total.pricing_rule_cumulative_total import (
+	rebuild_pricing_rule_cumulative_totals,
+)
+
+
+def execute():
+	rebuild_pricing_rule_cumulative_totals()
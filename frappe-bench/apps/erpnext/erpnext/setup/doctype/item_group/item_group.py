@@ -63,7 +63,11 @@ class ItemGroup(NestedSet):
 		self.delete_child_item_groups_key()
 
 	def delete_child_item_groups_key(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
+
 		frappe.cache().hdel("child_item_groups", self.name)
+		# pricing rule index holds the item group ancestry
+		clear_pricing_rule_index()
 
 	def validate_item_group_defaults(self):
 		from erpnext.stock.doctype.item.item import validate_item_default_company_links
@@ -10,6 +10,11 @@ from frappe.model.document import Document
 from frappe.utils import cint, comma_and, create_batch, get_link_to_form
 from frappe.utils.background_jobs import get_job, is_job_enqueued
 
+from erpnext.accounts.doctype.account_monthly_balance.account_monthly_balance import (
+	is_account_monthly_balance_enabled,
+	rebuild_account_monthly_balance,
+)
+
 LEDGER_ENTRY_DOCTYPES = frozenset(
 	(
 		"GL Entry",
@@ -342,6 +347,10 @@ class TransactionDeletionRecord(Document):
 				# recursively call this task to delete all transactions
 				self.enqueue_task(task="Delete Transactions")
 			else:
+				if is_account_monthly_balance_enabled():
+					# GL Entries were deleted without updating the balances, some may have been kept
+					rebuild_account_monthly_balance(self.company)
+
 				self.db_set("status", "Completed")
 				self.db_set("delete_transactions", 1)
 				self.db_set("error_log", None)
@@ -171,6 +171,12 @@ class Batch(Document):
 	def before_save(self):
 		self.set_expiry_date()
 
+	def on_change(self):
+		if self.has_value_changed("expiry_date") or self.has_value_changed("disabled"):
+			from erpnext.stock.doctype.batch_bin.batch_bin import update_batch_details
+
+			update_batch_details(self)
+
 	def set_expiry_date(self):
 		has_expiry_date, shelf_life_in_days = frappe.db.get_value(
 			"Item", self.item, ["has_expiry_date", "shelf_life_in_days"]
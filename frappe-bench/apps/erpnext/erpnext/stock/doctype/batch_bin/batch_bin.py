@@ -0,0 +1,187 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import now, today
+
+
+class BatchBin(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		batch_creation: DF.Datetime | None
+		batch_no: DF.Link | None
+		disabled: DF.Check
+		expiry_date: DF.Date | None
+		item_code: DF.Link | None
+		qty: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def update_batch_bin(sle):
+	"""Add the batches in the Serial and Batch Bundle of a submitted Stock Ledger Entry."""
+	if not sle.serial_and_batch_bundle or sle.is_cancelled:
+		return
+
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	upsert_batch_bins(get_sle_batches(stock_ledger_entry.name == sle.name))
+
+
+def remove_voucher_from_batch_bin(voucher_type, voucher_no):
+	"""Called before the Stock Ledger Entries of a voucher are marked as cancelled."""
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	batches = get_sle_batches(
+		(stock_ledger_entry.voucher_type == voucher_type)
+		& (stock_ledger_entry.voucher_no == voucher_no)
+		& (stock_ledger_entry.is_cancelled == 0)
+	)
+
+	for batch in batches:
+		batch.qty = -batch.qty
+
+	upsert_batch_bins(batches)
+
+
+def rebuild_batch_bin(item_code=None, warehouse=None):
+	"""Recompute the batch balances from the Stock Ledger, for one or all items and warehouses."""
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	condition = stock_ledger_entry.is_cancelled == 0
+	filters = {}
+
+	if item_code:
+		filters["item_code"] = item_code
+		condition &= stock_ledger_entry.item_code == item_code
+
+	if warehouse:
+		filters["warehouse"] = warehouse
+		condition &= stock_ledger_entry.warehouse == warehouse
+
+	frappe.db.delete("Batch Bin", filters)
+
+	upsert_batch_bins(get_sle_batches(condition))
+
+
+def update_batch_details(batch):
+	"""Copy the expiry date and disabled status of a Batch to its balances."""
+	batch_bin = frappe.qb.DocType("Batch Bin")
+	(
+		frappe.qb.update(batch_bin)
+		.set(batch_bin.expiry_date, batch.expiry_date)
+		.set(batch_bin.disabled, batch.disabled)
+		.where(batch_bin.batch_no == batch.name)
+	).run()
+
+
+def get_sle_batches(condition):
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+	batch_table = frappe.qb.DocType("Batch")
+
+	return (
+		frappe.qb.from_(stock_ledger_entry)
+		.inner_join(batch_ledger)
+		.on(stock_ledger_entry.serial_and_batch_bundle == batch_ledger.parent)
+		.inner_join(batch_table)
+		.on(batch_ledger.batch_no == batch_table.name)
+		.select(
+			stock_ledger_entry.item_code,
+			batch_ledger.warehouse,
+			batch_ledger.batch_no,
+			Sum(batch_ledger.qty).as_("qty"),
+			batch_table.expiry_date,
+			batch_table.disabled,
+			batch_table.creation.as_("batch_creation"),
+		)
+		.where(condition)
+		.groupby(stock_ledger_entry.item_code, batch_ledger.warehouse, batch_ledger.batch_no)
+	).run(as_dict=True)
+
+
+def upsert_batch_bins(batches, chunk_size=1000):
+	"""Insert the balances, adding the qty to the existing row if there is one.
+
+	Rows are written in name order so that concurrent transactions lock them in the same order."""
+	if not batches:
+		return
+
+	timestamp = now()
+	rows = sorted(
+		(
+			dict(
+				name=hashlib.sha1(
+					"\x1f".join([batch.item_code, batch.warehouse, batch.batch_no]).encode()
+				).hexdigest(),
+				**batch,
+				creation=timestamp,
+				modified=timestamp,
+				owner=frappe.session.user,
+				modified_by=frappe.session.user,
+			)
+			for batch in batches
+		),
+		key=lambda row: row["name"],
+	)
+	fields = list(rows[0])
+
+	if frappe.db.db_type == "postgres":
+		updates = "`qty` = `tabBatch Bin`.`qty` + excluded.`qty`, `modified` = excluded.`modified`"
+	else:
+		updates = "`qty` = `qty` + values(`qty`), `modified` = values(`modified`)"
+
+	placeholder = "({})".format(", ".join(["%s"] * len(fields)))
+	for i in range(0, len(rows), chunk_size):
+		chunk = rows[i : i + chunk_size]
+		frappe.db.sql(
+			"""insert into `tabBatch Bin` ({columns}) values {values}
+			{on_duplicate_update}{updates}""".format(
+				columns=", ".join(f"`{field}`" for field in fields),
+				values=", ".join([placeholder] * len(chunk)),
+				on_duplicate_update=frappe.db.get_on_duplicate_update(),
+				updates=updates,
+			),
+			[row[field] for row in chunk for field in fields],
+		)
+
+
+def get_available_batches_from_batch_bin(kwargs):
+	"""Current batch balances, with the same filters and order as `get_available_batches`."""
+	batch_bin = frappe.qb.DocType("Batch Bin")
+
+	query = (
+		frappe.qb.from_(batch_bin)
+		.select(batch_bin.batch_no, batch_bin.warehouse, batch_bin.qty, batch_bin.expiry_date)
+		.where((batch_bin.disabled == 0) & (batch_bin.qty != 0))
+	)
+
+	if not kwargs.get("for_stock_levels"):
+		query = query.where((batch_bin.expiry_date >= today()) | (batch_bin.expiry_date.isnull()))
+
+	for field in ["warehouse", "item_code", "batch_no"]:
+		if not kwargs.get(field):
+			continue
+
+		if isinstance(kwargs.get(field), list):
+			query = query.where(batch_bin[field].isin(kwargs.get(field)))
+		else:
+			query = query.where(batch_bin[field] == kwargs.get(field))
+
+	if kwargs.based_on == "LIFO":
+		query = query.orderby(batch_bin.batch_creation, order=frappe.qb.desc)
+	elif kwargs.based_on == "Expiry":
+		query = query.orderby(batch_bin.expiry_date)
+	else:
+		query = query.orderby(batch_bin.batch_creation)
+
+	return query.run(as_dict=True)
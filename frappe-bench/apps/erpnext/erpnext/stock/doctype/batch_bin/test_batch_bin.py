@@ -0,0 +1,54 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bin
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import get_available_batches
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_batch_from_bundle,
+)
+
+
+class TestBatchBin(FrappeTestCase):
+	def get_batch_bin_qty(self, item_code, batch_no):
+		return frappe.db.get_value(
+			"Batch Bin",
+			{"item_code": item_code, "batch_no": batch_no, "warehouse": "_Test Warehouse - _TC"},
+			"qty",
+		)
+
+	def test_batch_bin_updated_on_submit_and_cancel(self):
+		item_code = make_item(
+			"_Test Batch Bin Item",
+			{"has_batch_no": 1, "create_new_batch": 1, "batch_number_series": "TBB-.#####"},
+		).name
+
+		pr = make_purchase_receipt(item_code=item_code, qty=10, rate=100, warehouse="_Test Warehouse - _TC")
+		batch_no = get_batch_from_bundle(pr.items[0].serial_and_batch_bundle)
+		self.assertEqual(self.get_batch_bin_qty(item_code, batch_no), 10)
+
+		batches = get_available_batches(
+			frappe._dict(item_code=item_code, warehouse="_Test Warehouse - _TC", batch_no=batch_no)
+		)
+		self.assertEqual(batches[0].qty, 10)
+
+		frappe.db.set_value("Batch Bin", {"batch_no": batch_no}, "qty", 0)
+		rebuild_batch_bin(item_code)
+		self.assertEqual(self.get_batch_bin_qty(item_code, batch_no), 10)
+
+		# entries changed after posting are picked up by rebuilding the item and warehouse
+		bundle_entry = frappe.db.get_value(
+			"Serial and Batch Entry", {"parent": pr.items[0].serial_and_batch_bundle}, "name"
+		)
+		frappe.db.set_value("Serial and Batch Entry", bundle_entry, "qty", 8)
+		rebuild_batch_bin(item_code, "_Test Warehouse - _TC")
+		self.assertEqual(self.get_batch_bin_qty(item_code, batch_no), 8)
+		frappe.db.set_value("Serial and Batch Entry", bundle_entry, "qty", 10)
+		rebuild_batch_bin(item_code, "_Test Warehouse - _TC")
+
+		pr.cancel()
+		self.assertEqual(self.get_batch_bin_qty(item_code, batch_no), 0)
@@ -11,7 +11,7 @@ import frappe.defaults
 from frappe.model.document import Document
 from frappe.utils import flt
 
-from erpnext.stock.get_item_details import get_item_details, get_price_list_rate
+from erpnext.stock.get_item_details import get_items_details_bulk, get_price_list_rate
 
 
 class PackedItem(Document):
@@ -343,18 +343,12 @@ def on_doctype_update():
 
 @frappe.whitelist()
 def get_items_from_product_bundle(row):
-	row, items = json.loads(row), []
+	row = json.loads(row)
+	row.update({"conversion_rate": 1, "currency": frappe.defaults.get_defaults().currency})
 
 	bundled_items = get_product_bundle_items(row["item_code"])
-	for item in bundled_items:
-		row.update(
-			{
-				"item_code": item.item_code,
-				"qty": flt(row["quantity"]) * flt(item.qty),
-				"conversion_rate": 1,
-				"currency": frappe.defaults.get_defaults().currency,
-			}
-		)
-		items.append(get_item_details(row))
+	items = [
+		{"item_code": item.item_code, "qty": flt(row["quantity"]) * flt(item.qty)} for item in bundled_items
+	]
 
-	return items
+	return get_items_details_bulk(row, items)
@@ -7,8 +7,9 @@ from frappe.desk.form.load import get_attachments
 from frappe.exceptions import QueryDeadlockError, QueryTimeoutError
 from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
-from frappe.query_builder.functions import Max, Now
-from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.query_builder.functions import Count, Max, Now
+from frappe.utils import cint, create_batch, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
@@ -17,7 +18,11 @@ from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
 from erpnext.stock.stock_ledger import (
 	get_affected_transactions,
+	get_changed_transactions,
+	get_distinct_item_warehouse,
 	get_items_to_be_repost,
+	get_reposting_data,
+	invalidate_stock_balance_snapshots,
 	repost_future_sle,
 )
 
@@ -38,11 +43,14 @@ class RepostItemValuation(Document):
 		allow_zero_rate: DF.Check
 		amended_from: DF.Link | None
 		based_on: DF.Literal["Transaction", "Item and Warehouse"]
+		changed_transactions: DF.Code | None
 		company: DF.Link | None
 		current_index: DF.Int
 		distinct_item_and_warehouse: DF.Code | None
 		error_log: DF.LongText | None
+		gl_reposted_vouchers: DF.Int
 		gl_reposting_index: DF.Int
+		gl_skipped_vouchers: DF.Int
 		item_code: DF.Link | None
 		items_to_be_repost: DF.Code | None
 		posting_date: DF.Date
@@ -199,6 +207,7 @@ class RepostItemValuation(Document):
 
 		        These flags are useful for asserting real time behaviour like quantity updates.
 		"""
+		invalidate_stock_balance_snapshots(self.company, self.posting_date)
 
 		if not frappe.flags.in_test:
 			return
@@ -225,6 +234,16 @@ class RepostItemValuation(Document):
 		self.distinct_item_and_warehouse = None
 		self.items_to_be_repost = None
 		self.gl_reposting_index = 0
+		self.gl_reposted_vouchers = 0
+		self.gl_skipped_vouchers = 0
+
+		# vouchers changed by the earlier run show no difference when reposted again, but their
+		# GL Entries may not have been reposted yet
+		if (changed_transactions := get_changed_transactions(self)) is not None:
+			self.changed_transactions = frappe.as_json(
+				[[*transaction, difference] for transaction, difference in changed_transactions.items()]
+			)
+
 		self.clear_attachment()
 		self.db_update()
 
@@ -290,6 +309,9 @@ def repost(doc):
 		repost_sl_entries(doc)
 		repost_gl_entries(doc)
 
+		# snapshots taken while the repost was queued may have missed its changes
+		invalidate_stock_balance_snapshots(doc.company, doc.posting_date)
+
 		doc.set_status("Completed")
 		doc.db_set("reposting_data_file", None)
 		remove_attached_file(doc.name)
@@ -384,9 +406,30 @@ def repost_gl_entries(doc):
 		doc.posting_date,
 		doc.company,
 		repost_doc=doc,
+		changed_vouchers=_get_changed_vouchers(doc),
 	)
 
 
+def _get_changed_vouchers(doc):
+	"""Vouchers whose GL Entries have to be regenerated, or None to regenerate all of them.
+
+	The Stock Ledger repost records the vouchers whose stock value difference changed, the others
+	post the same GL Entries as before. The reposted transaction itself is always included."""
+	if not frappe.db.get_single_value("Stock Reposting Settings", "repost_gl_for_changed_vouchers_only"):
+		return
+
+	changed_transactions = get_changed_transactions(doc)
+	if changed_transactions is None:
+		# reposted before the changes were recorded
+		return
+
+	changed_vouchers = set(changed_transactions)
+	if doc.based_on == "Transaction":
+		changed_vouchers.add((doc.voucher_type, doc.voucher_no))
+
+	return changed_vouchers
+
+
 def _get_directly_dependent_vouchers(doc):
 	"""Get stock vouchers that are directly affected by reposting
 	i.e. any one item-warehouse is present in the stock transaction"""
@@ -456,6 +499,11 @@ def repost_entries():
 	if not in_configured_timeslot():
 		return
 
+	repost_settings = frappe.get_cached_doc("Stock Reposting Settings")
+	if repost_settings.parallel_reposting:
+		enqueue_parallel_reposts(cint(repost_settings.max_parallel_reposting_jobs) or 1)
+		return
+
 	riv_entries = get_repost_item_valuation_entries()
 
 	for row in riv_entries:
@@ -480,6 +528,165 @@ def get_repost_item_valuation_entries():
 	)
 
 
+def enqueue_parallel_reposts(max_jobs):
+	"""Split queued reposts into independent groups and process each group in its own job.
+
+	Reposts are dependent when they share an item (stock moves between warehouses through
+	transfers), a voucher they have already affected, or an item consumed or produced by a
+	future manufacturing / repack entry. Groups already being processed by a running job are
+	left alone until that job finishes."""
+
+	riv_entries = get_repost_item_valuation_entries()
+	if not riv_entries:
+		return
+
+	components = get_independent_repost_groups([row.name for row in riv_entries])
+	components = [
+		component for component in components if not any(is_repost_claimed(name) for name in component)
+	]
+
+	# pack the components in at most `max_jobs` jobs, largest first
+	jobs = [[] for _ in range(min(max_jobs, len(components)))]
+	for component in sorted(components, key=len, reverse=True):
+		min(jobs, key=len).extend(component)
+
+	for names in jobs:
+		job_id = "repost_item_valuation::" + frappe.generate_hash(length=10)
+		for name in names:
+			frappe.cache.hset("repost_item_valuation_jobs", name, job_id)
+
+		frappe.enqueue(
+			repost_group,
+			queue="long",
+			timeout=7200,
+			job_id=job_id,
+			names=names,
+		)
+
+
+def repost_group(names):
+	"""Serially repost a group of dependent entries, in posting order."""
+	for name in names:
+		# skip entries deleted, cancelled or completed since the group was built
+		status = frappe.db.get_value(
+			"Repost Item Valuation", {"name": name, "docstatus": 1}, "status", for_update=True
+		)
+		if status not in ("Queued", "In Progress"):
+			continue
+
+		doc = frappe.get_doc("Repost Item Valuation", name)
+		repost(doc)
+		doc.deduplicate_similar_repost()
+		frappe.cache.hdel("repost_item_valuation_jobs", name)
+
+
+def is_repost_claimed(name):
+	job_id = frappe.cache.hget("repost_item_valuation_jobs", name)
+	return bool(job_id) and is_job_enqueued(job_id)
+
+
+def get_independent_repost_groups(names):
+	"""Return connected components of reposts, each sorted in the order they were queued."""
+
+	parent = {}
+
+	def find(node):
+		parent.setdefault(node, node)
+		while parent[node] != node:
+			parent[node] = parent[parent[node]]
+			node = parent[node]
+		return node
+
+	def union(a, b):
+		parent[find(a)] = find(b)
+
+	min_posting_date = None
+	repost_items = set()
+	for name in names:
+		doc = frappe.get_doc("Repost Item Valuation", name)
+		find(name)
+		for key in get_repost_dependency_keys(doc):
+			union(name, key)
+			if key[0] == "item":
+				repost_items.add(key[1])
+
+		if not min_posting_date or getdate(doc.posting_date) < min_posting_date:
+			min_posting_date = getdate(doc.posting_date)
+
+	for items in get_items_linked_by_future_vouchers(min_posting_date, repost_items):
+		for item_code in items[1:]:
+			union(("item", items[0]), ("item", item_code))
+
+	components = {}
+	for name in names:
+		components.setdefault(find(name), []).append(name)
+
+	return list(components.values())
+
+
+def get_repost_dependency_keys(doc):
+	"""Items and vouchers through which `doc` can change the valuation of other reposts."""
+
+	reposting_data = {}
+	if doc.reposting_data_file:
+		reposting_data = get_reposting_data(doc.reposting_data_file)
+
+	if doc.based_on == "Transaction":
+		args = get_items_to_be_repost(
+			voucher_type=doc.voucher_type, voucher_no=doc.voucher_no, doc=doc, reposting_data=reposting_data
+		)
+		distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
+		items = {item_code for item_code, _warehouse in distinct_item_warehouses}
+		items.update(d.get("item_code") for d in args)
+	else:
+		items = {doc.item_code}
+
+	keys = {("item", item_code) for item_code in items}
+	keys.update(("voucher", *transaction) for transaction in get_affected_transactions(doc, reposting_data))
+
+	return keys
+
+
+def get_items_linked_by_future_vouchers(posting_date, items):
+	"""Items posted together by a voucher on or after `posting_date` that posts any of `items`.
+
+	Besides feeding each other's valuation (manufacture, repack, subcontracting), reposts of any two
+	items of a voucher would both repost its GL Entries, so they can't run in parallel. Vouchers are
+	picked and grouped in SQL, only the items of vouchers posting several items are read."""
+	if not items:
+		return []
+
+	sle = DocType("Stock Ledger Entry")
+	future_entries = (sle.posting_date >= posting_date) & (sle.is_cancelled == 0)
+	vouchers = (
+		frappe.qb.from_(sle)
+		.select(sle.voucher_type, sle.voucher_no)
+		.where(
+			future_entries
+			& sle.voucher_no.isin(
+				frappe.qb.from_(sle)
+				.select(sle.voucher_no)
+				.where(future_entries & sle.item_code.isin(list(items)))
+			)
+		)
+		.groupby(sle.voucher_type, sle.voucher_no)
+		.having(Count(sle.item_code).distinct() > 1)
+	).run()
+
+	voucher_items = {tuple(voucher): [] for voucher in vouchers}
+	for voucher_nos in create_batch([voucher_no for _voucher_type, voucher_no in vouchers], 1000):
+		for row in (
+			frappe.qb.from_(sle)
+			.select(sle.voucher_type, sle.voucher_no, sle.item_code)
+			.distinct()
+			.where(future_entries & sle.voucher_no.isin(voucher_nos))
+		).run(as_dict=True):
+			if (row.voucher_type, row.voucher_no) in voucher_items:
+				voucher_items[(row.voucher_type, row.voucher_no)].append(row.item_code)
+
+	return list(voucher_items.values())
+
+
 def in_configured_timeslot(repost_settings=None, current_time=None):
 	"""Check if current time is in configured timeslot for reposting."""
 
@@ -14,6 +14,8 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	_get_changed_vouchers,
+	get_independent_repost_groups,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -178,6 +180,40 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 		riv4.set_status("Skipped")
 		riv3.set_status("Skipped")
 
+	def test_independent_repost_groups(self):
+		item, other_item = self.make_item().name, self.make_item().name
+		riv_args = frappe._dict(
+			doctype="Repost Item Valuation",
+			based_on="Item and Warehouse",
+			posting_date="2021-01-02",
+			posting_time="00:01:00",
+		)
+
+		rivs = []
+		for item_code, warehouse in (
+			(item, "_Test Warehouse - _TC"),
+			(other_item, "_Test Warehouse - _TC"),
+			(item, "Stores - _TC"),
+		):
+			riv = frappe.get_doc(riv_args.copy().update({"item_code": item_code, "warehouse": warehouse}))
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+			rivs.append(riv.name)
+
+		groups = sorted(get_independent_repost_groups(rivs), key=len)
+
+		# same item in another warehouse can be affected by transfers, different item can't
+		self.assertEqual(groups, [[rivs[1]], [rivs[0], rivs[2]]])
+
+		# GL Entries of a voucher with both items are reposted by both
+		pr = make_purchase_receipt(item_code=item, qty=1, rate=100, do_not_submit=True)
+		pr.append("items", {**pr.items[0].as_dict(), "name": None, "idx": None, "item_code": other_item})
+		pr.submit()
+		self.assertEqual(get_independent_repost_groups(rivs), [rivs])
+
+		for riv in rivs:
+			frappe.get_doc("Repost Item Valuation", riv).set_status("Skipped")
+
 	def test_stock_freeze_validation(self):
 		today = nowdate()
 
@@ -300,6 +336,62 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 			gle_filters={"account": "Stock In Hand - TCP1"},
 		)
 
+	@change_settings("Stock Reposting Settings", {"repost_gl_for_changed_vouchers_only": 1})
+	def test_gl_repost_only_for_changed_vouchers(self):
+		item = self.make_item().name
+		company = "_Test Company with perpetual inventory"
+
+		make_stock_entry(
+			item=item,
+			company=company,
+			qty=10,
+			rate=10,
+			target="Stores - TCP1",
+			posting_date=add_days(today(), -5),
+		)
+		consumption = make_stock_entry(
+			item=item, company=company, qty=5, source="Stores - TCP1", posting_date=add_days(today(), -1)
+		)
+		make_stock_entry(item=item, company=company, qty=5, rate=10, target="Stores - TCP1")
+
+		def get_repost_doc():
+			return frappe.get_last_doc("Repost Item Valuation", filters={"item_code": item})
+
+		# receipt after the first one does not change the value of the consumption or later receipt
+		make_stock_entry(
+			item=item,
+			company=company,
+			qty=5,
+			rate=10,
+			target="Stores - TCP1",
+			posting_date=add_days(today(), -3),
+		)
+		repost_doc = get_repost_doc()
+		self.assertEqual(repost_doc.gl_reposted_vouchers, 0)
+		self.assertEqual(repost_doc.gl_skipped_vouchers, 3)
+
+		# receipt before the first one is consumed first, only the consumption changes
+		make_stock_entry(
+			item=item,
+			company=company,
+			qty=5,
+			rate=20,
+			target="Stores - TCP1",
+			posting_date=add_days(today(), -6),
+		)
+		repost_doc = get_repost_doc()
+		self.assertEqual(repost_doc.gl_reposted_vouchers, 1)
+		self.assertGLEs(
+			consumption,
+			[{"credit": 100, "debit": 0}],
+			gle_filters={"account": "Stock In Hand - TCP1"},
+		)
+
+		# restarted repost finds no difference anymore, changes of the earlier run are kept
+		repost_doc.restart_reposting()
+		repost_doc.reload()
+		self.assertIn(("Stock Entry", consumption.name), _get_changed_vouchers(repost_doc))
+
 	def test_duplicate_ple_on_repost(self):
 		from erpnext.accounts import utils
 
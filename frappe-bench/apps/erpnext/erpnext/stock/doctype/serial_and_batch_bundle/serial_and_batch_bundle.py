@@ -798,6 +798,11 @@ class SerialandBatchBundle(Document):
 			self.flags.ignore_links = True
 			self.save()
 
+		if self.docstatus == 1 and self.has_batch_no:
+			from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bin
+
+			rebuild_batch_bin(self.item_code, self.warehouse)
+
 	def validate_quantity(self, row, qty_field=None):
 		qty_field = self.get_qty_field(row, qty_field=qty_field)
 		qty = row.get(qty_field)
@@ -2234,8 +2239,15 @@ def update_available_batches(available_batches, *reserved_batches) -> None:
 
 
 def get_available_batches(kwargs):
+	from erpnext.stock.doctype.batch_bin.batch_bin import get_available_batches_from_batch_bin
 	from erpnext.stock.utils import get_combine_datetime
 
+	if kwargs.get("posting_date") and kwargs.get("posting_time") is None:
+		kwargs.posting_time = nowtime()
+
+	if is_batch_bin_current(kwargs):
+		return get_available_batches_from_batch_bin(kwargs)
+
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
 	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
 	batch_table = frappe.qb.DocType("Batch")
@@ -2261,9 +2273,6 @@ def get_available_batches(kwargs):
 		query = query.where((batch_table.expiry_date >= today()) | (batch_table.expiry_date.isnull()))
 
 	if kwargs.get("posting_date"):
-		if kwargs.get("posting_time") is None:
-			kwargs.posting_time = nowtime()
-
 		timestamp_condition = stock_ledger_entry.posting_datetime <= get_combine_datetime(
 			kwargs.posting_date, kwargs.posting_time
 		)
@@ -2300,6 +2309,43 @@ def get_available_batches(kwargs):
 	return data
 
 
+def is_batch_bin_current(kwargs):
+	"""Batch Bin has the balances after the latest Stock Ledger Entry, so it answers lookups as on a
+	date unless the items have entries after that date."""
+	from erpnext.stock.utils import get_combine_datetime
+
+	if kwargs.get("ignore_voucher_nos"):
+		return False
+
+	if not kwargs.get("posting_date"):
+		return True
+
+	if not kwargs.get("item_code"):
+		return False
+
+	posting_datetime = get_combine_datetime(kwargs.posting_date, kwargs.posting_time)
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(stock_ledger_entry)
+		.select(stock_ledger_entry.name)
+		.where(
+			(stock_ledger_entry.posting_datetime > posting_datetime) & (stock_ledger_entry.is_cancelled == 0)
+		)
+		.limit(1)
+	)
+
+	for field in ["warehouse", "item_code"]:
+		if not kwargs.get(field):
+			continue
+
+		if isinstance(kwargs.get(field), list):
+			query = query.where(stock_ledger_entry[field].isin(kwargs.get(field)))
+		else:
+			query = query.where(stock_ledger_entry[field] == kwargs.get(field))
+
+	return not query.run()
+
+
 # For work order and subcontracting
 def get_voucher_wise_serial_batch_from_bundle(**kwargs) -> dict[str, dict]:
 	data = get_ledgers_from_serial_batch_bundle(**kwargs)
@@ -2502,9 +2548,6 @@ def get_stock_ledgers_for_serial_nos(kwargs):
 	)
 
 	if kwargs.get("posting_date"):
-		if kwargs.get("posting_time") is None:
-			kwargs.posting_time = nowtime()
-
 		timestamp_condition = stock_ledger_entry.posting_datetime <= get_combine_datetime(
 			kwargs.posting_date, kwargs.posting_time
 		)
@@ -2560,9 +2603,6 @@ def get_stock_ledgers_batches(kwargs):
 		query = query.where((batch_table.expiry_date >= today()) | (batch_table.expiry_date.isnull()))
 
 	if kwargs.get("posting_date"):
-		if kwargs.get("posting_time") is None:
-			kwargs.posting_time = nowtime()
-
 		timestamp_condition = stock_ledger_entry.posting_datetime <= get_combine_datetime(
 			kwargs.posting_date, kwargs.posting_time
 		)
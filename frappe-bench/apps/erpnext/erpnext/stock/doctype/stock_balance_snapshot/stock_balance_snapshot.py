@@ -0,0 +1,221 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Order
+from frappe.utils import add_days, get_last_day, getdate, now, nowdate
+
+from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+
+
+class StockBalanceSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		inventory_dimensions: DF.SmallText | None
+		snapshot_date: DF.Date | None
+	# end: auto-generated types
+
+	def on_trash(self):
+		frappe.db.delete("Stock Balance Snapshot Entry", {"stock_balance_snapshot": self.name})
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Balance Snapshot", ["company", "snapshot_date"])
+
+
+def get_inventory_dimension_key():
+	return ",".join(dimension.fieldname for dimension in get_inventory_dimensions())
+
+
+def create_stock_balance_snapshots():
+	"""Scheduled job: snapshot the stock balances of every company at each month end up to the last one."""
+	for company in frappe.get_all("Company", pluck="name"):
+		create_company_snapshots(company)
+		frappe.db.commit()
+
+
+def create_company_snapshots(company, upto=None):
+	upto = getdate(upto) if upto else add_days(getdate(nowdate()).replace(day=1), -1)
+	if has_pending_reposts(company, upto):
+		return
+
+	latest = get_latest_snapshot(company, upto)
+	if latest:
+		snapshot_date = get_last_day(add_days(latest.snapshot_date, 1))
+	elif frappe.db.exists("Stock Ledger Entry", {"company": company, "is_cancelled": 0}):
+		snapshot_date = upto
+	else:
+		return
+
+	while snapshot_date <= upto:
+		if not make_stock_balance_snapshot(company, snapshot_date):
+			break
+		snapshot_date = get_last_day(add_days(snapshot_date, 1))
+
+
+def has_pending_reposts(company, posting_date, for_update=False):
+	"""Reposts that are yet to run would change the balances of a snapshot taken now."""
+	return frappe.db.get_value(
+		"Repost Item Valuation",
+		{
+			"company": company,
+			"docstatus": 1,
+			"status": ("in", ["Queued", "In Progress"]),
+			"posting_date": ("<=", posting_date),
+		},
+		"name",
+		for_update=for_update,
+	)
+
+
+def has_changed_since(company, snapshot_date, since):
+	"""Stock entries or reposts on or before `snapshot_date` committed by others since `since`.
+
+	These are locking reads, so they see rows committed after this transaction read the balances."""
+	return has_pending_reposts(company, snapshot_date, for_update=True) or frappe.db.get_value(
+		"Stock Ledger Entry",
+		{"company": company, "posting_date": ("<=", snapshot_date), "creation": (">=", since)},
+		"name",
+		for_update=True,
+	)
+
+
+def get_latest_snapshot(company, before=None):
+	"""Latest snapshot of `company` taken on or before `before`."""
+	table = frappe.qb.DocType("Stock Balance Snapshot")
+	query = (
+		frappe.qb.from_(table)
+		.select(table.name, table.snapshot_date, table.inventory_dimensions)
+		.where(table.company == company)
+		.orderby(table.snapshot_date, order=Order.desc)
+		.limit(1)
+	)
+
+	if before:
+		query = query.where(table.snapshot_date <= before)
+
+	snapshot = query.run(as_dict=True)
+	return snapshot[0] if snapshot else None
+
+
+def make_stock_balance_snapshot(company, snapshot_date):
+	"""Snapshot the balances as on `snapshot_date`, starting from the previous snapshot.
+
+	The snapshot is inserted before the balances are read, so a backdated entry posted meanwhile
+	waits for it and then deletes it. If entries or reposts were committed while the balances were
+	being read, the snapshot is dropped and None is returned."""
+	from erpnext.stock.report.stock_balance.stock_balance import StockBalanceReport
+
+	snapshot_date = getdate(snapshot_date)
+	inventory_dimensions = get_inventory_dimension_key()
+
+	started = now()
+	snapshot = frappe.get_doc(
+		{
+			"doctype": "Stock Balance Snapshot",
+			"company": company,
+			"snapshot_date": snapshot_date,
+			"inventory_dimensions": inventory_dimensions,
+		}
+	).insert(ignore_permissions=True)
+
+	entries = []
+	for dimension_wise in (0, 1) if inventory_dimensions else (0,):
+		filters = frappe._dict(
+			company=company,
+			from_date=add_days(snapshot_date, 1),
+			to_date=snapshot_date,
+			show_dimension_wise_stock=dimension_wise,
+		)
+		report = StockBalanceReport(filters)
+
+		for row in report.get_balances().values():
+			if not row.bal_qty and not row.bal_val:
+				continue
+
+			dimension_values = None
+			if dimension_wise:
+				dimension_values = json.dumps(
+					{fieldname: row.get(fieldname) for fieldname in report.inventory_dimensions}
+				)
+
+			entries.append(
+				(
+					row.item_code,
+					row.warehouse,
+					dimension_wise,
+					dimension_values,
+					row.bal_qty,
+					row.bal_val,
+					row.val_rate,
+				)
+			)
+
+	if has_changed_since(company, snapshot_date, started):
+		frappe.db.delete("Stock Balance Snapshot", snapshot.name)
+		return
+
+	timestamp = now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Stock Balance Snapshot Entry",
+		fields=[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"stock_balance_snapshot",
+			"item_code",
+			"warehouse",
+			"dimension_wise",
+			"inventory_dimension_values",
+			"bal_qty",
+			"bal_val",
+			"valuation_rate",
+		],
+		values=[
+			(frappe.generate_hash(), timestamp, timestamp, user, user, snapshot.name, *entry)
+			for entry in entries
+		],
+	)
+
+	return snapshot
+
+
+def invalidate_stock_balance_snapshots(company=None, posting_date=None):
+	"""Delete the snapshots a backdated entry on `posting_date` would change.
+
+	The snapshots are read for update, so a snapshot still being built is waited for and deleted too."""
+	table = frappe.qb.DocType("Stock Balance Snapshot")
+	query = frappe.qb.from_(table).select(table.name).for_update()
+
+	if company:
+		query = query.where(table.company == company)
+
+	if posting_date:
+		query = query.where(table.snapshot_date >= getdate(posting_date))
+
+	snapshots = query.run(pluck=True)
+	if not snapshots:
+		return
+
+	frappe.db.delete("Stock Balance Snapshot Entry", {"stock_balance_snapshot": ("in", snapshots)})
+	frappe.db.delete("Stock Balance Snapshot", {"name": ("in", snapshots)})
+
+
+def rebuild_stock_balance_snapshots(company=None):
+	"""Drop the snapshots of one or all companies and take them afresh for the last month end."""
+	for name in [company] if company else frappe.get_all("Company", pluck="name"):
+		invalidate_stock_balance_snapshots(name)
+		create_company_snapshots(name)
@@ -0,0 +1,27 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class StockBalanceSnapshotEntry(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		bal_qty: DF.Float
+		bal_val: DF.Float
+		dimension_wise: DF.Check
+		inventory_dimension_values: DF.Code | None
+		item_code: DF.Link | None
+		stock_balance_snapshot: DF.Link | None
+		valuation_rate: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
@@ -13,6 +13,7 @@ from frappe.utils import add_days, cint, flt, formatdate, get_datetime, getdate
 
 from erpnext.accounts.utils import get_fiscal_year
 from erpnext.controllers.item_variant import ItemTemplateCannotHaveStock
+from erpnext.stock.doctype.batch_bin.batch_bin import update_batch_bin
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.serial_batch_bundle import SerialBatchBundle
 from erpnext.stock.stock_ledger import get_previous_sle
@@ -186,6 +187,7 @@ class StockLedgerEntry(Document):
 				company=self.company,
 			)
 
+		update_batch_bin(self)
 		self.validate_serial_batch_no_bundle()
 
 	def validate_mandatory(self):
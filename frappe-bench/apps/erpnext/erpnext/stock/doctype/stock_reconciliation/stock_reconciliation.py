@@ -11,6 +11,7 @@ import erpnext
 from erpnext.accounts.utils import get_company_default
 from erpnext.controllers.stock_controller import StockController, create_repost_item_valuation_entry
 from erpnext.stock.doctype.batch.batch import get_available_batches, get_batch_qty
+from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bin
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_serial_nos,
@@ -476,6 +477,8 @@ class StockReconciliation(StockController):
 			}
 
 			frappe.db.set_value("Serial and Batch Entry", batch.name, update_values)
+			if self.docstatus == 1:
+				rebuild_batch_bin(item.item_code, item.warehouse)
 
 	def remove_items_with_no_change(self):
 		from erpnext.stock.stock_ledger import get_stock_value_difference
@@ -1192,6 +1195,7 @@ class StockReconciliation(StockController):
 
 	def get_current_qty_for_batch_nos(self, doc):
 		current_qty = 0.0
+		qty_changed = False
 		precision = doc.entries[0].precision("qty")
 		for d in doc.entries:
 			qty = (
@@ -1210,9 +1214,13 @@ class StockReconciliation(StockController):
 
 			if flt(d.qty, precision) != flt(qty, precision):
 				d.db_set("qty", qty)
+				qty_changed = True
 
 			current_qty += qty
 
+		if qty_changed and doc.docstatus == 1:
+			rebuild_batch_bin(doc.item_code, doc.warehouse)
+
 		return current_qty
 
 
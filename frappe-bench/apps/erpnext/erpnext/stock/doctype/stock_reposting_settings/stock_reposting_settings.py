@@ -22,7 +22,10 @@ class StockRepostingSettings(Document):
 		limits_dont_apply_on: DF.Literal[
 			"", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 		]
+		max_parallel_reposting_jobs: DF.Int
 		notify_reposting_error_to_role: DF.Link | None
+		parallel_reposting: DF.Check
+		repost_gl_for_changed_vouchers_only: DF.Check
 		start_time: DF.Time | None
 	# end: auto-generated types
 
@@ -2,7 +2,9 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import datetime
 import json
+from functools import cached_property
 
 import frappe
 from frappe import _, throw
@@ -58,22 +60,56 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	}
 	"""
 
-	args = process_args(args)
+	return get_items_details_bulk(args, [{}], doc, for_validate, overwrite_warehouse)[0]
+
+
+@frappe.whitelist()
+def get_items_details_bulk(args, items, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""
+	Returns the details of each row in `items`, in order.
+
+	`args` holds the fields common to all rows (see `get_item_details`), which each row in `items`
+	can override. Item Prices, bins, UOM conversion factors and barcodes are fetched for all the rows
+	together instead of once per row.
+	"""
+
+	args = process_string_args(args)
+	items = process_string_args(items)
 	for_validate = process_string_args(for_validate)
 	overwrite_warehouse = process_string_args(overwrite_warehouse)
-	item = frappe.get_cached_doc("Item", args.item_code)
-	validate_item_details(args, item)
 
 	if isinstance(doc, str):
 		doc = json.loads(doc)
 
+	rows = []
+	for item in items:
+		row = frappe._dict(args)
+		row.update(item)
+		rows.append(process_args(row))
+
+	item_docs = {}
+	for row in rows:
+		if row.item_code not in item_docs:
+			item_docs[row.item_code] = frappe.get_cached_doc("Item", row.item_code)
+
+	prefetched = ItemDetailsPrefetch(item_docs.values(), {row.price_list for row in rows if row.price_list})
+
+	return [
+		_get_item_details(row, item_docs[row.item_code], doc, for_validate, overwrite_warehouse, prefetched)
+		for row in rows
+	]
+
+
+def _get_item_details(args, item, doc, for_validate, overwrite_warehouse, prefetched):
+	validate_item_details(args, item)
+
 	if doc:
 		args["transaction_date"] = doc.get("transaction_date") or doc.get("posting_date")
 
 		if doc.get("doctype") == "Purchase Invoice":
 			args["bill_date"] = doc.get("bill_date")
 
-	out = get_basic_details(args, item, overwrite_warehouse)
+	out = get_basic_details(args, item, overwrite_warehouse, prefetched)
 
 	get_item_tax_template(args, item, out)
 	out["item_tax_rate"] = get_item_tax_map(
@@ -96,7 +132,7 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	if args.get("doctype") in ["Purchase Order", "Purchase Receipt", "Purchase Invoice"]:
 		args.customer = None
 
-	out.update(get_price_list_rate(args, item))
+	out.update(get_price_list_rate(args, item, prefetched=prefetched))
 
 	args.customer = current_customer
 
@@ -104,7 +140,7 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 		out.update(get_pos_profile_item_details(args.company, args, update_data=True))
 
 	if item.is_stock_item:
-		update_bin_details(args, out, doc)
+		update_bin_details(args, out, doc, prefetched)
 
 	# update args with out, if key or value not exists
 	for key, value in out.items():
@@ -162,15 +198,17 @@ def set_valuation_rate(out, args):
 		out.update(get_valuation_rate(args.item_code, args.company, out.get("warehouse")))
 
 
-def update_bin_details(args, out, doc):
+def update_bin_details(args, out, doc, prefetched=None):
+	_get_bin_details = prefetched.get_bin_details if prefetched else get_bin_details
+
 	if args.get("doctype") == "Material Request" and args.get("material_request_type") == "Material Transfer":
-		out.update(get_bin_details(args.item_code, args.get("from_warehouse")))
+		out.update(_get_bin_details(args.item_code, args.get("from_warehouse")))
 
 	elif out.get("warehouse"):
 		company = args.company if (doc and doc.get("doctype") == "Purchase Order") else None
 
 		# calculate company_total_stock only for po
-		bin_details = get_bin_details(args.item_code, out.warehouse, company, include_child_warehouses=True)
+		bin_details = _get_bin_details(args.item_code, out.warehouse, company, include_child_warehouses=True)
 
 		out.update(bin_details)
 
@@ -332,7 +370,7 @@ def validate_item_details(args, item):
 					throw(_("Item {0} must be a Non-Stock Item").format(item.name))
 
 
-def get_basic_details(args, item, overwrite_warehouse=True):
+def get_basic_details(args, item, overwrite_warehouse=True, prefetched=None):
 	"""
 	:param args: {
 	                "item_code": "",
@@ -367,14 +405,20 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 	                against_blanket_order: 0/1
 	        }
 	:param item: `item_code` of Item object
+	:param prefetched: `ItemDetailsPrefetch` of the document's items
 	:return: frappe._dict
 	"""
 
 	if not item:
 		item = frappe.get_doc("Item", args.get("item_code"))
 
-	if item.variant_of and not item.taxes and frappe.db.exists("Item Tax", {"parent": item.variant_of}):
-		item.update_template_tables()
+	if item.variant_of and not item.taxes:
+		if (
+			prefetched.has_item_taxes(item.variant_of)
+			if prefetched
+			else frappe.db.exists("Item Tax", {"parent": item.variant_of})
+		):
+			item.update_template_tables()
 
 	item_defaults = get_item_defaults(item.name, args.company)
 	item_group_defaults = get_item_group_defaults(item.name, args.company)
@@ -486,8 +530,10 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 	if item.stock_uom == args.uom:
 		out.conversion_factor = 1.0
 	else:
-		out.conversion_factor = args.conversion_factor or get_conversion_factor(item.name, args.uom).get(
-			"conversion_factor"
+		out.conversion_factor = args.conversion_factor or (
+			prefetched.get_conversion_factor(item.name, args.uom)
+			if prefetched
+			else get_conversion_factor(item.name, args.uom).get("conversion_factor")
 		)
 
 	args.conversion_factor = out.conversion_factor
@@ -525,22 +571,17 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 			out["manufacturer_part_no"] = None
 			out["manufacturer"] = None
 	else:
-		data = frappe.get_value(
-			"Item", item.name, ["default_item_manufacturer", "default_manufacturer_part_no"], as_dict=1
+		out.update(
+			{
+				"manufacturer": item.default_item_manufacturer,
+				"manufacturer_part_no": item.default_manufacturer_part_no,
+			}
 		)
 
-		if data:
-			out.update(
-				{
-					"manufacturer": data.default_item_manufacturer,
-					"manufacturer_part_no": data.default_manufacturer_part_no,
-				}
-			)
-
 	child_doctype = args.doctype + " Item"
 	meta = frappe.get_meta(child_doctype)
 	if meta.get_field("barcode"):
-		update_barcode_value(out)
+		update_barcode_value(out, prefetched)
 
 	if out.get("weight_per_unit"):
 		out["total_weight"] = out.weight_per_unit * out.stock_qty
@@ -586,8 +627,11 @@ def get_item_warehouse(item, args, overwrite_warehouse, defaults=None):
 	return warehouse
 
 
-def update_barcode_value(out):
-	barcode_data = get_barcode_data([out])
+def update_barcode_value(out, prefetched=None):
+	if prefetched:
+		barcode_data = prefetched.get_barcode_data(out.item_code)
+	else:
+		barcode_data = get_barcode_data([out])
 
 	# If item has one barcode then update the value of the barcode field
 	if barcode_data and len(barcode_data.get(out.item_code)) == 1:
@@ -894,7 +938,7 @@ def get_default_supplier(args, item, item_group, brand):
 	return item.get("default_supplier") or item_group.get("default_supplier") or brand.get("default_supplier")
 
 
-def get_price_list_rate(args, item_doc, out=None):
+def get_price_list_rate(args, item_doc, out=None, prefetched=None):
 	if out is None:
 		out = frappe._dict()
 
@@ -910,17 +954,19 @@ def get_price_list_rate(args, item_doc, out=None):
 		if meta.get_field("currency"):
 			validate_conversion_rate(args, meta)
 
-		price_list_rate = get_price_list_rate_for(args, item_doc.name)
+		price_list_rate = get_price_list_rate_for(args, item_doc.name, prefetched)
 
 		# variant
 		if price_list_rate is None and item_doc.variant_of:
-			price_list_rate = get_price_list_rate_for(args, item_doc.variant_of)
+			price_list_rate = get_price_list_rate_for(args, item_doc.variant_of, prefetched)
 
 		# insert in database
 		if price_list_rate is None or frappe.get_cached_value(
 			"Stock Settings", "Stock Settings", "update_existing_price_list_rate"
 		):
 			insert_item_price(args)
+			if prefetched:
+				prefetched.discard_item_prices(args.item_code)
 
 		if price_list_rate is None:
 			return out
@@ -1084,7 +1130,7 @@ def get_batch_based_item_price(params, item_code) -> float:
 	return 0.0
 
 
-def get_price_list_rate_for(args, item_code):
+def get_price_list_rate_for(args, item_code, prefetched=None):
 	"""
 	:param customer: link to Customer DocType
 	:param supplier: link to Supplier DocType
@@ -1092,7 +1138,9 @@ def get_price_list_rate_for(args, item_code):
 	:param item_code: str, Item Doctype field item_code
 	:param qty: Desired Qty
 	:param transaction_date: Date of the price
+	:param prefetched: `ItemDetailsPrefetch` to look up Item Prices from
 	"""
+	_get_item_price = prefetched.get_item_price if prefetched else get_item_price
 	item_price_args = {
 		"item_code": item_code,
 		"price_list": args.get("price_list"),
@@ -1104,22 +1152,22 @@ def get_price_list_rate_for(args, item_code):
 	}
 
 	item_price_data = 0
-	price_list_rate = get_item_price(item_price_args, item_code)
+	price_list_rate = _get_item_price(item_price_args, item_code)
 	if price_list_rate:
 		desired_qty = args.get("qty")
-		if desired_qty and check_packing_list(price_list_rate[0][0], desired_qty, item_code):
+		if desired_qty and check_packing_list(price_list_rate[0][0], desired_qty, item_code, prefetched):
 			item_price_data = price_list_rate
 	else:
 		for field in ["customer", "supplier"]:
 			del item_price_args[field]
 
-		general_price_list_rate = get_item_price(
+		general_price_list_rate = _get_item_price(
 			item_price_args, item_code, ignore_party=args.get("ignore_party")
 		)
 
 		if not general_price_list_rate and args.get("uom") != args.get("stock_uom"):
 			item_price_args["uom"] = args.get("stock_uom")
-			general_price_list_rate = get_item_price(
+			general_price_list_rate = _get_item_price(
 				item_price_args, item_code, ignore_party=args.get("ignore_party")
 			)
 
@@ -1135,7 +1183,7 @@ def get_price_list_rate_for(args, item_code):
 			return item_price_data[0][1]
 
 
-def check_packing_list(price_list_rate_name, desired_qty, item_code):
+def check_packing_list(price_list_rate_name, desired_qty, item_code, prefetched=None):
 	"""
 	Check if the desired qty is within the increment of the packing list.
 	:param price_list_rate_name: Name of Item Price
@@ -1145,9 +1193,13 @@ def check_packing_list(price_list_rate_name, desired_qty, item_code):
 	"""
 
 	flag = True
-	item_price = frappe.get_doc("Item Price", price_list_rate_name)
-	if item_price.packing_unit:
-		packing_increment = desired_qty % item_price.packing_unit
+	if prefetched:
+		packing_unit = prefetched.get_packing_unit(price_list_rate_name)
+	else:
+		packing_unit = frappe.db.get_value("Item Price", price_list_rate_name, "packing_unit")
+
+	if packing_unit:
+		packing_increment = desired_qty % packing_unit
 
 		if packing_increment != 0:
 			flag = False
@@ -1345,6 +1397,227 @@ def get_company_total_stock(item_code, company):
 	).run()[0][0]
 
 
+class ItemDetailsPrefetch:
+	"""
+	Item Prices, bins, UOM conversion factors and barcodes of a set of items, each fetched with one
+	query on first use. Lookups for items (or price lists) that were not prefetched fall back to the
+	database.
+	"""
+
+	def __init__(self, items, price_lists):
+		self.items = {item.name: item for item in items}
+		self.item_codes = set(self.items) | {item.variant_of for item in items if item.variant_of}
+		self.price_lists = set(price_lists)
+		self.child_warehouses = {}
+
+	@cached_property
+	def item_prices(self):
+		item_prices = {}
+		if not self.price_lists:
+			return item_prices
+
+		ip = frappe.qb.DocType("Item Price")
+		query = (
+			frappe.qb.from_(ip)
+			.select(
+				ip.name,
+				ip.item_code,
+				ip.price_list,
+				ip.price_list_rate,
+				ip.uom,
+				ip.batch_no,
+				ip.customer,
+				ip.supplier,
+				ip.valid_from,
+				ip.valid_upto,
+				ip.packing_unit,
+			)
+			.where(ip.item_code.isin(list(self.item_codes)) & ip.price_list.isin(list(self.price_lists)))
+		)
+
+		for d in query.run(as_dict=True):
+			item_prices.setdefault((d.item_code, d.price_list), []).append(d)
+
+		# same order as `get_item_price`
+		for prices in item_prices.values():
+			prices.sort(
+				key=lambda d: (
+					getdate(d.valid_from) if d.valid_from else datetime.date.min,
+					cstr(d.batch_no),
+					d.uom is not None,
+					cstr(d.uom),
+				),
+				reverse=True,
+			)
+
+		return item_prices
+
+	@cached_property
+	def packing_units(self):
+		return {d.name: d.packing_unit for prices in self.item_prices.values() for d in prices}
+
+	@cached_property
+	def bins(self):
+		bins = {}
+		stock_items = [item.name for item in self.items.values() if item.is_stock_item]
+		if not stock_items:
+			return bins
+
+		bin = frappe.qb.DocType("Bin")
+		wh = frappe.qb.DocType("Warehouse")
+		query = (
+			frappe.qb.from_(bin)
+			.left_join(wh)
+			.on(bin.warehouse == wh.name)
+			.select(
+				bin.item_code,
+				bin.warehouse,
+				wh.company,
+				bin.projected_qty,
+				bin.actual_qty,
+				bin.reserved_qty,
+			)
+			.where(bin.item_code.isin(stock_items))
+		)
+
+		for d in query.run(as_dict=True):
+			bins.setdefault(d.item_code, []).append(d)
+
+		return bins
+
+	@cached_property
+	def conversion_factors(self):
+		ucd = frappe.qb.DocType("UOM Conversion Detail")
+		query = (
+			frappe.qb.from_(ucd)
+			.select(ucd.parent, ucd.uom, ucd.conversion_factor)
+			.where(ucd.parent.isin(list(self.item_codes)))
+		)
+
+		return {(d.parent, d.uom): d.conversion_factor for d in query.run(as_dict=True)}
+
+	@cached_property
+	def barcodes(self):
+		barcodes = {}
+		for d in frappe.get_all(
+			"Item Barcode", filters={"parent": ("in", list(self.items))}, fields=["parent", "barcode"]
+		):
+			barcodes.setdefault(d.parent, []).append(d.barcode)
+
+		return barcodes
+
+	@cached_property
+	def items_with_taxes(self):
+		variant_of = list({item.variant_of for item in self.items.values() if item.variant_of})
+		if not variant_of:
+			return set()
+
+		return set(frappe.get_all("Item Tax", filters={"parent": ("in", variant_of)}, pluck="parent"))
+
+	def has_item_prices(self, item_code, price_list):
+		return item_code in self.item_codes and price_list in self.price_lists
+
+	def discard_item_prices(self, item_code):
+		"""Look up Item Prices of `item_code` from the database, after one was added or updated."""
+		self.item_codes.discard(item_code)
+
+	def get_item_price(self, args, item_code, ignore_party=False):
+		"""Same as `get_item_price`, from the prefetched Item Prices."""
+		if not self.has_item_prices(item_code, args.get("price_list")):
+			return get_item_price(args, item_code, ignore_party=ignore_party)
+
+		uoms = ("", cstr(args.get("uom")))
+		batch_nos = ("", cstr(args.get("batch_no")))
+		transaction_date = getdate(args["transaction_date"]) if args.get("transaction_date") else None
+
+		item_prices = []
+		for d in self.item_prices.get((item_code, args.get("price_list")), []):
+			if cstr(d.uom) not in uoms or cstr(d.batch_no) not in batch_nos:
+				continue
+
+			if not ignore_party:
+				if args.get("customer"):
+					if d.customer != args.get("customer"):
+						continue
+				elif args.get("supplier"):
+					if d.supplier != args.get("supplier"):
+						continue
+				elif d.customer or d.supplier:
+					continue
+
+			if transaction_date and not (
+				getdate(d.valid_from or "2000-01-01")
+				<= transaction_date
+				<= getdate(d.valid_upto or "2500-12-31")
+			):
+				continue
+
+			item_prices.append((d.name, d.price_list_rate, d.uom))
+
+		return item_prices
+
+	def get_packing_unit(self, item_price):
+		if item_price in self.packing_units:
+			return self.packing_units[item_price]
+
+		return frappe.db.get_value("Item Price", item_price, "packing_unit")
+
+	def get_bin_details(self, item_code, warehouse, company=None, include_child_warehouses=False):
+		"""Same as `get_bin_details`, from the prefetched bins."""
+		if item_code not in self.items:
+			return get_bin_details(item_code, warehouse, company, include_child_warehouses)
+
+		bins = self.bins.get(item_code, [])
+		bin_details = {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0}
+
+		if warehouse:
+			if include_child_warehouses:
+				if warehouse not in self.child_warehouses:
+					from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
+
+					self.child_warehouses[warehouse] = set(get_child_warehouses(warehouse))
+
+				warehouses = self.child_warehouses[warehouse]
+			else:
+				warehouses = {warehouse}
+
+			for fieldname in bin_details:
+				bin_details[fieldname] = sum(flt(d[fieldname]) for d in bins if d.warehouse in warehouses)
+
+		if company:
+			company_bins = [d for d in bins if d.company == company]
+			bin_details["company_total_stock"] = (
+				sum(flt(d.actual_qty) for d in company_bins) if company_bins else None
+			)
+
+		return bin_details
+
+	def get_conversion_factor(self, item_code, uom):
+		"""Same as `get_conversion_factor`, from the prefetched UOM conversion factors."""
+		item = self.items.get(item_code)
+		if not item:
+			return get_conversion_factor(item_code, uom).get("conversion_factor")
+
+		conversion_factor = self.conversion_factors.get((item_code, uom))
+		if not conversion_factor and item.variant_of:
+			conversion_factor = self.conversion_factors.get((item.variant_of, uom))
+
+		if not conversion_factor:
+			conversion_factor = get_uom_conv_factor(uom, item.stock_uom)
+
+		return conversion_factor or 1.0
+
+	def get_barcode_data(self, item_code):
+		if item_code not in self.items:
+			return get_barcode_data(item_code=item_code)
+
+		barcodes = self.barcodes.get(item_code)
+		return {item_code: barcodes} if barcodes else {}
+
+	def has_item_taxes(self, item_code):
+		return item_code in self.items_with_taxes
+
+
 @frappe.whitelist()
 def get_batch_qty(batch_no, warehouse, item_code):
 	from erpnext.stock.doctype.batch import batch
@@ -2,7 +2,11 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from collections import deque
 from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from multiprocessing import get_context
 from operator import itemgetter
 
 import frappe
@@ -13,6 +17,9 @@ from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
 Filters = frappe._dict
 
+# ledger entries sent to a worker process at a time
+PROCESS_BATCH_SIZE = 10000
+
 
 def execute(filters: Filters = None) -> tuple:
 	to_date = filters["to_date"]
@@ -232,6 +239,7 @@ class FIFOSlots:
 		self.serial_no_batch_purchase_details = {}
 		self.filters = filters
 		self.sle = sle
+		self.first_seen = {}
 
 	def generate(self) -> dict:
 		"""
@@ -242,46 +250,37 @@ class FIFOSlots:
 		        'fifo_queue' -> List: ** list of lists containing entries/slots for existing stock,
 		                consumed/updated and maintained via FIFO. **
 		}
-		"""
-
-		from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
-			get_serial_nos_from_bundle,
-		)
-
-		stock_ledger_entries = self.sle
 
+		Slots of different items are independent, so the ledger is read item by item and the items
+		are computed in `stock_ageing_processes` worker processes if set in site config.
+		"""
 		bundle_wise_serial_nos = frappe._dict({})
-		if stock_ledger_entries is None:
+		if self.sle is None:
 			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos()
 
 		with frappe.db.unbuffered_cursor():
-			if stock_ledger_entries is None:
-				stock_ledger_entries = self.__get_stock_ledger_entries()
-
-			for d in stock_ledger_entries:
-				key, fifo_queue, transferred_item_key = self.__init_key_stores(d)
-
-				if d.voucher_type == "Stock Reconciliation":
-					# get difference in qty shift as actual qty
-					prev_balance_qty = self.item_details[key].get("qty_after_transaction", 0)
-					d.actual_qty = flt(d.qty_after_transaction) - flt(prev_balance_qty)
-
-				serial_nos = get_serial_nos(d.serial_no) if d.serial_no else []
-				if d.serial_and_batch_bundle and d.has_serial_no:
-					if bundle_wise_serial_nos:
-						serial_nos = bundle_wise_serial_nos.get(d.serial_and_batch_bundle) or []
-					else:
-						serial_nos = get_serial_nos_from_bundle(d.serial_and_batch_bundle) or []
-
-				if d.actual_qty > 0:
-					self.__compute_incoming_stock(d, fifo_queue, transferred_item_key, serial_nos)
+			if self.sle is None:
+				item_wise_entries = self.__get_item_wise_stock_ledger_entries(bundle_wise_serial_nos)
+				processes = cint(frappe.conf.get("stock_ageing_processes"))
+
+				if processes > 1:
+					self.__generate_in_processes(item_wise_entries, processes)
 				else:
-					self.__compute_outgoing_stock(d, fifo_queue, transferred_item_key, serial_nos)
+					for entries in item_wise_entries:
+						self.__add_item_slots(get_item_fifo_slots(entries))
+			else:
+				item_wise_slots = {}
+				for idx, d in enumerate(self.sle):
+					if d.name not in item_wise_slots:
+						item_wise_slots[d.name] = ItemFIFOSlots()
+
+					item_wise_slots[d.name].add(d, self.__get_serial_nos(d, bundle_wise_serial_nos), idx)
 
-				self.__update_balances(d, key)
+				for item_slots in item_wise_slots.values():
+					self.__add_item_slots(item_slots.finalize())
 
-			# Note that stock_ledger_entries is an iterator, you can not reuse it like a list
-			del stock_ledger_entries
+		# same order as the ledger
+		self.item_details = dict(sorted(self.item_details.items(), key=lambda d: self.first_seen[d[0]]))
 
 		if not self.filters.get("show_warehouse_wise_stock"):
 			# (Item 1, WH 1), (Item 1, WH 2) => (Item 1)
@@ -289,127 +288,55 @@ class FIFOSlots:
 
 		return self.item_details
 
-	def __init_key_stores(self, row: dict) -> tuple:
-		"Initialise keys and FIFO Queue."
+	def __generate_in_processes(self, item_wise_entries: Iterator[list], processes: int):
+		batches, batch, batch_size = [], [], 0
 
-		key = (row.name, row.warehouse)
-		self.item_details.setdefault(key, {"details": row, "fifo_queue": []})
-		fifo_queue = self.item_details[key]["fifo_queue"]
+		with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("fork")) as executor:
+			for entries in item_wise_entries:
+				batch.append(entries)
+				batch_size += len(entries)
 
-		transferred_item_key = (row.voucher_no, row.name, row.warehouse)
-		self.transferred_item_details.setdefault(transferred_item_key, [])
+				if batch_size >= PROCESS_BATCH_SIZE:
+					batches.append(executor.submit(get_items_fifo_slots, batch))
+					batch, batch_size = [], 0
 
-		return key, fifo_queue, transferred_item_key
+			if batch:
+				batches.append(executor.submit(get_items_fifo_slots, batch))
 
-	def __compute_incoming_stock(self, row: dict, fifo_queue: list, transfer_key: tuple, serial_nos: list):
-		"Update FIFO Queue on inward stock."
+			for future in batches:
+				for item_slots in future.result():
+					self.__add_item_slots(item_slots)
 
-		transfer_data = self.transferred_item_details.get(transfer_key)
-		if transfer_data:
-			# inward/outward from same voucher, item & warehouse
-			# eg: Repack with same item, Stock reco for batch item
-			# consume transfer data and add stock to fifo queue
-			self.__adjust_incoming_transfer_qty(transfer_data, fifo_queue, row)
-		else:
-			if not serial_nos and not row.get("has_serial_no"):
-				if fifo_queue and flt(fifo_queue[0][0]) <= 0:
-					# neutralize 0/negative stock by adding positive stock
-					fifo_queue[0][0] += flt(row.actual_qty)
-					fifo_queue[0][1] = row.posting_date
-					fifo_queue[0][2] += flt(row.stock_value_difference)
-				else:
-					fifo_queue.append(
-						[flt(row.actual_qty), row.posting_date, flt(row.stock_value_difference)]
-					)
-				return
-
-			valuation = row.stock_value_difference / row.actual_qty
-			for serial_no in serial_nos:
-				if self.serial_no_batch_purchase_details.get(serial_no):
-					fifo_queue.append(
-						[serial_no, self.serial_no_batch_purchase_details.get(serial_no), valuation]
-					)
-				else:
-					self.serial_no_batch_purchase_details.setdefault(serial_no, row.posting_date)
-					fifo_queue.append([serial_no, row.posting_date, valuation])
-
-	def __compute_outgoing_stock(self, row: dict, fifo_queue: list, transfer_key: tuple, serial_nos: list):
-		"Update FIFO Queue on outward stock."
-		if serial_nos:
-			fifo_queue[:] = [serial_no for serial_no in fifo_queue if serial_no[0] not in serial_nos]
-			return
+	def __add_item_slots(self, item_slots: "ItemFIFOSlots"):
+		self.item_details.update(item_slots.item_details)
+		self.transferred_item_details.update(item_slots.transferred_item_details)
+		self.serial_no_batch_purchase_details.update(item_slots.serial_no_batch_purchase_details)
+		self.first_seen.update(item_slots.first_seen)
 
-		qty_to_pop = abs(row.actual_qty)
-		stock_value = abs(row.stock_value_difference)
-
-		while qty_to_pop:
-			slot = fifo_queue[0] if fifo_queue else [0, None, 0]
-			if 0 < flt(slot[0]) <= qty_to_pop:
-				# qty to pop >= slot qty
-				# if +ve and not enough or exactly same balance in current slot, consume whole slot
-				qty_to_pop -= flt(slot[0])
-				stock_value -= flt(slot[2])
-				self.transferred_item_details[transfer_key].append(fifo_queue.pop(0))
-			elif not fifo_queue:
-				# negative stock, no balance but qty yet to consume
-				fifo_queue.append([-(qty_to_pop), row.posting_date, -(stock_value)])
-				self.transferred_item_details[transfer_key].append(
-					[qty_to_pop, row.posting_date, stock_value]
-				)
-				qty_to_pop = 0
-				stock_value = 0
-			else:
-				# qty to pop < slot qty, ample balance
-				# consume actual_qty from first slot
-				slot[0] = flt(slot[0]) - qty_to_pop
-				slot[2] = flt(slot[2]) - stock_value
-				self.transferred_item_details[transfer_key].append([qty_to_pop, slot[1], stock_value])
-				qty_to_pop = 0
-				stock_value = 0
+	def __get_serial_nos(self, row: dict, bundle_wise_serial_nos: dict) -> list:
+		if row.serial_and_batch_bundle and row.has_serial_no:
+			if bundle_wise_serial_nos:
+				return bundle_wise_serial_nos.get(row.serial_and_batch_bundle) or []
 
-	def __adjust_incoming_transfer_qty(self, transfer_data: dict, fifo_queue: list, row: dict):
-		"Add previously removed stock back to FIFO Queue."
-		transfer_qty_to_pop = flt(row.actual_qty)
-		stock_value = flt(row.stock_value_difference)
+			from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+				get_serial_nos_from_bundle,
+			)
 
-		def add_to_fifo_queue(slot):
-			if fifo_queue and flt(fifo_queue[0][0]) <= 0:
-				# neutralize 0/negative stock by adding positive stock
-				fifo_queue[0][0] += flt(slot[0])
-				fifo_queue[0][1] = slot[1]
-				fifo_queue[0][2] += flt(slot[2])
-			else:
-				fifo_queue.append(slot)
+			return get_serial_nos_from_bundle(row.serial_and_batch_bundle) or []
 
-		while transfer_qty_to_pop:
-			if transfer_data and 0 < transfer_data[0][0] <= transfer_qty_to_pop:
-				# bucket qty is not enough, consume whole
-				transfer_qty_to_pop -= transfer_data[0][0]
-				stock_value -= transfer_data[0][2]
-				add_to_fifo_queue(transfer_data.pop(0))
-			elif not transfer_data:
-				# transfer bucket is empty, extra incoming qty
-				add_to_fifo_queue([transfer_qty_to_pop, row.posting_date, stock_value])
-				transfer_qty_to_pop = 0
-				stock_value = 0
-			else:
-				# ample bucket qty to consume
-				transfer_data[0][0] -= transfer_qty_to_pop
-				transfer_data[0][2] -= stock_value
-				add_to_fifo_queue([transfer_qty_to_pop, transfer_data[0][1], stock_value])
-				transfer_qty_to_pop = 0
-				stock_value = 0
+		return get_serial_nos(row.serial_no) if row.serial_no else []
 
-	def __update_balances(self, row: dict, key: tuple | str):
-		self.item_details[key]["qty_after_transaction"] = row.qty_after_transaction
+	def __get_item_wise_stock_ledger_entries(self, bundle_wise_serial_nos: dict) -> Iterator[list]:
+		"Yields the entries of one item at a time as (row, serial nos, position in ledger)."
+		stock_ledger_entries = self.__get_stock_ledger_entries()
 
-		if "total_qty" not in self.item_details[key]:
-			self.item_details[key]["total_qty"] = row.actual_qty
-		else:
-			self.item_details[key]["total_qty"] += row.actual_qty
+		for _item, rows in groupby(stock_ledger_entries, key=itemgetter("name")):
+			entries = []
+			for row in rows:
+				position = (row.pop("posting_datetime"), row.pop("creation"))
+				entries.append((row, self.__get_serial_nos(row, bundle_wise_serial_nos), position))
 
-		self.item_details[key]["has_serial_no"] = row.has_serial_no
-		self.item_details[key]["details"].valuation_rate = row.valuation_rate
+			yield entries
 
 	def __aggregate_details_by_item(self, wh_wise_data: dict) -> dict:
 		"Aggregate Item-Wh wise data into single Item entry."
@@ -463,6 +390,8 @@ class FIFOSlots:
 				sle.qty_after_transaction,
 				sle.serial_and_batch_bundle,
 				sle.warehouse,
+				sle.posting_datetime,
+				sle.creation,
 			)
 			.where(
 				(sle.item_code == item.name)
@@ -484,7 +413,7 @@ class FIFOSlots:
 			if warehouses:
 				sle_query = sle_query.where(sle.warehouse.isin(warehouses))
 
-		sle_query = sle_query.orderby(sle.posting_datetime, sle.creation)
+		sle_query = sle_query.orderby(sle.item_code, sle.posting_datetime, sle.creation)
 
 		return sle_query.run(as_dict=True, as_iterator=True)
 
@@ -553,3 +482,165 @@ class FIFOSlots:
 		warehouse_results = [x[0] for x in warehouse_results]
 
 		return sle_query.where(sle.warehouse.isin(warehouse_results))
+
+
+def get_items_fifo_slots(item_wise_entries: list[list]) -> list["ItemFIFOSlots"]:
+	return [get_item_fifo_slots(entries) for entries in item_wise_entries]
+
+
+def get_item_fifo_slots(entries: list) -> "ItemFIFOSlots":
+	item_slots = ItemFIFOSlots()
+	for row, serial_nos, position in entries:
+		item_slots.add(row, serial_nos, position)
+
+	return item_slots.finalize()
+
+
+class ItemFIFOSlots:
+	"FIFO slots of a single item, warehouse wise. Entries have to be added in ledger order."
+
+	def __init__(self):
+		self.item_details = {}
+		self.transferred_item_details = {}
+		self.serial_no_batch_purchase_details = {}
+		self.first_seen = {}
+
+	def add(self, row: dict, serial_nos: list, position=None):
+		key = (row.name, row.warehouse)
+		item_details = self.item_details.get(key)
+		if item_details is None:
+			item_details = self.item_details[key] = {"details": row, "fifo_queue": deque()}
+			self.first_seen[key] = position
+
+		fifo_queue = item_details["fifo_queue"]
+
+		transfer_key = (row.voucher_no, row.name, row.warehouse)
+		transfer_data = self.transferred_item_details.get(transfer_key)
+		if transfer_data is None:
+			transfer_data = self.transferred_item_details[transfer_key] = []
+
+		if row.voucher_type == "Stock Reconciliation":
+			# get difference in qty shift as actual qty
+			prev_balance_qty = item_details.get("qty_after_transaction", 0)
+			row.actual_qty = flt(row.qty_after_transaction) - flt(prev_balance_qty)
+
+		if row.actual_qty > 0:
+			self.__compute_incoming_stock(row, fifo_queue, transfer_data, serial_nos)
+		else:
+			self.__compute_outgoing_stock(row, fifo_queue, transfer_data, serial_nos)
+
+		item_details["qty_after_transaction"] = row.qty_after_transaction
+
+		if "total_qty" not in item_details:
+			item_details["total_qty"] = row.actual_qty
+		else:
+			item_details["total_qty"] += row.actual_qty
+
+		item_details["has_serial_no"] = row.has_serial_no
+		item_details["details"].valuation_rate = row.valuation_rate
+
+	def finalize(self) -> "ItemFIFOSlots":
+		"Convert the queues to lists."
+		for item_details in self.item_details.values():
+			item_details["fifo_queue"] = list(item_details["fifo_queue"])
+
+		return self
+
+	def __compute_incoming_stock(self, row: dict, fifo_queue: deque, transfer_data: list, serial_nos: list):
+		"Update FIFO Queue on inward stock."
+
+		if transfer_data:
+			# inward/outward from same voucher, item & warehouse
+			# eg: Repack with same item, Stock reco for batch item
+			# consume transfer data and add stock to fifo queue
+			self.__adjust_incoming_transfer_qty(transfer_data, fifo_queue, row)
+		else:
+			if not serial_nos and not row.get("has_serial_no"):
+				if fifo_queue and flt(fifo_queue[0][0]) <= 0:
+					# neutralize 0/negative stock by adding positive stock
+					fifo_queue[0][0] += flt(row.actual_qty)
+					fifo_queue[0][1] = row.posting_date
+					fifo_queue[0][2] += flt(row.stock_value_difference)
+				else:
+					fifo_queue.append(
+						[flt(row.actual_qty), row.posting_date, flt(row.stock_value_difference)]
+					)
+				return
+
+			valuation = row.stock_value_difference / row.actual_qty
+			for serial_no in serial_nos:
+				if self.serial_no_batch_purchase_details.get(serial_no):
+					fifo_queue.append(
+						[serial_no, self.serial_no_batch_purchase_details.get(serial_no), valuation]
+					)
+				else:
+					self.serial_no_batch_purchase_details.setdefault(serial_no, row.posting_date)
+					fifo_queue.append([serial_no, row.posting_date, valuation])
+
+	def __compute_outgoing_stock(self, row: dict, fifo_queue: deque, transfer_data: list, serial_nos: list):
+		"Update FIFO Queue on outward stock."
+		if serial_nos:
+			serial_nos = set(serial_nos)
+			remaining = [serial_no for serial_no in fifo_queue if serial_no[0] not in serial_nos]
+			fifo_queue.clear()
+			fifo_queue.extend(remaining)
+			return
+
+		qty_to_pop = abs(row.actual_qty)
+		stock_value = abs(row.stock_value_difference)
+
+		while qty_to_pop:
+			slot = fifo_queue[0] if fifo_queue else [0, None, 0]
+			if 0 < flt(slot[0]) <= qty_to_pop:
+				# qty to pop >= slot qty
+				# if +ve and not enough or exactly same balance in current slot, consume whole slot
+				qty_to_pop -= flt(slot[0])
+				stock_value -= flt(slot[2])
+				transfer_data.append(fifo_queue.popleft())
+			elif not fifo_queue:
+				# negative stock, no balance but qty yet to consume
+				fifo_queue.append([-(qty_to_pop), row.posting_date, -(stock_value)])
+				transfer_data.append([qty_to_pop, row.posting_date, stock_value])
+				qty_to_pop = 0
+				stock_value = 0
+			else:
+				# qty to pop < slot qty, ample balance
+				# consume actual_qty from first slot
+				slot[0] = flt(slot[0]) - qty_to_pop
+				slot[2] = flt(slot[2]) - stock_value
+				transfer_data.append([qty_to_pop, slot[1], stock_value])
+				qty_to_pop = 0
+				stock_value = 0
+
+	def __adjust_incoming_transfer_qty(self, transfer_data: list, fifo_queue: deque, row: dict):
+		"Add previously removed stock back to FIFO Queue."
+		transfer_qty_to_pop = flt(row.actual_qty)
+		stock_value = flt(row.stock_value_difference)
+
+		def add_to_fifo_queue(slot):
+			if fifo_queue and flt(fifo_queue[0][0]) <= 0:
+				# neutralize 0/negative stock by adding positive stock
+				fifo_queue[0][0] += flt(slot[0])
+				fifo_queue[0][1] = slot[1]
+				fifo_queue[0][2] += flt(slot[2])
+			else:
+				fifo_queue.append(slot)
+
+		while transfer_qty_to_pop:
+			if transfer_data and 0 < transfer_data[0][0] <= transfer_qty_to_pop:
+				# bucket qty is not enough, consume whole
+				transfer_qty_to_pop -= transfer_data[0][0]
+				stock_value -= transfer_data[0][2]
+				add_to_fifo_queue(transfer_data.pop(0))
+			elif not transfer_data:
+				# transfer bucket is empty, extra incoming qty
+				add_to_fifo_queue([transfer_qty_to_pop, row.posting_date, stock_value])
+				transfer_qty_to_pop = 0
+				stock_value = 0
+			else:
+				# ample bucket qty to consume
+				transfer_data[0][0] -= transfer_qty_to_pop
+				transfer_data[0][2] -= stock_value
+				add_to_fifo_queue([transfer_qty_to_pop, transfer_data[0][1], stock_value])
+				transfer_qty_to_pop = 0
+				stock_value = 0
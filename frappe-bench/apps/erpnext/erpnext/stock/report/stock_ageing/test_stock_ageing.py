@@ -3,7 +3,10 @@
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
 
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, format_report_data
 
 
@@ -868,6 +871,62 @@ class TestStockAgeing(FrappeTestCase):
 		range_valuations = range_values[1::2]
 		self.assertEqual(range_valuations, [15, 7.5, 20, 5])
 
+	def test_slots_in_processes(self):
+		"Slots computed in worker processes are the same, in the same order."
+		company = "_Test Company"
+		items = [make_item(f"_Test Stock Ageing Item {i}", {"is_stock_item": 1}).name for i in range(3)]
+
+		for days in (-3, -2, -1):
+			for item in reversed(items):
+				make_stock_entry(
+					item_code=item,
+					company=company,
+					qty=10,
+					rate=10,
+					target="_Test Warehouse - _TC",
+					posting_date=add_days(today(), days),
+				)
+
+		make_stock_entry(item_code=items[0], company=company, qty=15, source="_Test Warehouse - _TC")
+
+		filters = frappe._dict(company=company, to_date=today(), show_warehouse_wise_stock=True)
+		slots = FIFOSlots(filters).generate()
+
+		frappe.conf.stock_ageing_processes = 2
+		self.addCleanup(frappe.conf.pop, "stock_ageing_processes", None)
+		slots_in_processes = FIFOSlots(filters).generate()
+
+		self.assertEqual(list(slots_in_processes), list(slots))
+		self.assertEqual(slots_in_processes, slots)
+		self.assertEqual(slots[(items[0], "_Test Warehouse - _TC")]["fifo_queue"][0][0], 5.0)
+
+	def test_slots_of_interleaved_items(self):
+		"Slots of a ledger with the entries of several items interleaved."
+		sle = []
+		for i in range(300):
+			actual_qty = -2 if i % 3 == 2 else 1
+			sle.append(
+				frappe._dict(
+					name=f"Flask Item {i % 20}",
+					actual_qty=actual_qty,
+					qty_after_transaction=0,
+					stock_value_difference=actual_qty * 10,
+					warehouse="WH 1",
+					posting_date="2021-12-01",
+					voucher_type="Stock Entry",
+					voucher_no=str(i),
+					has_serial_no=False,
+					serial_no=None,
+				)
+			)
+
+		slots = FIFOSlots(self.filters, sle).generate()
+
+		self.assertEqual(list(slots), [f"Flask Item {i}" for i in range(20)])
+		for item_code, item_result in slots.items():
+			self.assertEqual(item_result["total_qty"], sum(d.actual_qty for d in sle if d.name == item_code))
+			self.assertEqual(sum(slot[0] for slot in item_result["fifo_queue"]), item_result["total_qty"])
+
 
 def generate_item_and_item_wh_wise_slots(filters, sle):
 	"Return results with and without 'show_warehouse_wise_stock'"
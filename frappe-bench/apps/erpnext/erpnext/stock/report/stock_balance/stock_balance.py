@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import json
 from operator import itemgetter
 from typing import Any, TypedDict
 
@@ -9,11 +10,15 @@ import frappe
 from frappe import _
 from frappe.query_builder import Order
 from frappe.query_builder.functions import Coalesce
-from frappe.utils import add_days, cint, date_diff, flt, getdate
+from frappe.utils import add_days, cint, cstr, date_diff, flt, getdate
 from frappe.utils.nestedset import get_descendants_of
 
 import erpnext
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_inventory_dimension_key,
+	get_latest_snapshot,
+)
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, get_average_age
 from erpnext.stock.utils import add_additional_uom_columns
@@ -61,7 +66,7 @@ class StockBalanceReport:
 		self.float_precision = cint(frappe.db.get_default("float_precision")) or 3
 
 		self.inventory_dimensions = self.get_inventory_dimension_fields()
-		self.prepare_opening_data_from_closing_balance()
+		self.prepare_opening_data()
 		self.prepare_stock_ledger_entries()
 		self.prepare_new_data()
 
@@ -72,10 +77,37 @@ class StockBalanceReport:
 
 		return self.columns, self.data
 
-	def prepare_opening_data_from_closing_balance(self) -> None:
+	def get_balances(self) -> dict:
+		"""Unrounded balances per group by key as on the to date, without the report's formatting."""
+		self.float_precision = cint(frappe.db.get_default("float_precision")) or 3
+		self.inventory_dimensions = self.get_inventory_dimension_fields()
+
 		self.opening_data = frappe._dict({})
+		if snapshot := self.get_snapshot():
+			self.prepare_opening_data_from_snapshot(snapshot)
 
+		self.prepare_stock_ledger_entries()
+		return self.aggregate_item_warehouse_map()
+
+	def prepare_opening_data(self) -> None:
+		"""Start from the latest Stock Balance Snapshot or Closing Stock Balance before the from date."""
 		closing_balance = self.get_closing_balance()
+		snapshot = self.get_snapshot()
+
+		if snapshot and (
+			not closing_balance or snapshot.snapshot_date >= getdate(closing_balance[0].to_date)
+		):
+			self.opening_data = frappe._dict({})
+			self.prepare_opening_data_from_snapshot(snapshot)
+		else:
+			self.prepare_opening_data_from_closing_balance(closing_balance)
+
+	def prepare_opening_data_from_closing_balance(self, closing_balance=None) -> None:
+		self.opening_data = frappe._dict({})
+
+		if closing_balance is None:
+			closing_balance = self.get_closing_balance()
+
 		if not closing_balance:
 			return
 
@@ -89,6 +121,73 @@ class StockBalanceReport:
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
 
+	def get_snapshot(self):
+		if (
+			self.filters.get("ignore_closing_balance")
+			or not self.filters.get("company")
+			or self.filters.get("show_stock_ageing_data")
+		):
+			return None
+
+		# without dimension wise stock, dimension filters group the balances by the filtered dimensions only
+		if not self.filters.get("show_dimension_wise_stock") and any(
+			self.filters.get(fieldname) for fieldname in self.inventory_dimensions
+		):
+			return None
+
+		snapshot = get_latest_snapshot(self.filters.company, add_days(self.from_date, -1))
+		if not snapshot or cstr(snapshot.inventory_dimensions) != get_inventory_dimension_key():
+			return None
+
+		return snapshot
+
+	def prepare_opening_data_from_snapshot(self, snapshot) -> None:
+		self.start_from = add_days(snapshot.snapshot_date, 1)
+
+		entry_table = frappe.qb.DocType("Stock Balance Snapshot Entry")
+		item_table = frappe.qb.DocType("Item")
+		dimension_wise = cint(self.filters.get("show_dimension_wise_stock") and self.inventory_dimensions)
+
+		query = (
+			frappe.qb.from_(entry_table)
+			.inner_join(item_table)
+			.on(entry_table.item_code == item_table.name)
+			.select(
+				entry_table.item_code,
+				entry_table.warehouse,
+				entry_table.inventory_dimension_values,
+				entry_table.bal_qty,
+				entry_table.bal_val,
+				entry_table.valuation_rate.as_("val_rate"),
+				item_table.item_group,
+				item_table.stock_uom,
+				item_table.item_name,
+			)
+			.where(
+				(entry_table.stock_balance_snapshot == snapshot.name)
+				& (entry_table.dimension_wise == dimension_wise)
+			)
+		)
+
+		query = self.apply_warehouse_filters(query, entry_table)
+		query = self.apply_items_filters(query, item_table)
+
+		dimension_filters = {
+			fieldname: self.filters.get(fieldname)
+			for fieldname in self.inventory_dimensions
+			if self.filters.get(fieldname)
+		}
+
+		for entry in query.run(as_dict=True):
+			entry.company = self.filters.company
+			if entry.inventory_dimension_values:
+				entry.update(json.loads(entry.pop("inventory_dimension_values")))
+
+			if any(entry.get(fieldname) not in values for fieldname, values in dimension_filters.items()):
+				continue
+
+			self.opening_data[self.get_group_by_key(entry)] = entry
+
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
 
@@ -149,6 +248,11 @@ class StockBalanceReport:
 			self.data.append(report_data)
 
 	def get_item_warehouse_map(self):
+		return filter_items_with_no_transactions(
+			self.aggregate_item_warehouse_map(), self.float_precision, self.inventory_dimensions
+		)
+
+	def aggregate_item_warehouse_map(self):
 		item_warehouse_map = {}
 		self.opening_vouchers = self.get_opening_vouchers()
 
@@ -175,10 +279,6 @@ class StockBalanceReport:
 			if group_by_key not in item_warehouse_map:
 				self.initialize_data(item_warehouse_map, group_by_key, entry)
 
-		item_warehouse_map = filter_items_with_no_transactions(
-			item_warehouse_map, self.float_precision, self.inventory_dimensions
-		)
-
 		return item_warehouse_map
 
 	def get_sre_reserved_qty_details(self) -> dict:
@@ -247,10 +347,14 @@ class StockBalanceReport:
 				"out_val": 0.0,
 				"bal_qty": opening_data.get("bal_qty") or 0.0,
 				"bal_val": opening_data.get("bal_val") or 0.0,
-				"val_rate": 0.0,
+				"val_rate": opening_data.get("val_rate") or 0.0,
 			}
 		)
 
+		for fieldname in self.inventory_dimensions:
+			if entry.get(fieldname):
+				item_warehouse_map[group_by_key][fieldname] = entry.get(fieldname)
+
 	def get_group_by_key(self, row) -> tuple:
 		group_by_key = [row.company, row.item_code, row.warehouse]
 
@@ -3,7 +3,7 @@ from typing import Any
 import frappe
 from frappe import _dict
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import today
+from frappe.utils import now, today
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -168,3 +168,41 @@ class TestStockBalance(FrappeTestCase):
 		rows = stock_balance(self.filters.update({"show_variant_attributes": 1, "item_code": variant.name}))
 		self.assertPartialDictEq(attributes, rows[0])
 		self.assertInvariants(rows)
+
+	def test_opening_balance_from_snapshot(self):
+		from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+			has_changed_since,
+			make_stock_balance_snapshot,
+		)
+
+		self.generate_stock_ledger(
+			self.item.name,
+			[
+				_dict(qty=1, rate=1, posting_date="2021-01-01"),
+				_dict(qty=2, rate=2, posting_date="2021-01-02"),
+				_dict(qty=3, rate=3, posting_date="2021-02-03"),
+			],
+		)
+		snapshot = make_stock_balance_snapshot("_Test Company", "2021-01-31")
+
+		self.filters.update({"from_date": "2021-02-01"})
+		rows = stock_balance(self.filters)
+		self.assertInvariants(rows)
+		self.assertPartialDictEq({"opening_qty": 3, "opening_val": 5, "in_qty": 3}, rows[0])
+
+		expected = stock_balance(self.filters.copy().update({"ignore_closing_balance": 1}))
+		self.assertEqual([row.bal_val for row in rows], [row.bal_val for row in expected])
+
+		# without entries after the snapshot, the valuation rate comes from the snapshot
+		filters = self.filters.copy().update({"from_date": "2021-02-01", "to_date": "2021-02-02"})
+		expected = stock_balance(filters.copy().update({"ignore_closing_balance": 1}))
+		self.assertTrue(expected[0].val_rate)
+		self.assertEqual(stock_balance(filters)[0].val_rate, expected[0].val_rate)
+
+		# a backdated entry drops the snapshots it would change
+		since = now()
+		self.assertFalse(has_changed_since("_Test Company", "2021-01-31", since))
+		self.generate_stock_ledger(self.item.name, [_dict(qty=1, rate=1, posting_date="2021-01-15")])
+		self.assertTrue(has_changed_since("_Test Company", "2021-01-31", since))
+		self.assertFalse(frappe.db.exists("Stock Balance Snapshot", snapshot.name))
+		self.assertPartialDictEq({"opening_qty": 4, "in_qty": 3}, stock_balance(self.filters)[0])
@@ -23,11 +23,15 @@ from frappe.utils import (
 )
 
 import erpnext
+from erpnext.stock.doctype.batch_bin.batch_bin import rebuild_batch_bin, remove_voucher_from_batch_bin
 from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
 )
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	invalidate_stock_balance_snapshots,
+)
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	get_sre_reserved_batch_nos_details,
 	get_sre_reserved_serial_nos_details,
@@ -71,6 +75,8 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 			validate_cancellation(sl_entries)
 			set_as_cancel(sl_entries[0].get("voucher_type"), sl_entries[0].get("voucher_no"))
 
+		invalidate_stock_balance_snapshots(sl_entries[0].get("company"), sl_entries[0].get("posting_date"))
+
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
 
@@ -213,6 +219,7 @@ def validate_cancellation(kargs):
 
 
 def set_as_cancel(voucher_type, voucher_no):
+	remove_voucher_from_batch_bin(voucher_type, voucher_no)
 	frappe.db.sql(
 		"""update `tabStock Ledger Entry` set is_cancelled=1,
 		modified=%s, modified_by=%s
@@ -259,6 +266,7 @@ def repost_future_sle(
 
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
 	affected_transactions = get_affected_transactions(doc, reposting_data=reposting_data)
+	changed_transactions = get_changed_transactions(doc, reposting_data=reposting_data) or {}
 
 	i = get_current_index(doc) or 0
 	while i < len(args):
@@ -279,6 +287,12 @@ def repost_future_sle(
 			via_landed_cost_voucher=via_landed_cost_voucher,
 		)
 		affected_transactions.update(obj.affected_transactions)
+		for transaction, difference in obj.changed_transactions.items():
+			changed_transactions[transaction] = changed_transactions.get(transaction, 0.0) + difference
+
+		# reposting can change the batch qty of stock reconciliations and add missing entries
+		if frappe.get_cached_value("Item", args[i].get("item_code"), "has_batch_no"):
+			rebuild_batch_bin(args[i].get("item_code"), args[i].get("warehouse"))
 
 		key = (args[i].get("item_code"), args[i].get("warehouse"))
 		if distinct_item_warehouses.get(key):
@@ -299,7 +313,7 @@ def repost_future_sle(
 
 		if doc:
 			update_args_in_repost_item_valuation(
-				doc, i, args, distinct_item_warehouses, affected_transactions
+				doc, i, args, distinct_item_warehouses, affected_transactions, changed_transactions
 			)
 
 
@@ -340,7 +354,14 @@ def validate_item_warehouse(args):
 			frappe.throw(_(validation_msg))
 
 
-def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehouses, affected_transactions):
+def update_args_in_repost_item_valuation(
+	doc, index, args, distinct_item_warehouses, affected_transactions, changed_transactions=None
+):
+	# stored as a list since the keys are tuples
+	changed_transactions = [
+		[*transaction, difference] for transaction, difference in (changed_transactions or {}).items()
+	]
+
 	if not doc.items_to_be_repost:
 		file_name = ""
 		if doc.reposting_data_file:
@@ -352,6 +373,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 				"items_to_be_repost": args,
 				"distinct_item_and_warehouse": {str(k): v for k, v in distinct_item_warehouses.items()},
 				"affected_transactions": affected_transactions,
+				"changed_transactions": changed_transactions,
 			},
 			doc,
 			file_name,
@@ -374,6 +396,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 				),
 				"current_index": index,
 				"affected_transactions": frappe.as_json(affected_transactions),
+				"changed_transactions": frappe.as_json(changed_transactions),
 			}
 		)
 
@@ -514,6 +537,25 @@ def get_affected_transactions(doc, reposting_data=None) -> set[tuple[str, str]]:
 	return {tuple(transaction) for transaction in transactions}
 
 
+def get_changed_transactions(doc, reposting_data=None) -> dict[tuple[str, str], float] | None:
+	"""Vouchers whose stock value difference changed while reposting, with the total change.
+
+	Returns None if the repost did not record them."""
+	if not reposting_data and doc and doc.reposting_data_file:
+		reposting_data = get_reposting_data(doc.reposting_data_file)
+
+	if reposting_data and reposting_data.changed_transactions is not None:
+		transactions = reposting_data.changed_transactions
+	elif doc and doc.changed_transactions:
+		transactions = frappe.parse_json(doc.changed_transactions)
+	else:
+		return None
+
+	return {
+		(voucher_type, voucher_no): flt(difference) for voucher_type, voucher_no, difference in transactions
+	}
+
+
 def get_current_index(doc=None):
 	if doc and doc.current_index:
 		return doc.current_index
@@ -563,6 +605,7 @@ class update_entries_after:
 		self.new_items_found = False
 		self.distinct_item_warehouses = args.get("distinct_item_warehouses", frappe._dict())
 		self.affected_transactions: set[tuple[str, str]] = set()
+		self.changed_transactions: dict[tuple[str, str], float] = {}
 		self.reserved_stock = self.get_reserved_stock()
 
 		self.data = frappe._dict()
@@ -803,6 +846,7 @@ class update_entries_after:
 
 		self.validate_previous_sle_qty(sle)
 		self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
+		previous_stock_value_difference = flt(sle.stock_value_difference)
 
 		if (sle.serial_no and not self.via_landed_cost_voucher) or not cint(self.allow_negative_stock):
 			# validate negative stock for serialized items, fifo valuation
@@ -918,6 +962,8 @@ class update_entries_after:
 				* -1
 			)
 
+		self.update_changed_transactions(sle, previous_stock_value_difference)
+
 		sle.doctype = "Stock Ledger Entry"
 		sle.modified = now()
 		frappe.get_doc(sle).db_update()
@@ -927,6 +973,17 @@ class update_entries_after:
 		):
 			self.update_outgoing_rate_on_transaction(sle)
 
+	def update_changed_transactions(self, sle, previous_stock_value_difference):
+		"""Track the vouchers whose GL Entries have to be reposted"""
+		difference = flt(
+			flt(sle.stock_value_difference) - previous_stock_value_difference, self.currency_precision
+		)
+		if not difference:
+			return
+
+		key = (sle.voucher_type, sle.voucher_no)
+		self.changed_transactions[key] = self.changed_transactions.get(key, 0.0) + difference
+
 	def get_serialized_values(self, sle):
 		from erpnext.stock.serial_batch_bundle import SerialNoValuation
 
@@ -1411,10 +1468,7 @@ class update_entries_after:
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		stock_queue = self.get_stock_queue()
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1450,6 +1504,21 @@ class update_entries_after:
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
 
+	def get_stock_queue(self):
+		"""Reuse the valuation queue of the previous entry of this warehouse unless its
+		stock_queue has been replaced since, to avoid rebuilding it on every entry."""
+		stock_queue = self.wh_data.get("valuation_queue")
+		if stock_queue is not None and stock_queue.is_state(self.wh_data.stock_queue):
+			return stock_queue
+
+		if self.valuation_method == "LIFO":
+			stock_queue = LIFOValuation(self.wh_data.stock_queue)
+		else:
+			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+
+		self.wh_data.valuation_queue = stock_queue
+		return stock_queue
+
 	def update_batched_values(self, sle):
 		from erpnext.stock.serial_batch_bundle import BatchNoValuation
 
@@ -1,8 +1,10 @@
+from unittest.mock import patch
+
 import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_items_details_bulk
 
 test_ignore = ["BOM"]
 test_dependencies = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
@@ -35,6 +37,51 @@ class TestGetItemDetail(FrappeTestCase):
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
 
+	def get_bulk_args(self):
+		return frappe._dict(
+			{
+				"company": "_Test Company",
+				"customer": "_Test Customer",
+				"conversion_rate": 1.0,
+				"price_list_currency": "INR",
+				"plc_conversion_rate": 1.0,
+				"doctype": "Sales Order",
+				"name": None,
+				"transaction_date": frappe.utils.nowdate(),
+				"selling_price_list": "_Test Price List",
+				"ignore_pricing_rule": 1,
+				"warehouse": "_Test Warehouse - _TC",
+			}
+		)
+
+	def test_get_items_details_bulk(self):
+		args = self.get_bulk_args()
+		items = [
+			{"item_code": "_Test Item", "qty": 1},
+			{"item_code": "_Test Item 2", "qty": 5},
+			{"item_code": "_Test Item", "qty": 2, "uom": "_Test UOM 1"},
+		]
+
+		details = get_items_details_bulk(args, items)
+
+		self.assertEqual(len(details), len(items))
+		for item, row_details in zip(items, details, strict=True):
+			self.assertEqual(row_details, get_item_details(dict(args, **item)))
+
+	def test_get_items_details_bulk_query_count(self):
+		"""Bulk lookup saves at least one query per row over one lookup per row."""
+		args = self.get_bulk_args()
+		item_codes = ["_Test Item", "_Test Item 2", "_Test Item Home Desktop 100", "_Test FG Item"]
+		items = [{"item_code": item_codes[i % len(item_codes)], "qty": i + 1} for i in range(20)]
+
+		with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+			per_row = [get_item_details(dict(args, **item)) for item in items]
+
+		with self.assertQueryCount(sql.call_count - len(items)):
+			bulk = get_items_details_bulk(args, items)
+
+		self.assertEqual(bulk, per_row)
+
 	# making this test in get_item_details test file as feat/fix is present in that method
 	def test_fetch_price_from_list_rate_on_doc_save(self):
 		# create item
@@ -124,6 +124,29 @@ class TestFIFOValuation(unittest.TestCase):
 		self.queue.add_stock(5, 17)
 		self.queue.add_stock(8, 11)
 
+	def test_remove_rates_from_middle_of_large_queue(self):
+		for rate in range(1, 1001):
+			self.queue.add_stock(1, rate)
+
+		for rate in range(2, 1000, 2):
+			self.queue.remove_stock(1, rate)
+
+		self.assertEqual(self.queue, [[1, rate] for rate in range(1, 1001) if rate % 2 or rate == 1000])
+
+		# bins consumed by rate are skipped when consuming from head
+		self.queue.remove_stock(3)
+		self.assertEqual(self.queue.state[0], [1, 7])
+
+	def test_state_round_trip(self):
+		self.queue.add_stock(1, 10)
+		self.queue.add_stock(2, 20)
+		self.queue.add_stock(3, 30)
+		self.queue.remove_stock(2, 20)
+
+		state = json.loads(json.dumps(self.queue.state))
+		self.assertEqual(FIFOValuation(state).state, self.queue.state)
+		self.assertEqual(FIFOValuation(state).get_total_stock_and_value(), (4, 100))
+
 	@given(stock_queue_generator)
 	def test_fifo_qty_hypothesis(self, stock_queue):
 		self.queue = FIFOValuation([])
@@ -1,4 +1,6 @@
+import math
 from abc import ABC, abstractmethod, abstractproperty
+from collections import deque
 from collections.abc import Callable
 from typing import NewType
 
@@ -12,6 +14,15 @@ RATE = 1
 
 
 class BinWiseValuation(ABC):
+	"""Base class for valuation methods that keep stock in bins of [qty, rate].
+
+	Implementations keep running totals of qty and value in `_total_qty` / `_total_value`,
+	updated through `_add_bin_totals` / `_remove_bin_totals` whenever a bin is added,
+	removed or changed. Totals are summed exactly (Shewchuk's algorithm) so they match a
+	full re-summation of the bins regardless of the order of operations."""
+
+	__slots__ = ["_total_qty", "_total_value"]
+
 	@abstractmethod
 	def add_stock(self, qty: float, rate: float) -> None:
 		pass
@@ -26,15 +37,38 @@ class BinWiseValuation(ABC):
 	def state(self) -> list[StockBin]:
 		pass
 
+	def _init_totals(self, bins) -> None:
+		self._total_qty: list[float] = []
+		self._total_value: list[float] = []
+		for stock_bin in bins:
+			self._add_bin_totals(stock_bin)
+
+	def _add_bin_totals(self, stock_bin: StockBin) -> None:
+		_add_to_partials(self._total_qty, flt(stock_bin[QTY]))
+		_add_to_partials(self._total_value, flt(stock_bin[QTY]) * flt(stock_bin[RATE]))
+
+	def _remove_bin_totals(self, stock_bin: StockBin) -> None:
+		_add_to_partials(self._total_qty, -flt(stock_bin[QTY]))
+		_add_to_partials(self._total_value, -(flt(stock_bin[QTY]) * flt(stock_bin[RATE])))
+
+	def _update_qty(self, stock_bin: StockBin, qty: float) -> None:
+		self._remove_bin_totals(stock_bin)
+		stock_bin[QTY] = qty
+		self._add_bin_totals(stock_bin)
+
 	def get_total_stock_and_value(self) -> tuple[float, float]:
-		total_qty = 0.0
-		total_value = 0.0
+		return (
+			round_off_if_near_zero(math.fsum(self._total_qty)),
+			round_off_if_near_zero(math.fsum(self._total_value)),
+		)
 
-		for qty, rate in self.state:
-			total_qty += flt(qty)
-			total_value += flt(qty) * flt(rate)
+	def is_state(self, state: list[StockBin]) -> bool:
+		"""Check if `state` is this object's current state, i.e. the object can be reused
+		instead of rebuilding a new one from `state`."""
+		return state is self.state and len(state) == len(self)
 
-		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+	def __len__(self):
+		return len(self.state)
 
 	def __repr__(self):
 		return str(self.state)
@@ -57,19 +91,81 @@ class FIFOValuation(BinWiseValuation):
 	Queue is implemented using "bins" of [qty, rate].
 
 	ref: https://en.wikipedia.org/wiki/FIFO_and_LIFO_accounting
+	Implementation detail: bins are kept in a deque along with an index of bins by rate, so
+	consuming from the head or by outgoing rate doesn't scan the queue. Bins consumed from
+	the middle of the queue are dropped lazily once they reach either end of it.
 	"""
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["queue"]
+	__slots__ = ["_bins", "_live", "_rate_index", "_state"]
 
 	def __init__(self, state: list[StockBin] | None):
-		self.queue: list[StockBin] = state if state is not None else []
+		self._state: list[StockBin] | None = state if state is not None else []
+		self._bins: deque[StockBin] = deque(self._state)
+		self._live: set[int] = {id(stock_bin) for stock_bin in self._bins}
+		self._build_rate_index()
+		self._init_totals(self._bins)
 
 	@property
 	def state(self) -> list[StockBin]:
 		"""Get current state of queue."""
-		return self.queue
+		if self._state is None:
+			if len(self._bins) == len(self._live):
+				self._state = list(self._bins)
+			else:
+				self._state = [stock_bin for stock_bin in self._bins if id(stock_bin) in self._live]
+
+		return self._state
+
+	@property
+	def queue(self) -> list[StockBin]:
+		return self.state
+
+	def __len__(self):
+		return len(self._live)
+
+	def _build_rate_index(self) -> None:
+		self._rate_index: dict[float, deque[StockBin]] = {}
+		for stock_bin in self._bins:
+			self._rate_index.setdefault(stock_bin[RATE], deque()).append(stock_bin)
+
+	def _append(self, stock_bin: StockBin) -> None:
+		self._bins.append(stock_bin)
+		self._live.add(id(stock_bin))
+		self._rate_index.setdefault(stock_bin[RATE], deque()).append(stock_bin)
+		self._add_bin_totals(stock_bin)
+		self._state = None
+
+	def _remove(self, stock_bin: StockBin) -> None:
+		self._live.discard(id(stock_bin))
+		self._remove_bin_totals(stock_bin)
+		self._state = None
+
+		# keep both ends of the queue live
+		while self._bins and id(self._bins[0]) not in self._live:
+			self._bins.popleft()
+		while self._bins and id(self._bins[-1]) not in self._live:
+			self._bins.pop()
+
+		# compact once removed bins dominate the queue
+		if len(self._bins) > 2 * len(self._live) + 32:
+			self._bins = deque(self.state)
+			self._build_rate_index()
+
+	def _find_bin_with_rate(self, rate: float) -> StockBin | None:
+		"""First bin in the queue with given rate."""
+		bins = self._rate_index.get(rate)
+		while bins:
+			# bins removed since they were indexed are dropped lazily
+			if id(bins[0]) in self._live:
+				return bins[0]
+			bins.popleft()
+
+		if bins is not None:
+			del self._rate_index[rate]
+
+		return None
 
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update fifo queue with new stock.
@@ -78,22 +174,24 @@ class FIFOValuation(BinWiseValuation):
 		        qty: new quantity to add
 		        rate: incoming rate of new quantity"""
 
-		if not len(self.queue):
-			self.queue.append([0, 0])
+		if not self._live:
+			self._append([0, 0])
 
+		last_bin = self._bins[-1]
 		# last row has the same rate, merge new bin.
-		if self.queue[-1][RATE] == rate:
-			self.queue[-1][QTY] += qty
+		if last_bin[RATE] == rate:
+			self._update_qty(last_bin, last_bin[QTY] + qty)
 		else:
 			# Item has a positive balance qty, add new entry
-			if self.queue[-1][QTY] > 0:
-				self.queue.append([qty, rate])
+			if last_bin[QTY] > 0:
+				self._append([qty, rate])
 			else:  # negative balance qty
-				qty = self.queue[-1][QTY] + qty
+				qty = last_bin[QTY] + qty
 				if qty > 0:  # new balance qty is positive
-					self.queue[-1] = [qty, rate]
+					self._remove(last_bin)
+					self._append([qty, rate])
 				else:  # new balance qty is still negative, maintain same rate
-					self.queue[-1][QTY] = qty
+					self._update_qty(last_bin, qty)
 
 	def remove_stock(
 		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
@@ -110,41 +208,35 @@ class FIFOValuation(BinWiseValuation):
 
 		consumed_bins = []
 		while qty:
-			if not len(self.queue):
+			if not self._live:
 				# rely on rate generator.
-				self.queue.append([0, rate_generator()])
+				self._append([0, rate_generator()])
 
-			index = None
+			fifo_bin = None
 			if outgoing_rate > 0:
 				# Find the entry where rate matched with outgoing rate
-				for idx, fifo_bin in enumerate(self.queue):
-					if fifo_bin[RATE] == outgoing_rate:
-						index = idx
-						break
-
-				# If no entry found with outgoing rate, consume as per FIFO
-				if index is None:  # nosemgrep
-					index = 0
-			else:
-				index = 0
+				fifo_bin = self._find_bin_with_rate(outgoing_rate)
+
+			# If no entry found with outgoing rate, consume as per FIFO
+			if fifo_bin is None:
+				fifo_bin = self._bins[0]
 
 			# select first bin or the bin with same rate
-			fifo_bin = self.queue[index]
 			if qty >= fifo_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
-				consumed_bins.append(list(to_consume))
+				self._remove(fifo_bin)
+				consumed_bins.append(list(fifo_bin))
 
-				if not self.queue and qty:
+				if not self._live and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.queue.append([-qty, outgoing_rate or fifo_bin[RATE]])
+					self._append([-qty, outgoing_rate or fifo_bin[RATE]])
 					consumed_bins.append([qty, outgoing_rate or fifo_bin[RATE]])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				fifo_bin[QTY] = round_off_if_near_zero(fifo_bin[QTY] - qty)
+				self._update_qty(fifo_bin, round_off_if_near_zero(fifo_bin[QTY] - qty))
 				consumed_bins.append([qty, fifo_bin[RATE]])
 				qty = 0
 
@@ -169,12 +261,22 @@ class LIFOValuation(BinWiseValuation):
 
 	def __init__(self, state: list[StockBin] | None):
 		self.stack: list[StockBin] = state if state is not None else []
+		self._init_totals(self.stack)
 
 	@property
 	def state(self) -> list[StockBin]:
 		"""Get current state of stack."""
 		return self.stack
 
+	def _push(self, stock_bin: StockBin) -> None:
+		self.stack.append(stock_bin)
+		self._add_bin_totals(stock_bin)
+
+	def _pop(self) -> StockBin:
+		stock_bin = self.stack.pop()
+		self._remove_bin_totals(stock_bin)
+		return stock_bin
+
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update lifo stack with new stock.
 
@@ -185,21 +287,22 @@ class LIFOValuation(BinWiseValuation):
 		Behaviour of this is same as FIFO valuation.
 		"""
 		if not len(self.stack):
-			self.stack.append([0, 0])
+			self._push([0, 0])
 
 		# last row has the same rate, merge new bin.
 		if self.stack[-1][RATE] == rate:
-			self.stack[-1][QTY] += qty
+			self._update_qty(self.stack[-1], self.stack[-1][QTY] + qty)
 		else:
 			# Item has a positive balance qty, add new entry
 			if self.stack[-1][QTY] > 0:
-				self.stack.append([qty, rate])
+				self._push([qty, rate])
 			else:  # negative balance qty
 				qty = self.stack[-1][QTY] + qty
 				if qty > 0:  # new balance qty is positive
-					self.stack[-1] = [qty, rate]
+					self._pop()
+					self._push([qty, rate])
 				else:  # new balance qty is still negative, maintain same rate
-					self.stack[-1][QTY] = qty
+					self._update_qty(self.stack[-1], qty)
 
 	def remove_stock(
 		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
@@ -218,33 +321,49 @@ class LIFOValuation(BinWiseValuation):
 		while qty:
 			if not len(self.stack):
 				# rely on rate generator.
-				self.stack.append([0, rate_generator()])
+				self._push([0, rate_generator()])
 
 			# start at the end.
-			index = -1
-
-			stock_bin = self.stack[index]
+			stock_bin = self.stack[-1]
 			if qty >= stock_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - stock_bin[QTY])
-				to_consume = self.stack.pop(index)
+				to_consume = self._pop()
 				consumed_bins.append(list(to_consume))
 
 				if not self.stack and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.stack.append([-qty, outgoing_rate or stock_bin[RATE]])
+					self._push([-qty, outgoing_rate or stock_bin[RATE]])
 					consumed_bins.append([qty, outgoing_rate or stock_bin[RATE]])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				stock_bin[QTY] = round_off_if_near_zero(stock_bin[QTY] - qty)
+				self._update_qty(stock_bin, round_off_if_near_zero(stock_bin[QTY] - qty))
 				consumed_bins.append([qty, stock_bin[RATE]])
 				qty = 0
 
 		return consumed_bins
 
 
+def _add_to_partials(partials: list[float], x: float) -> None:
+	"""Add `x` to a list of non-overlapping partial sums, without any rounding error.
+
+	`math.fsum(partials)` gives the correctly rounded total.
+	ref: https://code.activestate.com/recipes/393090/"""
+	i = 0
+	for y in partials:
+		if abs(x) < abs(y):
+			x, y = y, x
+		hi = x + y
+		lo = y - (hi - x)
+		if lo:
+			partials[i] = lo
+			i += 1
+		x = hi
+	partials[i:] = [x]
+
+
 def round_off_if_near_zero(number: float, precision: int = 7) -> float:
 	"""Rounds off the number to zero only if number is close to zero for decimal
 	specified in precision. Precision defaults to 7.
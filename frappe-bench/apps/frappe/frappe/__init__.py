@@ -973,6 +973,7 @@ def clear_cache(user: str | None = None, doctype: str | None = None):
 	:param user: If user is given, only user cache is cleared.
 	:param doctype: If doctype is given, only DocType cache is cleared."""
 	import frappe.cache_manager
+	import frappe.model.meta
 	import frappe.utils.caching
 	from frappe.website.router import clear_routing_cache
 
@@ -989,6 +990,7 @@ def clear_cache(user: str | None = None, doctype: str | None = None):
 		frappe.cache.delete_value(list(keys_to_delete), make_keys=False)
 
 		reset_metadata_version()
+		frappe.model.meta.clear_process_meta_cache()
 		local.cache = {}
 		local.new_doc_templates = {}
 
@@ -67,6 +67,7 @@ user_cache_keys = (
 
 doctype_cache_keys = (
 	"doctype_meta",
+	"doctype_meta_version",
 	"doctype_form_meta",
 	"table_columns",
 	"last_modified",
@@ -1,9 +1,10 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 import copy
+from unittest.mock import patch
 
 import frappe
-from frappe.core.doctype.version.version import get_diff
+from frappe.core.doctype.version.version import get_diff, insert_deferred_versions
 from frappe.test_runner import make_test_objects
 from frappe.tests.utils import FrappeTestCase
 
@@ -45,6 +46,33 @@ class TestVersion(FrappeTestCase):
 		t.save(ignore_version=False)
 		self.assertTrue(get_versions(t))
 
+	def test_deferred_version(self):
+		from frappe.desk.form.load import get_versions
+
+		t = frappe.get_doc(doctype="ToDo", description="something").insert()
+		t.flags.defer_version = True
+		for description in ("changed", "changed again"):
+			t.description = description
+			t.save(ignore_version=False)
+
+		# snapshots are stored in the same transaction
+		self.assertFalse(get_versions(t))
+		self.assertEqual(frappe.db.count("Deferred Version"), 2)
+
+		with patch.object(frappe.db, "commit"):
+			insert_deferred_versions()
+		self.assertFalse(frappe.db.count("Deferred Version"))
+		versions = get_versions(t)
+		self.assertEqual(len(versions), 2)
+
+		# latest first
+		changes = [
+			{fieldname: [old, new] for fieldname, old, new in frappe.parse_json(version.data).changed}
+			for version in versions
+		]
+		self.assertEqual(changes[0]["description"], ["changed", "changed again"])
+		self.assertEqual(changes[1]["description"], ["something", "changed"])
+
 
 def get_fieldnames(change_array):
 	return [d[0] for d in change_array]
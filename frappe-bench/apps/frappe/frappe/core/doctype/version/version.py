@@ -4,9 +4,11 @@
 import json
 
 import frappe
+from frappe.desk.form.document_follow import follow_document
 from frappe.model import no_value_fields, table_fields
 from frappe.model.document import Document
-from frappe.utils import cstr
+from frappe.model.naming import make_autoname
+from frappe.utils import cstr, now
 
 FIELDTYPES_TO_IGNORE = frozenset(fieldtype for fieldtype in no_value_fields if fieldtype not in table_fields)
 
@@ -173,5 +175,130 @@ def get_diff(old, new, for_child=False, compare_cancelled=False):
 		return None
 
 
+def defer_version(old: Document | None, new: Document):
+	"""Store the snapshots of a save as a Deferred Version, the Version is made from them by
+	`insert_deferred_versions`.
+
+	The Deferred Version is written in the same transaction as the document, so saves that are
+	rolled back are not tracked and committed saves are never lost."""
+	impersonation = {}
+	Version.set_impersonator(impersonation)
+
+	entry = frappe.as_json(
+		{
+			"old": old and get_snapshot(old),
+			"new": get_snapshot(new),
+			"flags": {
+				"via_data_import": new.flags.via_data_import,
+				"updater_reference": new.flags.updater_reference,
+			},
+			"impersonation": impersonation,
+			"owner": frappe.session.user,
+			"creation": now(),
+			"follow": not frappe.flags.in_migrate,
+		},
+		indent=None,
+		separators=(",", ":"),
+	)
+	frappe.db.bulk_insert(
+		"Deferred Version",
+		fields=["name", "creation", "modified", "owner", "modified_by", "data"],
+		values=[(frappe.generate_hash(), now(), now(), frappe.session.user, frappe.session.user, entry)],
+	)
+
+
+def get_snapshot(doc: Document) -> dict:
+	snapshot = doc.as_dict(convert_dates_to_str=True, no_private_properties=True)
+
+	# rows of amended documents are compared with the rows they were copied from
+	for fieldname in doc._table_fieldnames:
+		for row, d in zip(snapshot[fieldname], doc.get(fieldname) or [], strict=False):
+			if amended_from := d.get("_amended_from"):
+				row["_amended_from"] = amended_from
+
+	return snapshot
+
+
+def insert_deferred_versions(batch_size=500):
+	"""Scheduled job: make the Versions of Deferred Versions in the order they were saved.
+
+	Deferred Versions are deleted in the same transaction as their Versions are inserted."""
+	while entries := frappe.get_all(
+		"Deferred Version", fields=["name", "data"], order_by="creation asc", limit=batch_size
+	):
+		insert_versions([d.data for d in entries])
+		frappe.db.delete("Deferred Version", {"name": ("in", [d.name for d in entries])})
+		frappe.db.commit()
+
+
+def insert_versions(entries: list[str]):
+	"""Diff the snapshots of `entries` and insert their Versions in bulk.
+
+	If the bulk insert fails, the Versions are inserted one by one and the ones that fail are logged,
+	so that a bad entry never blocks the rest."""
+	values = []
+	to_follow = set()
+
+	for entry in entries:
+		entry = json.loads(entry)
+		try:
+			new = frappe.get_doc(entry["new"])
+			new.flags.update(entry["flags"])
+			old = frappe.get_doc(entry["old"]) if entry["old"] else None
+
+			version = frappe.new_doc("Version")
+			if not version.update_version_info(old, new):
+				continue
+		except Exception:
+			frappe.log_error(f"Could not make Version of {entry['new'].get('doctype')}")
+			continue
+
+		if entry["impersonation"]:
+			version.data = frappe.as_json(
+				{**version.get_data(), **entry["impersonation"]}, indent=None, separators=(",", ":")
+			)
+
+		values.append(
+			(
+				make_autoname("hash", "Version"),
+				entry["creation"],
+				entry["creation"],
+				entry["owner"],
+				entry["owner"],
+				version.ref_doctype,
+				version.docname,
+				version.data,
+			)
+		)
+		if entry["follow"]:
+			to_follow.add((new.doctype, new.name, entry["owner"]))
+
+	if not bulk_insert_versions(values):
+		for row in values:
+			if not bulk_insert_versions([row]):
+				frappe.log_error(f"Could not insert Version of {row[5]} {row[6]}")
+
+	for doctype, name, user in to_follow:
+		if frappe.get_cached_value("User", user, "follow_created_documents"):
+			follow_document(doctype, name, user)
+
+
+def bulk_insert_versions(values: list[tuple]) -> bool:
+	"""Insert Version rows, returns False and undoes the insert if it fails."""
+	frappe.db.savepoint("insert_versions")
+	try:
+		frappe.db.bulk_insert(
+			"Version",
+			fields=["name", "creation", "modified", "owner", "modified_by", "ref_doctype", "docname", "data"],
+			values=values,
+		)
+	except Exception:
+		frappe.db.rollback(save_point="insert_versions")
+		return False
+
+	frappe.db.release_savepoint("insert_versions")
+	return True
+
+
 def on_doctype_update():
 	frappe.db.add_index("Version", ["ref_doctype", "docname"])
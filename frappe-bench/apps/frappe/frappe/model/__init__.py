@@ -122,6 +122,7 @@ CORE_DOCTYPES = frozenset(core_doctypes_list)
 
 log_types = (
 	"Version",
+	"Deferred Version",
 	"Error Log",
 	"Scheduled Job Log",
 	"Event Sync Log",
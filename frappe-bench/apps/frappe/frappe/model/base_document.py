@@ -3,6 +3,7 @@
 import datetime
 import json
 import weakref
+from collections import defaultdict
 from functools import cached_property
 from typing import TYPE_CHECKING, TypeVar
 
@@ -781,8 +782,11 @@ class BaseDocument:
 
 		return missing
 
-	def get_invalid_links(self, is_submittable=False):
-		"""Returns list of invalid links and also updates fetch values if not set"""
+	def get_invalid_links(self, is_submittable=False, link_values=None):
+		"""Returns list of invalid links and also updates fetch values if not set
+
+		:param link_values: Linked values fetched in bulk by `get_link_values`. Links not found in it
+		        are looked up one by one."""
 
 		def get_msg(df, docname):
 			# check if parentfield exists (only applicable for child table doctype)
@@ -821,15 +825,15 @@ class BaseDocument:
 					if not _df.get("fetch_if_empty")
 					or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
 				]
-				if not meta.get("is_virtual"):
+				values_to_fetch = ["name"] + [_df.fetch_from.split(".")[-1] for _df in fields_to_fetch]
+				prefetched = link_values.get((doctype, docname)) if link_values else None
+				if prefetched and all(fieldname in prefetched for fieldname in values_to_fetch):
+					values = prefetched
+				elif not meta.get("is_virtual"):
 					if not fields_to_fetch:
 						# cache a single value type
 						values = _dict(name=frappe.db.get_value(doctype, docname, "name", cache=True))
 					else:
-						values_to_fetch = ["name"] + [
-							_df.fetch_from.split(".")[-1] for _df in fields_to_fetch
-						]
-
 						# don't cache if fetching other values too
 						values = frappe.db.get_value(doctype, docname, values_to_fetch, as_dict=True)
 
@@ -857,7 +861,14 @@ class BaseDocument:
 						df.fieldname != "amended_from"
 						and (is_submittable or self.meta.is_submittable)
 						and frappe.get_meta(doctype).is_submittable
-						and DocStatus(frappe.db.get_value(doctype, docname, "docstatus") or 0).is_cancelled()
+						and DocStatus(
+							(
+								values.docstatus
+								if "docstatus" in values
+								else frappe.db.get_value(doctype, docname, "docstatus")
+							)
+							or 0
+						).is_cancelled()
 					):
 						cancelled_links.append((df.fieldname, docname, get_msg(df, docname)))
 
@@ -1301,6 +1312,131 @@ class BaseDocument:
 				extract_images_from_doc(self, df.fieldname)
 
 
+def get_link_values(docs):
+	"""Returns the documents linked from `docs` as {(doctype, name): values}, with one query per
+	linked doctype. Values include the fields fetched from the link and, for submittable doctypes,
+	the docstatus.
+
+	Links that only need the name are answered from `frappe.db.value_cache` when present, and the
+	cache is filled from the results like `frappe.db.get_value(..., cache=True)` does."""
+	names = defaultdict(set)
+	fetch_fields = defaultdict(set)
+
+	for doc in docs:
+		for df in doc.meta.get_link_fields() + doc.meta.get("fields", {"fieldtype": ("=", "Dynamic Link")}):
+			docname = doc.get(df.fieldname)
+			doctype = df.options if df.fieldtype == "Link" else doc.get(df.options)
+			if not (docname and doctype):
+				continue
+
+			names[doctype].add(docname)
+			fetch_fields[doctype].update(
+				_df.fetch_from.split(".")[-1] for _df in doc.meta.get_fields_to_fetch(df.fieldname)
+			)
+
+	link_values = {}
+	value_cache = frappe.db.value_cache
+	for doctype, docnames in names.items():
+		meta = frappe.get_meta(doctype)
+		if meta.issingle or meta.get("is_virtual"):
+			continue
+
+		fieldnames = [
+			"name",
+			*sorted(fetch_fields[doctype].intersection(meta.get_valid_columns()) - {"name"}),
+		]
+		if meta.is_submittable and "docstatus" not in fieldnames:
+			fieldnames.append("docstatus")
+
+		if len(fieldnames) == 1:
+			for docname in list(docnames):
+				if cached_name := value_cache.get((doctype, docname, "name")):
+					link_values[(doctype, docname)] = _dict(name=cached_name)
+					docnames.discard(docname)
+
+			if not docnames:
+				continue
+
+		for values in frappe.db.get_values(
+			doctype, {"name": ("in", list(docnames))}, fieldnames, as_dict=True, order_by=None
+		):
+			link_values[(doctype, values.name)] = values
+			value_cache[(doctype, values.name, "name")] = values.name
+
+	return link_values
+
+
+def bulk_db_write(docs: list["BaseDocument"], chunk_size=500):
+	"""INSERT new documents of one doctype with multi-row statements.
+
+	If a statement hits a key violation, the documents are written one by one so that errors are
+	raised as in `db_insert`."""
+	if not docs:
+		return
+
+	if len(docs) == 1:
+		docs[0].db_update()
+		return
+
+	doctype = docs[0].doctype
+	rows = [d.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True) for d in docs]
+	columns = list(rows[0])
+	placeholder = "({})".format(", ".join(["%s"] * len(columns)))
+
+	# a failed statement aborts the whole transaction on postgres
+	frappe.db.savepoint("bulk_db_write")
+	try:
+		for i in range(0, len(rows), chunk_size):
+			chunk = rows[i : i + chunk_size]
+			frappe.db.sql(
+				"""INSERT INTO `tab{doctype}` ({columns})
+				VALUES {values}""".format(
+					doctype=doctype,
+					columns=", ".join(f"`{column}`" for column in columns),
+					values=", ".join([placeholder] * len(chunk)),
+				),
+				[row[column] for row in chunk for column in columns],
+			)
+	except Exception as e:
+		if not (frappe.db.is_primary_key_violation(e) or frappe.db.is_unique_key_violation(e)):
+			raise
+
+		frappe.db.rollback(save_point="bulk_db_write")
+		for d in docs:
+			d.db_update()
+		return
+
+	frappe.db.release_savepoint("bulk_db_write")
+	for d in docs:
+		d.set("__islocal", False)
+
+
+def bulk_db_update(docs: list["BaseDocument"], doc_updates: dict):
+	"""UPDATE existing documents of one doctype with `frappe.db.bulk_update`.
+
+	:param doc_updates: Changed columns of each document as {name: {column: value}}.
+
+	Only plain UPDATEs are used, so a unique column other than the name can never redirect the write
+	to another row. On a unique key violation, the documents are written one by one so that errors
+	are raised as in `db_update`."""
+	if not doc_updates:
+		return
+
+	frappe.db.savepoint("bulk_db_update")
+	try:
+		frappe.db.bulk_update(docs[0].doctype, doc_updates, update_modified=False)
+	except Exception as e:
+		if not frappe.db.is_unique_key_violation(e):
+			raise
+
+		frappe.db.rollback(save_point="bulk_db_update")
+		for d in docs:
+			d.db_update()
+		return
+
+	frappe.db.release_savepoint("bulk_db_update")
+
+
 def _filter(data, filters, limit=None):
 	"""pass filters as:
 	{"key": "val", "key": ["!=", "val"],
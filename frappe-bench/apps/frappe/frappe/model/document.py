@@ -15,7 +15,14 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import (
+	DOCTYPES_FOR_DOCTYPE,
+	BaseDocument,
+	bulk_db_update,
+	bulk_db_write,
+	get_controller,
+	get_link_values,
+)
 from frappe.model.docstatus import DocStatus
 from frappe.model.naming import set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype
@@ -32,6 +39,9 @@ if TYPE_CHECKING:
 DOCUMENT_LOCK_EXPIRY = 3 * 60 * 60  # All locks expire in 3 hours automatically
 DOCUMENT_LOCK_SOFT_EXPIRY = 30 * 60  # Let users force-unlock after 30 minutes
 
+# Child tables with fewer rows are written row by row
+MIN_ROWS_FOR_BULK_WRITE = 5
+
 
 def get_doc(*args, **kwargs):
 	"""returns a frappe.model.Document object.
@@ -472,13 +482,11 @@ class Document(BaseDocument):
 		"""sync child table for given fieldname"""
 		df: "DocField" = df or self.meta.get_field(fieldname)
 		all_rows = self.get(df.fieldname)
+		is_virtual = frappe.get_meta(df.options).is_virtual == 1
 
 		# delete rows that do not match the ones in the document
 		# if the doctype isn't in ignore_children_type flag and isn't virtual
-		if not (
-			df.options in (self.flags.ignore_children_type or ())
-			or frappe.get_meta(df.options).is_virtual == 1
-		):
+		if not (df.options in (self.flags.ignore_children_type or ()) or is_virtual):
 			existing_row_names = [row.name for row in all_rows if row.name and not row.is_new()]
 
 			tbl = frappe.qb.DocType(df.options)
@@ -496,10 +504,54 @@ class Document(BaseDocument):
 			qry.run()
 
 		# update / insert
+		if (
+			len(all_rows) >= MIN_ROWS_FOR_BULK_WRITE
+			and not is_virtual
+			and df.options not in DOCTYPES_FOR_DOCTYPE
+			and all(is_bulk_writable(d) for d in all_rows)
+		):
+			self.bulk_update_child_rows(fieldname, all_rows)
+			return
+
 		for d in all_rows:
 			d: Document
 			d.db_update()
 
+	def bulk_update_child_rows(self, fieldname: str, rows: list["Document"]):
+		"""Write the rows changed since `_doc_before_save` with multi-row statements.
+
+		New rows are inserted together and only the changed columns of existing rows are updated."""
+		doc_before_save = self.get_doc_before_save()
+		rows_before_save = {
+			d.name: d.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+			for d in (doc_before_save.get(fieldname) if doc_before_save else ())
+		}
+
+		new_rows, changed_rows = [], []
+		doc_updates = {}
+		for d in rows:
+			if d.get("__islocal") or not d.name:
+				if not d.name:
+					set_new_name(d)
+				if not d.creation:
+					d.creation = d.modified = now()
+					d.owner = d.modified_by = frappe.session.user
+				new_rows.append(d)
+				continue
+
+			previous = rows_before_save.get(d.name)
+			if previous is None:
+				d.db_update()
+				continue
+
+			current = d.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+			if changes := {key: value for key, value in current.items() if value != previous.get(key)}:
+				changed_rows.append(d)
+				doc_updates[d.name] = changes
+
+		bulk_db_write(new_rows)
+		bulk_db_update(changed_rows, doc_updates)
+
 	def get_doc_before_save(self) -> "Document":
 		return getattr(self, "_doc_before_save", None)
 
@@ -963,10 +1015,12 @@ class Document(BaseDocument):
 		if self.flags.ignore_links or self._action == "cancel":
 			return
 
-		invalid_links, cancelled_links = self.get_invalid_links()
+		children = self.get_all_children()
+		link_values = get_link_values([self, *children])
+		invalid_links, cancelled_links = self.get_invalid_links(link_values=link_values)
 
-		for d in self.get_all_children():
-			result = d.get_invalid_links(is_submittable=self.meta.is_submittable)
+		for d in children:
+			result = d.get_invalid_links(is_submittable=self.meta.is_submittable, link_values=link_values)
 			invalid_links.extend(result[0])
 			cancelled_links.extend(result[1])
 
@@ -1315,6 +1369,14 @@ class Document(BaseDocument):
 		if not doc_to_compare and (amended_from := self.get("amended_from")):
 			doc_to_compare = frappe.get_doc(self.doctype, amended_from)
 
+		if self.flags.defer_version or frappe.conf.defer_version_creation:
+			from frappe.core.doctype.version.version import defer_version
+
+			# inserts without a creation source don't get a Version
+			if doc_to_compare or self.flags.updater_reference:
+				defer_version(doc_to_compare, self)
+			return
+
 		version = frappe.new_doc("Version")
 		if version.update_version_info(doc_to_compare, self):
 			version.insert(ignore_permissions=True)
@@ -1787,3 +1849,9 @@ def unlock_document(doctype: str | None = None, name: str | None = None, args=No
 		name = str(args["name"])
 	frappe.get_doc(doctype, name).unlock()
 	frappe.msgprint(frappe._("Document Unlocked"), alert=True)
+
+
+def is_bulk_writable(doc: BaseDocument) -> bool:
+	"""Rows whose controller overrides `db_insert` or `db_update` are written by the controller."""
+	controller = type(doc)
+	return controller.db_insert is BaseDocument.db_insert and controller.db_update is BaseDocument.db_update
@@ -4,8 +4,10 @@
 import base64
 import datetime
 import re
+import threading
 import time
 from collections.abc import Callable
+from functools import partial
 from typing import TYPE_CHECKING, Optional
 
 import frappe
@@ -35,6 +37,13 @@ NAMING_SERIES_PART_TYPES = (
 )
 
 
+# Numbers reserved by this worker for series with a block size, as {(site, prefix): [next, last]}
+_series_blocks = {}
+_series_blocks_lock = threading.Lock()
+# Seconds to wait for the row lock of a series when reserving a block
+SERIES_BLOCK_LOCK_TIMEOUT = 2
+
+
 class InvalidNamingSeriesError(frappe.ValidationError):
 	pass
 
@@ -382,6 +391,9 @@ def determine_consecutive_week_number(datetime):
 
 
 def getseries(key, digits):
+	if block_size := get_series_block_size(key):
+		return ("%0" + str(digits) + "d") % get_next_from_series_block(key, block_size)
+
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
@@ -399,6 +411,91 @@ def getseries(key, digits):
 	return ("%0" + str(digits) + "d") % current
 
 
+def get_series_block_size(prefix: str) -> int:
+	"""Numbers of `prefix` to reserve at a time, from `naming_series_block_size` in site config.
+
+	e.g. `{"SINV-": 100}` applies to every prefix starting with `SINV-`, the longest match wins.
+	Numbers reserved by a worker and not used (rolled back transactions, worker restarts) are
+	skipped, so only configure series where gaps are acceptable."""
+	block_sizes = frappe.conf.get("naming_series_block_size")
+	if not block_sizes:
+		return 0
+
+	matches = [series for series in block_sizes if prefix.startswith(series)]
+	return cint(block_sizes[max(matches, key=len)]) if matches else 0
+
+
+def get_next_from_series_block(prefix: str, block_size: int) -> int:
+	"""Next number of `prefix` from the block reserved by this worker, reserving a new one when the
+	block is used up. Concurrent writers don't wait on the row lock of `tabSeries` for every name."""
+	key = (frappe.local.site, prefix)
+	with _series_blocks_lock:
+		block = _series_blocks.get(key)
+		if not block or block[0] > block[1]:
+			last = reserve_series_block(prefix, block_size)
+			block = _series_blocks[key] = [last - block_size + 1, last]
+
+		current = block[0]
+		block[0] += 1
+
+	return current
+
+
+def reserve_series_block(prefix: str, block_size: int) -> int:
+	"""Add `block_size` to the counter of `prefix` and return the last number of the block.
+
+	The counter is updated in a separate connection which commits right away, so the row lock is
+	not held till the end of the request. The separate connection waits at most
+	`SERIES_BLOCK_LOCK_TIMEOUT` seconds for the row; if it is still locked by this very transaction,
+	the block is reserved in the current transaction instead."""
+	from frappe.database import get_db
+
+	conf = frappe.local.conf
+	db = get_db(
+		socket=conf.db_socket,
+		host=conf.db_host,
+		port=conf.db_port,
+		user=conf.db_name,
+		password=conf.db_password,
+		cur_db_name=conf.db_name,
+	)
+	try:
+		if db.db_type == "postgres":
+			db.sql(f"SET lock_timeout = '{SERIES_BLOCK_LOCK_TIMEOUT}s'")
+		else:
+			db.sql(f"SET SESSION innodb_lock_wait_timeout = {SERIES_BLOCK_LOCK_TIMEOUT}")
+		return _reserve_series_block(db, prefix, block_size)
+	except frappe.QueryTimeoutError:
+		# NOWAIT only succeeds if no other transaction holds the lock, i.e. this one does
+		series = DocType("Series")
+		frappe.qb.from_(series).where(series.name == prefix).for_update(nowait=True).select("current").run()
+		return _reserve_series_block(frappe.db, prefix, block_size, commit=False)
+	finally:
+		db.close()
+
+
+def _reserve_series_block(db, prefix: str, block_size: int, commit=True) -> int:
+	current = db.sql("SELECT `current` FROM `tabSeries` WHERE `name`=%s FOR UPDATE", (prefix,))
+	if current and current[0][0] is not None:
+		db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (block_size, prefix))
+		last = cint(current[0][0]) + block_size
+	else:
+		db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (prefix, block_size))
+		last = block_size
+
+	if commit:
+		db.sql("commit")
+	return last
+
+
+def give_back_to_series_block(site: str, prefix: str, number: int):
+	"""Return `number` to the block of this worker if it was the last number handed out from it."""
+	with _series_blocks_lock:
+		block = _series_blocks.get((site, prefix))
+		if block and block[0] - 1 == number:
+			block[0] -= 1
+
+
 def revert_series_if_last(key, name, doc=None):
 	"""
 	Reverts the series for particular naming series:
@@ -440,6 +537,13 @@ def revert_series_if_last(key, name, doc=None):
 		prefix = parse_naming_series(prefix.split("."), doc=doc)
 
 	count = cint(name.replace(prefix, ""))
+
+	if get_series_block_size(prefix):
+		# the counter of a block reserved series is past this number, give it back to the block of
+		# this worker once the deletion is committed
+		frappe.db.after_commit.add(partial(give_back_to_series_block, frappe.local.site, prefix, count))
+		return
+
 	series = DocType("Series")
 	current = (frappe.qb.from_(series).where(series.name == prefix).for_update().select("current")).run()
 
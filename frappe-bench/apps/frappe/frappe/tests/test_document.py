@@ -10,7 +10,7 @@ from frappe.core.doctype.doctype.test_doctype import new_doctype
 from frappe.desk.doctype.note.note import Note
 from frappe.model.naming import make_autoname, parse_naming_series, revert_series_if_last
 from frappe.tests.utils import FrappeTestCase, timeout
-from frappe.utils import cint, now_datetime, set_request
+from frappe.utils import cint, get_datetime, now_datetime, set_request
 from frappe.website.serve import get_response
 
 from . import update_system_settings
@@ -91,6 +91,51 @@ class TestDocument(FrappeTestCase):
 		self.assertTrue(d.name.startswith("EV"))
 		self.assertEqual(frappe.db.get_value("Event", d.name, "subject"), "test-doc-test-event 2")
 
+	def test_bulk_child_table_write(self):
+		frappe.delete_doc_if_exists("User", "test_bulk_child_write@example.com", 1)
+		roles = frappe.get_all(
+			"Role",
+			filters={"desk_access": 1, "name": ("not in", ["Administrator", "System Manager"])},
+			pluck="name",
+			limit=10,
+		)
+		user = frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": "test_bulk_child_write@example.com",
+				"first_name": "Bulk Write",
+				"roles": [{"role": role} for role in roles],
+			}
+		).insert()
+		user.reload()
+
+		def get_saved_roles():
+			return frappe.get_all(
+				"Has Role", filters={"parent": user.name}, fields=["role", "modified"], order_by="idx"
+			)
+
+		# unchanged rows only get the new modified stamp
+		user.load_doc_before_save()
+		user.append("roles", {"role": "System Manager"})
+		user.set_user_and_timestamp()
+		with self.assertQueryCount(5):
+			user.update_child_table("roles")
+
+		saved_roles = get_saved_roles()
+		self.assertEqual([d.role for d in saved_roles], [d.role for d in user.roles])
+		self.assertTrue(all(d.modified == get_datetime(user.modified) for d in saved_roles))
+
+		# reordered rows are written in one statement
+		user.load_doc_before_save()
+		user.roles.append(user.roles.pop(0))
+		for idx, d in enumerate(user.roles, 1):
+			d.idx = idx
+		user.set_user_and_timestamp()
+		with self.assertQueryCount(4):
+			user.update_child_table("roles")
+
+		self.assertEqual([d.role for d in get_saved_roles()], [d.role for d in user.roles])
+
 	def test_update(self):
 		d = self.test_insert()
 		d.subject = "subject changed"
@@ -3,6 +3,7 @@
 
 import time
 import unittest
+from unittest.mock import patch
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_full_jitter
 
@@ -11,6 +12,7 @@ from frappe.core.doctype.doctype.test_doctype import new_doctype
 from frappe.model.naming import (
 	InvalidNamingSeriesError,
 	NamingSeries,
+	_series_blocks,
 	append_number_if_name_exists,
 	determine_consecutive_week_number,
 	getseries,
@@ -215,6 +217,28 @@ class TestNaming(FrappeTestCase):
 
 		frappe.db.delete("Series", {"name": series})
 
+	def test_series_block_reservation(self):
+		prefix = f"TEST-BLOCK-{frappe.generate_hash(length=6)}-"
+		self.addCleanup(_series_blocks.pop, (frappe.local.site, prefix), None)
+
+		with patch.dict(frappe.conf, {"naming_series_block_size": {"TEST-BLOCK-": 5}}):
+			self.assertEqual(getseries(prefix, 3), "001")
+			self.assertEqual(frappe.db.get_value("Series", prefix, "current", order_by=None), 5)
+
+			# rest of the block is handed out without touching the series
+			with self.assertQueryCount(0):
+				names = [getseries(prefix, 3) for _ in range(4)]
+			self.assertEqual(names, ["002", "003", "004", "005"])
+
+			self.assertEqual(getseries(prefix, 3), "006")
+			self.assertEqual(frappe.db.get_value("Series", prefix, "current", order_by=None), 10)
+
+			# last number of the block is given back to the block once the deletion is committed
+			revert_series_if_last(f"{prefix}.###", f"{prefix}006")
+			self.assertEqual(_series_blocks[(frappe.local.site, prefix)][0], 7)
+			frappe.db.after_commit.run()
+			self.assertEqual(getseries(prefix, 3), "006")
+
 	def test_naming_for_cancelled_and_amended_doc(self):
 		submittable_doctype = frappe.get_doc(
 			{
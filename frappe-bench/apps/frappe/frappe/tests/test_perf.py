@@ -25,7 +25,7 @@ from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fi
 
 import frappe
 from frappe.frappeclient import FrappeClient
-from frappe.model.base_document import get_controller
+from frappe.model.base_document import get_controller, get_link_values
 from frappe.query_builder.utils import db_type_is
 from frappe.tests.test_api import FrappeAPITestCase
 from frappe.tests.test_query_builder import run_only_if
@@ -58,6 +58,30 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			frappe.get_meta("User")
 
+	def test_process_meta_cache(self):
+		from frappe.model.meta import get_meta_cache_stats
+
+		meta = frappe.get_meta("User")
+		meta.get_field("email").default = "changed@example.com"
+
+		# next request only checks the version stamp and gets its own copy
+		frappe.destroy()
+		frappe.init(site=self.TEST_SITE)
+		frappe.connect()
+		hits = get_meta_cache_stats().hits
+		with self.assertRedisCallCounts(1):
+			request_meta = frappe.get_meta("User")
+		self.assertEqual(get_meta_cache_stats().hits, hits + 1)
+		self.assertIsNot(request_meta, meta)
+		self.assertNotEqual(request_meta.get_field("email").default, "changed@example.com")
+
+		# the stamp is checked once per request
+		with self.assertRedisCallCounts(0):
+			self.assertIs(frappe.get_meta("User"), request_meta)
+
+		frappe.clear_cache(doctype="User")
+		self.assertIsNot(frappe.get_meta("User"), request_meta)
+
 	def test_permitted_fieldnames(self):
 		frappe.clear_cache()
 
@@ -119,6 +143,53 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			doc.get_invalid_links()
 
+	def test_batched_link_validation(self):
+		"""Links of a document and its children are looked up with one query per linked doctype"""
+		roles = frappe.get_all("Role", pluck="name", limit=20)
+		doc = frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": "test_batched_link_validation@example.com",
+				"first_name": "Link Validation",
+				"roles": [{"role": role} for role in roles],
+			}
+		)
+		docs = [doc, *doc.get_all_children()]
+		get_link_values(docs)
+
+		with self.assertQueryCount(1):
+			link_values = get_link_values(docs)
+
+		with self.assertQueryCount(0):
+			for d in docs:
+				self.assertEqual(d.get_invalid_links(link_values=link_values), ([], []))
+
+		doc.append("roles", {"role": "_Test Missing Role"})
+		invalid_links = doc.roles[-1].get_invalid_links(link_values=get_link_values(docs))[0]
+		self.assertEqual(invalid_links[0][1], "_Test Missing Role")
+
+	def test_link_validation_query_count(self):
+		"""Saving a document makes one query per linked doctype, later saves use db.value_cache"""
+		roles = frappe.get_all("Role", pluck="name", limit=20)
+		doc = frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": "test_link_validation_query_count@example.com",
+				"first_name": "Link Validation",
+				"language": "en",
+				"roles": [{"role": role} for role in roles],
+			}
+		)
+		for doctype in ("Role", "Language", "Has Role"):
+			frappe.get_meta(doctype)
+		frappe.db.value_cache.clear()
+
+		with self.assertQueryCount(2):
+			doc._validate_links()
+
+		with self.assertQueryCount(0):
+			doc._validate_links()
+
 	@retry(
 		retry=retry_if_exception_type(AssertionError),
 		stop=stop_after_attempt(3),
@@ -1,7 +1,11 @@
 import frappe
 from frappe.model.document import Document
 from frappe import _
-from galaxyerp.utils.company_access import update_user_permissions, get_user_company_access
+from galaxyerp.utils.company_access import (
+    bump_company_access_version,
+    get_user_company_access,
+    update_user_permissions,
+)
 
 class CompanyAccessControl(Document):
     def validate(self):
@@ -17,11 +21,15 @@ class CompanyAccessControl(Document):
         self.update_user_permissions()
         self.create_audit_log("created")
     
+    def on_update(self):
+        bump_company_access_version()
+    
     def after_update(self):
         self.update_user_permissions()
         self.create_audit_log("updated")
     
     def on_trash(self):
+        bump_company_access_version()
         self.create_audit_log("deleted")
         # Remove user permissions when access is deleted
         if self.user and self.company:
@@ -295,6 +303,9 @@ def check_access_expiry():
                 "error": str(e)
             })
     
+    if expired_access:
+        bump_company_access_version()
+    
     return results
 
 @frappe.whitelist()
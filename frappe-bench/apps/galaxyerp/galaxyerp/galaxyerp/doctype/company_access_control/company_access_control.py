@@ -4,6 +4,12 @@
 # import frappe
 from frappe.model.document import Document
 
+from galaxyerp.utils.company_access import bump_company_access_version
+
 
 class CompanyAccessControl(Document):
-	pass
+	def on_update(self):
+		bump_company_access_version()
+
+	def on_trash(self):
+		bump_company_access_version()
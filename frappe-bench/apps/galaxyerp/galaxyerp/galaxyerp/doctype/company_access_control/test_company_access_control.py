@@ -1,9 +1,27 @@
 # Copyright (c) 2025, GalaxyERP Software Private Limited and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from galaxyerp.utils.company_access import (
+	bump_company_access_version,
+	get_company_access_version,
+	get_user_company_access,
+	get_users_company_access,
+)
+
 
 class TestCompanyAccessControl(FrappeTestCase):
-	pass
+	def test_version_bump_invalidates_cache(self):
+		version = get_company_access_version()
+		bump_company_access_version()
+		self.assertGreater(get_company_access_version(), version)
+
+	def test_batch_access_matches_single_user(self):
+		users = ["Administrator", "Guest"]
+		accesses = get_users_company_access(users)
+
+		self.assertEqual(set(accesses), set(users))
+		for user in users:
+			self.assertEqual(accesses[user], get_user_company_access(user))
@@ -1,103 +1,233 @@
 import frappe
 from frappe import _
 from frappe.permissions import get_roles
-from frappe.utils import now_datetime
+from frappe.utils import cint, get_datetime, now_datetime
 import json
+import pickle
+
+ACCESS_VERSION_KEY = "galaxyerp:company_access_version"
+ACCESS_SNAPSHOT_KEY = "galaxyerp:company_access"
+
+# process-level snapshots, keyed by (site, user) -> (version, snapshot)
+_access_snapshots = {}
+
+
+def _no_access(company=None, message=None):
+    result = {
+        "has_access": False,
+        "is_admin": False,
+        "company": company,
+        "apps": [],
+        "roles": []
+    }
+    if message:
+        result["message"] = message
+    return result
+
+
+def get_company_access_version():
+    """Get the current company access version, read from Redis at most once per request"""
+    version = getattr(frappe.local, "company_access_version", None)
+    if version is None:
+        try:
+            version = cint(frappe.cache.get(frappe.cache.make_key(ACCESS_VERSION_KEY)))
+        except Exception:
+            version = 0
+        frappe.local.company_access_version = version
+
+    return version
+
+
+def bump_company_access_version():
+    """Invalidate all cached company access snapshots"""
+
+    def _bump():
+        frappe.local.company_access_version = None
+        _access_snapshots.clear()
+        try:
+            frappe.cache.incr(frappe.cache.make_key(ACCESS_VERSION_KEY))
+        except Exception:
+            pass
+
+    # bump again once committed so other workers don't cache pre-commit data
+    _bump()
+    frappe.db.after_commit.add(_bump)
+
+
+def load_company_access_snapshots(users):
+    """Build access snapshots for users from the database in a fixed number of queries"""
+    snapshots = {user: None for user in users}
+    if not users or not frappe.db.exists("DocType", "Company Access Control"):
+        return snapshots
+
+    records = frappe.get_all(
+        "Company Access Control",
+        filters={"user": ["in", list(users)]},
+        fields=["name", "user", "company", "access_status", "valid_from", "valid_until"],
+        order_by="modified desc"
+    )
+
+    # keep the first record per user, same as the single-user lookup
+    access_by_name = {}
+    for record in records:
+        if snapshots[record.user] is None:
+            snapshots[record.user] = {
+                "company": record.company,
+                "access_status": record.access_status,
+                "valid_from": record.valid_from,
+                "valid_until": record.valid_until,
+                "apps": [],
+                "roles": [],
+                "is_admin": False
+            }
+            access_by_name[record.name] = snapshots[record.user]
+
+    if not access_by_name:
+        return snapshots
+
+    for row in frappe.get_all(
+        "Company App Assignment",
+        filters={"parent": ["in", list(access_by_name)], "parenttype": "Company Access Control"},
+        fields=["parent", "company_app", "app_status"],
+        order_by="idx asc"
+    ):
+        if row.app_status == "Active":
+            access_by_name[row.parent]["apps"].append(row.company_app)
+
+    for row in frappe.get_all(
+        "Company Role Assignment",
+        filters={"parent": ["in", list(access_by_name)], "parenttype": "Company Access Control"},
+        fields=["parent", "role", "role_type"],
+        order_by="idx asc"
+    ):
+        access_by_name[row.parent]["roles"].append(row.role)
+        if row.role_type == "Company Admin":
+            access_by_name[row.parent]["is_admin"] = True
+
+    return snapshots
+
+
+def get_company_access_snapshots(users):
+    """Get access snapshots for users from process memory, Redis or the database"""
+    version = get_company_access_version()
+    site = frappe.local.site
+    snapshots = {}
+
+    missing = []
+    for user in users:
+        cached = _access_snapshots.get((site, user))
+        if cached and cached[0] == version:
+            snapshots[user] = cached[1]
+        else:
+            missing.append(user)
+
+    if missing:
+        try:
+            cached_values = frappe.cache.hmget(frappe.cache.make_key(ACCESS_SNAPSHOT_KEY), missing)
+        except Exception:
+            cached_values = [None] * len(missing)
+
+        to_load = []
+        for user, value in zip(missing, cached_values):
+            value = pickle.loads(value) if value else None
+            if value and value[0] == version:
+                snapshots[user] = value[1]
+                _access_snapshots[(site, user)] = value
+            else:
+                to_load.append(user)
+
+        if to_load:
+            loaded = load_company_access_snapshots(to_load)
+            mapping = {}
+            for user, snapshot in loaded.items():
+                snapshots[user] = snapshot
+                _access_snapshots[(site, user)] = (version, snapshot)
+                mapping[user] = pickle.dumps((version, snapshot))
+
+            try:
+                pipe = frappe.cache.pipeline()
+                for user, value in mapping.items():
+                    pipe.hset(frappe.cache.make_key(ACCESS_SNAPSHOT_KEY), user, value)
+                pipe.execute()
+            except Exception:
+                pass
+
+    return snapshots
+
+
+def resolve_company_access(snapshot):
+    """Evaluate a cached snapshot into the access dict returned by `get_user_company_access`"""
+    if not snapshot:
+        return _no_access()
+
+    if snapshot["access_status"] != "Active":
+        return _no_access(snapshot["company"])
+
+    if snapshot["valid_until"] and get_datetime(snapshot["valid_until"]) < now_datetime():
+        return _no_access(snapshot["company"])
+
+    return {
+        "has_access": True,
+        "is_admin": snapshot["is_admin"],
+        "company": snapshot["company"],
+        "apps": list(snapshot["apps"]),
+        "roles": list(snapshot["roles"]),
+        "valid_from": snapshot["valid_from"],
+        "valid_until": snapshot["valid_until"]
+    }
+
 
 @frappe.whitelist()
 def get_user_company_access(user=None):
     """Get company access information for user"""
     if not user:
         user = frappe.session.user
-    
+
     if user == "Administrator":
         return {
-            "has_access": True, 
+            "has_access": True,
             "is_admin": True,
             "company": None,
             "apps": [],
             "roles": []
         }
-    
-    # Check if Company Access Control doctype exists
+
     if not frappe.db.exists("DocType", "Company Access Control"):
-        return {
-            "has_access": False, 
-            "is_admin": False,
-            "company": None,
-            "apps": [],
-            "roles": [],
-            "message": "Company Access Control module not installed"
-        }
-    
-    # Check if user has company access control record
+        return _no_access(message="Company Access Control module not installed")
+
     try:
-        access_records = frappe.get_all("Company Access Control", 
-                                      filters={"user": user}, 
-                                      fields=["*"], 
-                                      limit=1)
-        if not access_records:
-            return {
-                "has_access": False, 
-                "is_admin": False,
-                "company": None,
-                "apps": [],
-                "roles": []
-            }
-        access = frappe.get_doc("Company Access Control", access_records[0].name)
-    except Exception as e:
-        return {
-            "has_access": False, 
-            "is_admin": False,
-            "company": None,
-            "apps": [],
-            "roles": [],
-            "message": "Error accessing company access control"
-        }
-    
-    # Check if access is active and not expired
-    if access.access_status != "Active":
-        return {
-            "has_access": False, 
-            "is_admin": False,
-            "company": access.company,
-            "apps": [],
-            "roles": []
-        }
-    
-    # Check expiry
-    if access.valid_until and access.valid_until < now_datetime():
-        return {
-            "has_access": False, 
-            "is_admin": False,
-            "company": access.company,
-            "apps": [],
-            "roles": []
-        }
-    
-    # Get assigned apps
-    apps = []
-    for app_assignment in access.assigned_company_apps:
-        if app_assignment.app_status == "Active":
-            apps.append(app_assignment.company_app)
-    
-    # Get assigned roles
-    roles = []
-    is_admin = False
-    for role_assignment in access.company_roles:
-        roles.append(role_assignment.role)
-        if role_assignment.role_type == "Company Admin":
-            is_admin = True
-    
-    return {
-        "has_access": True,
-        "is_admin": is_admin,
-        "company": access.company,
-        "apps": apps,
-        "roles": roles,
-        "valid_from": access.valid_from,
-        "valid_until": access.valid_until
-    }
+        snapshot = get_company_access_snapshots([user])[user]
+    except Exception:
+        return _no_access(message="Error accessing company access control")
+
+    return resolve_company_access(snapshot)
+
+
+@frappe.whitelist()
+def get_users_company_access(users):
+    """Get company access information for many users at once"""
+    if isinstance(users, str):
+        users = frappe.parse_json(users)
+
+    users = list(dict.fromkeys(users))
+    result = {}
+    if "Administrator" in users:
+        result["Administrator"] = get_user_company_access("Administrator")
+        users.remove("Administrator")
+
+    if not users:
+        return result
+
+    if not frappe.db.exists("DocType", "Company Access Control"):
+        for user in users:
+            result[user] = _no_access(message="Company Access Control module not installed")
+        return result
+
+    snapshots = get_company_access_snapshots(users)
+    for user in users:
+        result[user] = resolve_company_access(snapshots[user])
+
+    return result
 
 def has_company_permission(user=None, company=None, permission="read"):
     """Check if user has permission for specific company"""
@@ -336,6 +466,9 @@ def check_access_expiry():
             title="Access Expired"
         )
 
+    if expired_access:
+        bump_company_access_version()
+
 @frappe.whitelist()
 def get_user_access_summary():
     """Get summary of user access for dashboard"""
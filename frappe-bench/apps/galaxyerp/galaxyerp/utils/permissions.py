@@ -1,6 +1,10 @@
 import frappe
 from frappe import _
-from galaxyerp.utils.company_access import get_user_company_access, has_company_permission
+from galaxyerp.utils.company_access import (
+    get_user_company_access,
+    get_users_company_access,
+    has_company_permission,
+)
 
 def get_company_permission_query(user, doctype):
     """Get permission query condition for company-restricted doctypes"""
@@ -217,9 +221,9 @@ def get_company_admin_users(company):
         fields=["user"]
     )
     
+    accesses = get_users_company_access([record.user for record in company_access_records])
     for record in company_access_records:
-        access = get_user_company_access(record.user)
-        if access.get("is_admin", False):
+        if accesses[record.user].get("is_admin", False):
             admin_users.append(record.user)
     
     return admin_users
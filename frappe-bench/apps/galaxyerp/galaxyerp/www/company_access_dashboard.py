@@ -118,13 +118,17 @@ def get_recent_access_records():
         limit=10
     )
     
+    from galaxyerp.utils.company_access import get_users_company_access
+    
+    users = [record.user for record in records]
+    full_names = dict(frappe.get_all("User", filters={"name": ["in", users]}, fields=["name", "full_name"], as_list=True))
+    accesses = get_users_company_access(users)
+    
     # Add user details
     for record in records:
-        try:
-            user_doc = frappe.get_doc("User", record.user)
-            record.user_full_name = user_doc.full_name or record.user
-        except:
-            record.user_full_name = record.user
+        record.user_full_name = full_names.get(record.user) or record.user
+        record.is_admin = accesses[record.user].get("is_admin", False)
+        record.apps_count = len(accesses[record.user].get("apps", []))
     
     return records
 